@@ -0,0 +1,96 @@
+"""
+Generate synthetic TaskTrack databases with realistic day, status, due date and content distributions.
+
+    python benchmarks/generate_dataset.py --rows 100000 --output benchmarks/data/tasks-100000.db
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tasktrack.dates import today_epoch_day, week_start, weekday_name  # noqa: E402
+from tasktrack.repository import TaskRepository  # noqa: E402
+
+COURSES = ["CS 101", "CS 240", "MATH 221", "PHYS 150", "CHEM 110", "ENGL 105", "HIST 201", "PSYC 100", "ECON 202", "BIO 130"]
+KINDS = ["Essay", "Lab report", "Problem set", "Reading", "Quiz prep", "Midterm review", "Project milestone",
+         "Discussion post", "Lecture notes", "Final exam study"]
+WORDS = ("review chapter lecture notes draft outline sources cite figure results method analysis proof lemma "
+         "derivation experiment dataset summary question answer rubric deadline group meeting office hours "
+         "slides textbook section problem solution check submit revise feedback peer grade").split()
+
+# Weekdays get most of the work; weekends less
+DAY_WEIGHTS = [0.6, 1.2, 1.2, 1.2, 1.2, 1.0, 0.5]  # Sunday to Saturday
+
+# Share of tasks that are completed: most of a semester's history is done
+COMPLETED_SHARE = 0.7
+
+def generate_rows(count, seed=0):
+    """
+    Yield (title, content, day, status, due epoch day) rows for 'count' synthetic tasks due over a
+    16-week semester centred on the current week. Past tasks are mostly completed, future ones open.
+
+    Args:
+        count (int): Number of rows.
+        seed (int): Random seed, so the same arguments always give the same dataset.
+    """
+
+    generator = random.Random(seed)
+    semester_start = week_start(today_epoch_day()) - 8 * 7
+    today = today_epoch_day()
+    weekday_offsets = list(range(7))
+
+    for index in range(count):
+        due_day = semester_start + 7 * generator.randrange(16) + generator.choices(weekday_offsets, DAY_WEIGHTS)[0]
+        title = f"{generator.choice(COURSES)}: {generator.choice(KINDS)} {index % 12 + 1}"
+
+        # Note length is long-tailed: many empty notes, a few very long ones
+        word_count = 0 if generator.random() < 0.3 else min(int(generator.lognormvariate(3.5, 1.0)), 2000)
+        content = " ".join(generator.choices(WORDS, k=word_count))
+
+        completed_chance = COMPLETED_SHARE + 0.25 if due_day < today else 0.1
+        status = "completed" if generator.random() < completed_chance else "not-completed"
+        yield (title, content, weekday_name(due_day), status, due_day)
+
+def generate_database(path, count, seed=0, chunk_size=10000):
+    """
+    Create (or replace) a database at 'path' holding 'count' synthetic tasks.
+
+    Returns:
+        float: Seconds taken.
+    """
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    started = time.perf_counter()
+    repository = TaskRepository(path)
+    rows = generate_rows(count, seed)
+    with repository.action("Generate tasks", "snapshot"):  # Seed data, not something to undo
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            repository.insert_tasks(chunk)
+    repository.analyze()
+    repository.close()
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic TaskTrack database.")
+    parser.add_argument("--rows", type=int, required=True, help="number of tasks")
+    parser.add_argument("--output", required=True, help="database file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    seconds = generate_database(args.output, args.rows, args.seed)
+    print(f"Generated {args.rows} tasks in {args.output} in {seconds:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Measure what one task on the weekly board costs in memory.
+
+    python benchmarks/measure_task_memory.py --tasks 5000
+
+Compares the per-task record types (a plain tuple, a dict and the __slots__ Task) and, when a
+display is available (e.g. under xvfb-run), the old widget-per-task board (a tk.Button with
+hover bindings and a command closure) against task cards drawn on one canvas.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tasktrack.models import Task  # noqa: E402
+
+def resident_bytes():
+    """
+    Returns:
+        int: Resident set size of this process (Linux only; 0 elsewhere).
+    """
+
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+def measure(build, count):
+    """
+    Measure the memory 'build(count)' allocates.
+
+    Returns:
+        tuple: (Python bytes per task from tracemalloc, resident bytes per task, whatever build returned).
+    """
+
+    gc.collect()
+    resident_before = resident_bytes()
+    tracemalloc.start()
+    built = build(count)
+    python_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return python_bytes / count, (resident_bytes() - resident_before) / count, built
+
+################################################## RECORDS ##################################################
+def build_tuples(count):
+    return [(task_id, f"Task {task_id}", "Monday", "not-completed") for task_id in range(count)]
+
+def build_dicts(count):
+    return [{"id": task_id, "title": f"Task {task_id}", "day": "Monday", "status": "not-completed"} for task_id in range(count)]
+
+def build_tasks(count):
+    return [Task(task_id, f"Task {task_id}", "Monday") for task_id in range(count)]
+
+################################################## WIDGETS ##################################################
+def build_buttons(root, count):
+    """
+    The board before task cards: a tk.Button per task, two hover closures and a command lambda.
+    """
+
+    import tkinter as tk
+
+    frame = tk.Frame(root)
+    buttons = {}
+    for task_id in range(count):
+        task_title = f"Task {task_id}"
+        task_button = tk.Button(frame, text=task_title, wraplength=100, padx=10, pady=10, bg="white",
+                                command=lambda task_id=task_id, task_title=task_title: (task_id, task_title))
+
+        def on_enter(e, task_button=task_button):
+            task_button.config(bg="#F94144")
+
+        def on_leave(e, task_button=task_button):
+            task_button.config(bg="white")
+
+        task_button.bind("<Enter>", on_enter)
+        task_button.bind("<Leave>", on_leave)
+        task_button.pack()
+        buttons[task_id] = task_button
+    root.update_idletasks()
+    return frame
+
+def build_cards(root, count):
+    """
+    The board with task cards: every task drawn on one shared canvas.
+    """
+
+    from tasktrack.cards import TaskCardCanvas
+
+    cards = TaskCardCanvas(root, "#F94144", lambda task: None)
+    cards.canvas.pack()
+    cards.sync(build_tasks(count))
+    root.update_idletasks()
+    return cards
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the memory cost of one task on the weekly board.")
+    parser.add_argument("--tasks", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"Per-task cost over {args.tasks} tasks (Python heap via tracemalloc, process RSS)")
+    for name, build in (("tuple", build_tuples), ("dict", build_dicts), ("Task (__slots__)", build_tasks)):
+        python_bytes, _, records = measure(build, args.tasks)
+        print(f"  record {name:<18} {python_bytes:8.0f} B  (object itself: {sys.getsizeof(records[0])} B)")
+
+    try:
+        import tkinter as tk
+
+        root = tk.Tk()
+    except Exception as error:  # No display
+        print(f"  widgets skipped: {error} (run under xvfb-run to measure them)")
+        return
+    root.withdraw()
+    for name, build in (("tk.Button per task", build_buttons), ("canvas task card", build_cards)):
+        python_bytes, resident, built = measure(lambda count: build(root, count), args.tasks)
+        print(f"  board  {name:<18} {python_bytes:8.0f} B Python, {resident:8.0f} B RSS")
+        (built.canvas if hasattr(built, "canvas") else built).destroy()
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measure the reminder engine with many pending reminders.
+
+    python benchmarks/reminder_load.py --reminders 100000
+
+Reports the time and memory it takes to load the reminders, the cost of scheduling, moving and
+cancelling one, and how often the board's reminder timer wakes up while nothing is due.
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tasktrack.dates import today_epoch_day  # noqa: E402
+from tasktrack.reminders import ReminderScheduler  # noqa: E402
+from tasktrack.ui import REMINDER_TIMER_MAX_MS  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the reminder engine with many pending reminders.")
+    parser.add_argument("--reminders", type=int, default=100000)
+    parser.add_argument("--operations", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generator = random.Random(args.seed)
+    today = today_epoch_day()
+    rows = [(task_id, f"Task {task_id}", today + 1 + generator.randrange(365)) for task_id in range(args.reminders)]
+
+    started = time.perf_counter()
+    ReminderScheduler().load(rows)
+    load_seconds = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    reminders = ReminderScheduler()
+    reminders.load(rows)
+    python_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"Loaded {len(reminders)} reminders in {load_seconds * 1000:.1f} ms, "
+          f"{python_bytes / len(reminders):.0f} B each ({python_bytes / 2 ** 20:.1f} MiB)")
+
+    task_ids = [generator.randrange(args.reminders) for _ in range(args.operations)]
+    due_days = [today + 1 + generator.randrange(365) for _ in range(args.operations)]
+    for name, operation in (
+        ("move", lambda task_id, due_day: reminders.schedule(task_id, "Moved", due_day)),
+        ("cancel", lambda task_id, due_day: reminders.cancel(task_id)),
+        ("schedule", lambda task_id, due_day: reminders.schedule(task_id, "New", due_day)),
+    ):
+        started = time.perf_counter()
+        for task_id, due_day in zip(task_ids, due_days):
+            operation(task_id, due_day)
+        elapsed = time.perf_counter() - started
+        print(f"  {name:<8} {elapsed / args.operations * 1e6:6.2f} us per reminder")
+
+    started = time.perf_counter()
+    reminders.next_fire_time()
+    print(f"  next fire time {(time.perf_counter() - started) * 1e6:.2f} us")
+    print(f"Idle cost: one timer, at most {3600 * 1000 // REMINDER_TIMER_MAX_MS} wake-ups per hour "
+          "and no database queries")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+Time every TaskRepository operation and the weekly board render path on synthetic databases,
+write the results as JSON and compare them with a stored baseline.
+
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 --output results.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json   # exit status 1 on regression
+
+The render path runs against a fake widget backend by default; pass --backend tk to use real
+Tk widgets (needs a display, e.g. under xvfb-run).
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_dataset import generate_database  # noqa: E402
+from tasktrack.analytics import compute_analytics, load_analytics  # noqa: E402
+from tasktrack.dates import today_epoch_day, week_start  # noqa: E402
+from tasktrack.db import DAYS_OF_WEEK  # noqa: E402
+from tasktrack.repository import TaskRepository  # noqa: E402
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Slowdowns below this many milliseconds are treated as noise when comparing with a baseline
+NOISE_FLOOR_MS = 0.05
+
+################################################## TIMING ##################################################
+def time_operation(operation, repeat, setup=None):
+    """
+    Run 'operation' 'repeat' times and summarize its duration.
+
+    Args:
+        operation (callable): Called with the value setup() returns (or with no arguments).
+        repeat (int): Number of timed runs.
+        setup (callable): Untimed preparation before each run.
+
+    Returns:
+        dict: 'median_ms', 'min_ms', 'max_ms' and 'runs'.
+    """
+
+    timings = []
+    for _ in range(repeat):
+        arguments = (setup(),) if setup is not None else ()
+        started = time.perf_counter()
+        operation(*arguments)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "max_ms": max(timings),
+        "runs": repeat,
+    }
+
+################################################## RENDER BACKENDS ##################################################
+class FakeWidget:
+    """
+    Stands in for a Tk widget so the board's render path can be timed without a display.
+    """
+
+    def __init__(self, master=None, **options):
+        self.options = options
+
+    def cget(self, option):
+        return self.options.get(option, "#FFFFFF")
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
+
+    def bind(self, *args):
+        pass
+
+    def pack(self, **options):
+        pass
+
+    pack_configure = pack
+
+    def destroy(self):
+        pass
+
+class FakeCanvas(FakeWidget):
+    """
+    Stands in for tk.Canvas: keeps every item's coordinates and options and estimates text extents.
+    """
+
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.items = {}  # Item -> [coordinates, options]
+        self._next_item = 1
+
+    def _create(self, coordinates, options):
+        item = self._next_item
+        self._next_item += 1
+        self.items[item] = [coordinates, options]
+        return item
+
+    def create_text(self, *coordinates, **options):
+        return self._create(coordinates, options)
+
+    def create_rectangle(self, *coordinates, **options):
+        return self._create(coordinates, options)
+
+    def itemconfigure(self, item, **options):
+        self.items[item][1].update(options)
+
+    def coords(self, item, *coordinates):
+        self.items[item][0] = coordinates
+
+    def bbox(self, item):
+        options = self.items[item][1]
+        width = options.get("width", 100)
+        lines = len(options.get("text", "")) * 7 // width + 1  # About 7 pixels per character
+        return (0, 0, width, lines * 16)
+
+    def delete(self, *items):
+        for item in items:
+            del self.items[item]
+
+    def tag_bind(self, *args):
+        pass
+
+    def tag_lower(self, *args):
+        pass
+
+def setup_board(backend):
+    """
+    Point tasktrack.ui at an empty board built from the chosen widget backend.
+
+    Returns:
+        module: The tasktrack.ui module, ready for render_weekly_diff.
+    """
+
+    from tasktrack import cards, ui
+
+    if backend == "tk":
+        import tkinter as tk
+
+        root = getattr(setup_board, "root", None) or tk.Tk()
+        root.withdraw()
+        setup_board.root = root
+        cards.tk = tk
+        ui.day_frames = {day: tk.Frame(root, bg="#FFFFFF") for day in DAYS_OF_WEEK}
+        ui.date_labels = {day: tk.Label(ui.day_frames[day]) for day in DAYS_OF_WEEK}
+    else:
+        cards.tk = types.SimpleNamespace(Canvas=FakeCanvas)
+        ui.day_frames = {day: FakeWidget(bg="#FFFFFF") for day in DAYS_OF_WEEK}
+        ui.date_labels = {day: FakeWidget() for day in DAYS_OF_WEEK}
+
+    ui.day_cards = {}
+    for day in DAYS_OF_WEEK:
+        ui.day_cards[day] = cards.TaskCardCanvas(ui.day_frames[day], "#FFFFFF", ui.open_task_card)
+        ui.day_cards[day].canvas.pack(fill="both", expand=True)
+    ui.task_days = {}
+    return ui
+
+def clear_board(ui):
+    for day_cards in ui.day_cards.values():
+        day_cards.sync([])
+    ui.task_days.clear()
+
+################################################## BENCHMARKS ##################################################
+def benchmark_reads(path, repeat):
+    """
+    Time the query operations, and the board render path, on an unmodified database.
+    """
+
+    repository = TaskRepository(path)
+    connection = repository.connection
+    this_week = week_start(today_epoch_day())
+    max_id = connection.execute("SELECT MAX(id) FROM tasks").fetchone()[0] or 0
+    task_with_notes = connection.execute(
+        "SELECT task_id FROM task_notes WHERE typeof(body) = 'blob' ORDER BY task_id LIMIT 1"  # A compressed note
+    ).fetchone() or (1,)
+
+    results = {
+        "load_tasks_for_week": time_operation(lambda: repository.load_tasks_for_week(this_week), repeat),
+        "load_tasks_for_day": time_operation(lambda: repository.load_tasks_for_day("Monday"), repeat),
+        "load_tasks_between_semester": time_operation(
+            lambda: repository.load_tasks_between(this_week - 56, this_week + 56), repeat),
+        "load_completed_tasks_first_page": time_operation(lambda: repository.load_completed_tasks(0), repeat),
+        "load_completed_tasks_deep_page": time_operation(lambda: repository.load_completed_tasks(max_id // 2), repeat),
+        "count_completed_tasks": time_operation(repository.count_completed_tasks, repeat),
+        "load_task_content_cold": time_operation(
+            lambda _: repository.load_task_content(task_with_notes[0]), repeat, setup=repository.cache.clear),
+        "load_task_content_cached": time_operation(lambda: repository.load_task_content(task_with_notes[0]), repeat),
+        "search_tasks_word": time_operation(lambda: repository.search_tasks("essay"), repeat),
+        "search_tasks_prefix": time_operation(lambda: repository.search_tasks("lab rep"), repeat),
+        "analytics_cold": time_operation(lambda: compute_analytics(repository), repeat),
+        "analytics_cached": time_operation(lambda: load_analytics(repository), repeat),
+    }
+    repository.close()
+    return results
+
+def benchmark_render(path, repeat, backend):
+    """
+    Time the weekly board render path: loading the week plus the diff against the widgets.
+    """
+
+    repository = TaskRepository(path, read_only=True)
+    this_week = week_start(today_epoch_day())
+    week = repository.load_tasks_for_week(this_week)
+    ui = setup_board(backend)
+
+    def empty_board():
+        clear_board(ui)
+
+    edits = iter(range(repeat))
+
+    def one_change():
+        changed = {day: list(day_tasks) for day, day_tasks in week.items()}
+        for day_tasks in changed.values():
+            if day_tasks:
+                task_id, task_title, color = day_tasks[0]
+                day_tasks[0] = (task_id, f"{task_title} (edit {next(edits)})", color)
+                break
+        return changed
+
+    results = {
+        "render_initial_week": time_operation(lambda _: ui.render_weekly_diff(week), repeat, setup=empty_board),
+        "refresh_unchanged_week": time_operation(
+            lambda: ui.render_weekly_diff(repository.load_tasks_for_week(this_week)), repeat),
+        "refresh_one_relabel": time_operation(ui.render_weekly_diff, repeat, setup=one_change),
+        "visible_task_cards": sum(len(day_tasks) for day_tasks in week.values()),
+    }
+    clear_board(ui)
+    repository.close()
+    return results
+
+def benchmark_writes(path, repeat):
+    """
+    Time the mutation operations, each committed, on a scratch copy of the database.
+    """
+
+    with tempfile.TemporaryDirectory() as scratch:
+        copy = os.path.join(scratch, "tasks.db")
+        source = sqlite3.connect(path)
+        destination = sqlite3.connect(copy)
+        source.backup(destination)
+        source.close()
+        destination.close()
+
+        repository = TaskRepository(copy)
+        this_week = week_start(today_epoch_day())
+        active_ids = iter([
+            row[0] for row in repository.connection.execute(
+                "SELECT id FROM tasks WHERE status = 'not-completed' ORDER BY id LIMIT ?", (repeat * 4,)
+            )
+        ])
+
+        # A week's worth of tasks for the bulk operations
+        week_ids = [row[0] for row in repository.connection.execute("SELECT id FROM tasks ORDER BY id DESC LIMIT 200")]
+
+        def committed(operation):
+            def run(*args):
+                operation(*args)
+                repository.flush()
+            return run
+
+        def add_one():
+            return repository.save_task(f"benchmark {time.perf_counter_ns()}", "", "Monday", this_week + 1)
+
+        def add_hundred():
+            with repository.batch():
+                for index in range(100):
+                    repository.save_task(f"bulk {index}", "", "Tuesday", this_week + 2)
+
+        results = {
+            "save_task": time_operation(committed(add_one), repeat),
+            "save_task_batch_of_100": time_operation(add_hundred, repeat),
+            "update_task": time_operation(
+                committed(lambda task_id: repository.update_task(task_id, "updated", "Friday", "notes")),
+                repeat, setup=lambda: next(active_ids)),
+            "move_task": time_operation(
+                committed(lambda task_id: repository.move_task(task_id, "Saturday")), repeat, setup=lambda: next(active_ids)),
+            "complete_task": time_operation(
+                committed(repository.complete_task), repeat, setup=lambda: next(active_ids)),
+            "delete_task": time_operation(
+                committed(repository.delete_task), repeat, setup=add_one),
+            "move_tasks_200": time_operation(
+                committed(lambda task_ids: repository.move_tasks(task_ids, "Thursday")), repeat, setup=lambda: week_ids),
+            "recolor_tasks_200": time_operation(
+                committed(lambda task_ids: repository.recolor_tasks(task_ids, "#90BE6D")), repeat, setup=lambda: week_ids),
+        }
+        repository.close()
+    return results
+
+def dataset_path(data_dir, rows, seed):
+    """
+    Return the cached synthetic database for 'rows' tasks, generating it on first use.
+    """
+
+    path = os.path.join(data_dir, f"tasks-{rows}-seed{seed}.db")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        print(f"Generating {rows} tasks...", file=sys.stderr)
+        generate_database(path, rows, seed)
+    return path
+
+################################################## BASELINE ##################################################
+def find_regressions(results, baseline, tolerance):
+    """
+    Compare median timings with a baseline.
+
+    Args:
+        results (dict): Output of this script.
+        baseline (dict): An earlier output of this script.
+        tolerance (float): Allowed slowdown, e.g. 0.25 for 25%.
+
+    Returns:
+        list: Human readable descriptions of the operations that got slower.
+    """
+
+    regressions = []
+    for size, operations in results["results"].items():
+        for name, timing in operations.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if not isinstance(timing, dict) or not isinstance(previous, dict):
+                continue
+            allowed = previous["median_ms"] * (1 + tolerance)
+            if timing["median_ms"] > allowed and timing["median_ms"] - previous["median_ms"] > NOISE_FLOOR_MS:
+                regressions.append(
+                    f"{size} rows / {name}: {timing['median_ms']:.3f} ms vs baseline {previous['median_ms']:.3f} ms"
+                )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TaskTrack repository operations and rendering.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000], help="dataset sizes (e.g. 1000 100000 1000000)")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per operation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="where generated databases are cached")
+    parser.add_argument("--backend", choices=["fake", "tk"], default="fake", help="widget backend for the render path")
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+    logging.getLogger("tasktrack.profiling").setLevel(logging.ERROR)  # Slow calls are the point here
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": {},
+    }
+    for rows in args.sizes:
+        path = dataset_path(args.data_dir, rows, args.seed)
+        print(f"Benchmarking {rows} tasks...", file=sys.stderr)
+        operations = {}
+        operations.update(benchmark_reads(path, args.repeat))
+        operations.update(benchmark_render(path, args.repeat, args.backend))
+        operations.update(benchmark_writes(path, args.repeat))
+        results["results"][str(rows)] = operations
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
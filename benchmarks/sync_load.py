@@ -0,0 +1,147 @@
+"""
+Load test for the sync server: connect thousands of WebSocket clients, push task moves and
+completions from one of them and measure how long each takes to reach every other client.
+
+    python benchmarks/sync_load.py --clients 2000 --changes 20
+
+The server runs in its own process (python -m tasktrack serve) on a scratch database. The
+end-to-end latencies include this process reading every client's copy, so on a single core they
+grow with the client count; 'server_fan_out' is the server's own time to send one change to all.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tasktrack.sync import SYNC_PATH, SyncClient  # noqa: E402
+from tasktrack.websocket import OP_TEXT, connect, encode_frame, read_message  # noqa: E402
+
+# Propagation target from the request that introduced the sync server
+TARGET_MS = 100
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+async def wait_for_server(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+class Subscriber:
+    """
+    A bare WebSocket client that timestamps every broadcast it receives (no replica, so the
+    measurement is the propagation itself rather than this process applying thousands of deltas).
+    """
+
+    def __init__(self, arrivals):
+        self.arrivals = arrivals  # Sequence number -> list of arrival times
+
+    async def run(self, port, since, connected):
+        reader, writer = await connect("127.0.0.1", port, SYNC_PATH)
+        writer.write(encode_frame(json.dumps({"type": "hello", "since": since}).encode(), OP_TEXT, mask=True))
+        while True:
+            message = await read_message(reader, writer, mask=True)
+            if message is None:
+                return
+            arrived = time.perf_counter()
+            payload = json.loads(message[1])
+            if payload["type"] == "ready":
+                connected.release()
+            elif payload["type"] == "changes":
+                for delta in payload["changes"]:
+                    self.arrivals.setdefault(delta["seq"], []).append(arrived)
+
+async def run_load_test(clients, changes, connect_batch):
+    scratch = tempfile.mkdtemp()
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "tasktrack", "--database", os.path.join(scratch, "shared.db"), "serve", "--port", str(port)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), stdout=subprocess.DEVNULL,
+    )
+    try:
+        await wait_for_server(port)
+        pusher = SyncClient(f"ws://127.0.0.1:{port}", os.path.join(scratch, "pusher.db"))
+        await pusher.connect()
+        await pusher.ready.wait()
+        task_ids = [await pusher.create_task(f"Task {index}", "", "Monday") for index in range(changes)]
+
+        arrivals = {}
+        connected = asyncio.Semaphore(0)
+        started = time.perf_counter()
+        subscriber_tasks = []
+        for first in range(0, clients, connect_batch):
+            batch = min(connect_batch, clients - first)
+            for _ in range(batch):
+                subscriber_tasks.append(asyncio.create_task(Subscriber(arrivals).run(port, pusher.last_seq, connected)))
+            for _ in range(batch):
+                await connected.acquire()
+        connect_seconds = time.perf_counter() - started
+
+        latencies = []
+        for index, task_id in enumerate(task_ids):
+            sent = time.perf_counter()
+            if index % 2:
+                await pusher.complete_task(task_id)
+            else:
+                await pusher.move_task(task_id, "Friday")
+            seq = pusher.last_seq
+            deadline = time.monotonic() + 10
+            while len(arrivals.get(seq, ())) < clients and time.monotonic() < deadline:
+                await asyncio.sleep(0.001)
+            latencies.extend((arrived - sent) * 1000 for arrived in arrivals.get(seq, ()))
+            await asyncio.sleep(0.05)  # Let the system settle between changes
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /status HTTP/1.1\r\n\r\n")
+        server_fan_out = json.loads((await reader.read()).partition(b"\r\n\r\n")[2])["broadcast"]
+
+        for task in subscriber_tasks:
+            task.cancel()
+        await pusher.close()
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    delivered = len(latencies)
+    return {
+        "clients": clients,
+        "changes": changes,
+        "connect_seconds": connect_seconds,
+        "deliveries": delivered,
+        "expected_deliveries": clients * changes,
+        "p50_ms": statistics.median(latencies) if latencies else None,
+        "p99_ms": latencies[min(delivered - 1, int(0.99 * delivered))] if latencies else None,
+        "max_ms": latencies[-1] if latencies else None,
+        "within_target": sum(latency < TARGET_MS for latency in latencies) / delivered if delivered else 0,
+        "server_fan_out": server_fan_out,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the TaskTrack sync server.")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--changes", type=int, default=20, help="moves and completions to propagate")
+    parser.add_argument("--connect-batch", type=int, default=200, help="clients connecting at once")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run_load_test(args.clients, args.changes, args.connect_batch)), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+TaskTrack core library.
+
+The task logic lives in plain-Python modules with no import-time side effects, so it can be
+used from scripts, workers and tests without a display. tkinter is only imported by
+tasktrack.ui. The names below are loaded on first access to keep 'import tasktrack' cheap.
+
+The package logs to the 'tasktrack' logger hierarchy and, like any library, leaves it to the
+application to configure handlers; until then nothing is printed.
+"""
+
+import logging
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# Public name -> module that defines it
+_EXPORTS = {
+    "DAYS_OF_WEEK": "db",
+    "TaskStore": "db",
+    "initialize_database": "db",
+    "TaskRepository": "repository",
+    "Task": "models",
+    "TaskCache": "cache",
+    "DatabaseExecutor": "executor",
+    "profiler": "profiling",
+    "import_tasks": "transfer",
+    "export_tasks": "transfer",
+    "load_analytics": "analytics",
+    "run_maintenance": "maintenance",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'tasktrack' has no attribute '{name}'")
+    from importlib import import_module
+
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,129 @@
+"""
+Progress and workload statistics for the analytics view: completion rates per day, week and
+course, a week-by-weekday workload heatmap and overdue counts.
+
+The database does the per-task work in two GROUP BY queries. Their per-day counts come back as
+column arrays and are rolled up into weeks, the heatmap and the overdue total with NumPy when
+it is installed (the same arithmetic runs in plain Python otherwise). Results are cached per
+database until the change journal moves on, i.e. until any mutation, from any process.
+"""
+
+import threading
+
+from .dates import today_epoch_day
+
+try:
+    import numpy
+except ImportError:  # Optional: the plain Python roll-up gives the same results
+    numpy = None
+
+_cache = {}  # Database path -> analytics
+_cache_lock = threading.Lock()
+
+def _rate(completed, total):
+    return completed / total if total else None
+
+def _roll_up_numpy(days, totals, completed, today):
+    days = numpy.asarray(days, dtype=numpy.int64)
+    totals = numpy.asarray(totals, dtype=numpy.int64)
+    completed = numpy.asarray(completed, dtype=numpy.int64)
+
+    weekdays = (days + 4) % 7  # Sunday is 0, as in dates.weekday_index
+    week_starts = days - weekdays
+    week_indexes = (week_starts - week_starts[0]) // 7
+    heatmap = numpy.zeros((int(week_indexes[-1]) + 1, 7), dtype=numpy.int64)
+    heatmap[week_indexes, weekdays] = totals  # One row per day, so no two days share a cell
+    week_completed = numpy.bincount(week_indexes, weights=completed, minlength=len(heatmap)).astype(numpy.int64)
+    overdue = (totals - completed)[days < today].sum()
+    return int(week_starts[0]), heatmap.tolist(), week_completed.tolist(), int(overdue)
+
+def _roll_up_python(days, totals, completed, today):
+    first_week = days[0] - (days[0] + 4) % 7
+    heatmap = [[0] * 7 for _ in range((days[-1] - first_week) // 7 + 1)]
+    week_completed = [0] * len(heatmap)
+    overdue = 0
+    for day, day_total, day_completed in zip(days, totals, completed):
+        week_index, weekday = divmod(day - first_week, 7)
+        heatmap[week_index][weekday] = day_total
+        week_completed[week_index] += day_completed
+        if day < today:
+            overdue += day_total - day_completed
+    return first_week, heatmap, week_completed, overdue
+
+def compute_analytics(repository, today=None):
+    """
+    Compute every statistic of the analytics view from the database.
+
+    Args:
+        repository (TaskRepository): The repository to query.
+        today (int): Today's epoch day (default is today); active tasks due before it are overdue.
+
+    Returns:
+        dict: 'today'; 'total', 'completed', 'completion_rate' and 'overdue' over every task;
+            'days' and 'weeks' as (epoch day, tasks, completed, rate) tuples, weeks by their
+            Sunday and only those with tasks; 'courses' as (course, tasks, completed, rate,
+            overdue) tuples; 'heatmap' as {'first_week': epoch day of its first Sunday,
+            'counts': one list of 7 task counts (Sunday to Saturday) per week}. Rates are None
+            when there are no tasks to divide by.
+    """
+
+    if today is None:
+        today = today_epoch_day()
+    day_rows = repository.count_tasks_by_due_day()
+    course_rows = repository.count_tasks_by_course(today)
+
+    analytics = {
+        "today": today,
+        "days": [],
+        "weeks": [],
+        "courses": [(course, total, completed, _rate(completed, total), overdue) for course, total, completed, overdue in course_rows],
+        "heatmap": {"first_week": None, "counts": []},
+        "overdue": 0,
+    }
+    analytics["total"] = sum(row[1] for row in course_rows)
+    analytics["completed"] = sum(row[2] for row in course_rows)
+    analytics["completion_rate"] = _rate(analytics["completed"], analytics["total"])
+    if not day_rows:
+        return analytics
+
+    days, totals, completed = (list(column) for column in zip(*day_rows))
+    roll_up = _roll_up_numpy if numpy is not None else _roll_up_python
+    first_week, heatmap, week_completed, overdue = roll_up(days, totals, completed, today)
+
+    analytics["days"] = [(day, total, done, done / total) for day, total, done in day_rows]
+    analytics["weeks"] = [
+        (first_week + 7 * week_index, sum(counts), done, _rate(done, sum(counts)))
+        for week_index, (counts, done) in enumerate(zip(heatmap, week_completed)) if any(counts)
+    ]
+    analytics["heatmap"] = {"first_week": first_week, "counts": heatmap}
+    analytics["overdue"] = overdue
+    return analytics
+
+def load_analytics(repository, today=None):
+    """
+    Return the analytics of a database, computing them only if a task changed since last time.
+
+    Every mutation appends to the change journal (see TaskRepository.latest_change), so the
+    cached result is reused exactly as long as the journal hasn't moved.
+
+    Args:
+        repository (TaskRepository): The repository to query.
+        today (int): Today's epoch day (default is today).
+
+    Returns:
+        dict: See compute_analytics, plus the journal sequence number 'seq' they reflect.
+    """
+
+    if today is None:
+        today = today_epoch_day()
+    seq = repository.latest_change()
+    with _cache_lock:
+        cached = _cache.get(repository.path)
+    if cached is not None and cached["seq"] == seq and cached["today"] == today:
+        return cached
+
+    analytics = compute_analytics(repository, today)
+    analytics["seq"] = seq
+    with _cache_lock:
+        _cache[repository.path] = analytics
+    return analytics
@@ -0,0 +1,144 @@
+"""
+TaskCache: bounded, thread-safe LRU cache of task records keyed by task ID.
+"""
+
+from collections import OrderedDict
+import threading
+
+class TaskCache:
+    """
+    Least-recently-used cache of task records (ID, title, content, day, status).
+
+    One cache can be shared by the repositories of several threads. Mutations update or drop
+    their entries (write-through), and a load that raced with a mutation is never cached:
+    take a token with load_token() before querying and pass it to put_loaded().
+
+    A write-through happens before its COMMIT, so until the writer calls committed(), other
+    connections still read the old row; put_loaded() refuses records of tasks with uncommitted
+    mutations, and committed() voids the tokens of loads that may have read the old row.
+    """
+
+    def __init__(self, capacity=256):
+        """
+        Args:
+            capacity (int): Maximum number of records kept; the least recently used is evicted.
+        """
+
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._records = OrderedDict()
+        self._version = 0  # Bumped by every mutation and commit
+        self._uncommitted = set()  # IDs of tasks mutated since the last commit
+        self._lock = threading.Lock()
+
+    def get(self, task_id):
+        """
+        Return a cached record and mark it as recently used.
+
+        Returns:
+            tuple: The record, or None (counted as a miss) if it isn't cached.
+        """
+
+        with self._lock:
+            record = self._records.get(task_id)
+            if record is None:
+                self.misses += 1
+                return None
+            self._records.move_to_end(task_id)
+            self.hits += 1
+            return record
+
+    def load_token(self):
+        """
+        Returns:
+            int: Token to pass to put_loaded for a record about to be read from the database.
+        """
+
+        return self._version
+
+    def put_loaded(self, record, token):
+        """
+        Cache a record read from the database, unless a mutation or commit happened since 'token'
+        was taken or the task has uncommitted mutations.
+        """
+
+        with self._lock:
+            if token == self._version and record[0] not in self._uncommitted:
+                self._store(record)
+
+    def put(self, record):
+        """
+        Write a record through after a mutation.
+        """
+
+        with self._lock:
+            self._version += 1
+            self._uncommitted.add(record[0])
+            self._store(record)
+
+    def update(self, task_id, **fields):
+        """
+        Apply a mutation to a cached record (if there is one).
+
+        Args:
+            task_id (int): The ID of the mutated task.
+            **fields: New values for any of 'title', 'content', 'day' and 'status'.
+        """
+
+        with self._lock:
+            self._version += 1
+            self._uncommitted.add(task_id)
+            record = self._records.get(task_id)
+            if record is not None:
+                task_id, title, content, day, status = record
+                self._records[task_id] = (
+                    task_id,
+                    fields.get("title", title),
+                    fields.get("content", content),
+                    fields.get("day", day),
+                    fields.get("status", status),
+                )
+
+    def discard(self, task_id):
+        """
+        Drop a task's record, if it is cached.
+        """
+
+        with self._lock:
+            self._version += 1
+            self._uncommitted.add(task_id)
+            self._records.pop(task_id, None)
+
+    def clear(self):
+        """
+        Drop every cached record.
+        """
+
+        with self._lock:
+            self._version += 1
+            self._records.clear()
+
+    def committed(self):
+        """
+        Note that the writer committed its mutations, so every connection now reads them.
+        """
+
+        with self._lock:
+            self._version += 1
+            self._uncommitted.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: 'hits', 'misses', 'size' and 'capacity'.
+        """
+
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._records), "capacity": self.capacity}
+
+    def _store(self, record):
+        self._records[record[0]] = record
+        self._records.move_to_end(record[0])
+        if len(self._records) > self.capacity:
+            self._records.popitem(last=False)
@@ -0,0 +1,367 @@
+"""
+TaskCardCanvas: one day column of task cards drawn on a single tk.Canvas.
+"""
+
+import tkinter as tk
+
+# Card geometry in pixels: space around each card, and between its border and its text
+CARD_MARGIN = 5
+CARD_PADDING = 10
+CARD_MIN_WIDTH = 120
+
+CARD_FONT = ("Roboto", 10, "bold")
+CARD_TEXT_COLOR = "#6A7F8C"
+CARD_FILL = "white"  # For tasks without a color of their own
+
+# Border of a selected card
+CARD_SELECTED_OUTLINE = "#1D3557"
+CARD_SELECTED_WIDTH = 3
+
+# Modifier bits of a Tk event's 'state'
+SHIFT_MASK = 0x1
+CONTROL_MASK = 0x4
+
+# Pixels the pointer must travel with the button held before a click becomes a drag
+DRAG_THRESHOLD = 5
+
+# Text color of a card while it is being dragged
+CARD_DRAGGED_TEXT_COLOR = "#B0BEC5"
+
+class TaskCardCanvas:
+    """
+    Draws a day's tasks as cards on one canvas, top to bottom in display order.
+
+    A card is just two canvas items (a rectangle and its text) tagged 'card'. The canvas has
+    one <Enter>, <Leave> and <Button-1> binding shared by every card, so a card costs no widget,
+    no Tcl command and no Python closure; the handlers find the card under the pointer through
+    the item -> task ID map. Reordering or resizing only moves items with coords().
+
+    A click opens a card; Ctrl+click toggles it in the selection and Shift+click selects the
+    range from the last card clicked. Dragging a card moves a single label (the drag proxy)
+    over the window with the pointer; the card itself stays put until it is dropped.
+    """
+
+    def __init__(self, master, color, on_open, on_select=None, on_drag=None, on_drop=None):
+        """
+        Args:
+            master (tk.Widget): The day column the canvas is packed into.
+            color (str): The column color, used for the background and the hover highlight.
+            on_open (callable): Called with a card's Task when it is clicked.
+            on_select (callable): Called with this TaskCardCanvas whenever its selection changes.
+            on_drag (callable): Called as on_drag(task, x_root, y_root) as a card is dragged.
+            on_drop (callable): Called as on_drop(task, x_root, y_root) when a dragged card is released.
+        """
+
+        self.color = color
+        self.on_open = on_open
+        self.on_select = on_select
+        self.on_drag = on_drag
+        self.on_drop = on_drop
+        self.selected = set()  # IDs of the selected tasks
+        self._anchor = None  # Task ID a Shift+click selects from
+        self._press = None  # (task ID, x_root, y_root) of a plain press on a card, until the release
+        self._proxy = None  # Label following the pointer while a card is dragged
+        self._proxy_offset = (0, 0)
+        self.canvas = tk.Canvas(master, bg=color, highlightthickness=0, bd=0, yscrollincrement=10)
+        self.tasks = {}  # Task ID -> Task, in display order
+        self._items = {}  # Task ID -> (rectangle item, text item)
+        self._owners = {}  # Canvas item -> task ID
+        self._tops = {}  # Task ID -> y of the card's top edge
+        self._bottoms = {}  # Task ID -> y of the card's bottom edge
+        self._width = CARD_MIN_WIDTH
+
+        self.canvas.tag_bind("card", "<Enter>", self._on_enter)
+        self.canvas.tag_bind("card", "<Leave>", self._on_leave)
+        self.canvas.tag_bind("card", "<Button-1>", self._on_press)
+        self.canvas.tag_bind("card", "<B1-Motion>", self._on_motion)
+        self.canvas.tag_bind("card", "<ButtonRelease-1>", self._on_release)
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    ################################################## CHANGES ##################################################
+    def add(self, task):
+        """
+        Draw a card for 'task' at the bottom of the column.
+
+        Args:
+            task (Task): The task to show.
+        """
+
+        self.tasks[task.id] = task
+        self._draw(task)
+        self._layout(len(self.tasks) - 1)
+
+    def remove(self, task_id):
+        """
+        Erase a task's card and close the gap it leaves. Does nothing if it isn't shown.
+
+        Args:
+            task_id (int): The ID of the task.
+        """
+
+        if task_id not in self.tasks:
+            return
+        index = list(self.tasks).index(task_id)
+        was_selected = task_id in self.selected
+        self._erase(task_id)
+        if index < len(self.tasks):
+            self._layout(index)
+        if was_selected:
+            self._selection_changed()
+
+    def relabel(self, task_id, title):
+        """
+        Show a new title on a task's card.
+
+        Args:
+            task_id (int): The ID of the task.
+            title (str): The new title.
+        """
+
+        self.tasks[task_id].title = title
+        self.canvas.itemconfigure(self._items[task_id][1], text=title)
+        self._layout(list(self.tasks).index(task_id))  # The new title may wrap differently
+
+    def recolor(self, task_id, color):
+        """
+        Fill a task's card with a new color.
+
+        Args:
+            task_id (int): The ID of the task.
+            color (str): The new color, or None for the default.
+        """
+
+        self.tasks[task_id].color = color
+        self.canvas.itemconfigure(self._items[task_id][0], fill=color or CARD_FILL)
+
+    def sync(self, tasks):
+        """
+        Bring the column in line with 'tasks' by touching only the cards that changed: deleted
+        tasks are erased, new ones drawn, renamed ones relabeled, recolored ones refilled, and the
+        cards from the first difference down are moved into place.
+
+        Args:
+            tasks (list): Task records in display order.
+
+        Returns:
+            dict: Number of cards 'inserted', 'deleted', 'moved', 'relabeled' and 'recolored'.
+        """
+
+        touched = {"inserted": 0, "deleted": 0, "moved": 0, "relabeled": 0, "recolored": 0}
+        selected_before = len(self.selected)
+        old_order = list(self.tasks)
+        new_ids = {task.id for task in tasks}
+
+        for task_id in [task_id for task_id in old_order if task_id not in new_ids]:
+            self._erase(task_id)
+            touched["deleted"] += 1
+
+        first_change = None
+        shown = {}
+        for index, task in enumerate(tasks):
+            current = self.tasks.get(task.id)
+            changed = current is None
+            if current is None:
+                self._draw(task)
+                touched["inserted"] += 1
+            else:
+                if current.title != task.title:
+                    self.canvas.itemconfigure(self._items[task.id][1], text=task.title)
+                    touched["relabeled"] += 1
+                    changed = True
+                if current.color != task.color:
+                    self.canvas.itemconfigure(self._items[task.id][0], fill=task.color or CARD_FILL)
+                    touched["recolored"] += 1
+            shown[task.id] = task
+            if first_change is None and (changed or index >= len(old_order) or old_order[index] != task.id):
+                first_change = index
+
+        self.tasks = shown
+        if first_change is None and len(old_order) > len(tasks):
+            first_change = len(tasks)  # Only the tail was deleted
+        if first_change is not None:
+            touched["moved"] = self._layout(first_change)
+        if len(self.selected) != selected_before:
+            self._selection_changed()  # Selected cards were erased
+        return touched
+
+    ################################################## SELECTION ##################################################
+    def select(self, task_ids, selected=True):
+        """
+        Add cards to the selection, or remove them from it.
+
+        Args:
+            task_ids (iterable): IDs of tasks shown in this column.
+            selected (bool): Whether they should be selected.
+        """
+
+        for task_id in task_ids:
+            if (task_id in self.selected) != selected:
+                if selected:
+                    self.selected.add(task_id)
+                else:
+                    self.selected.discard(task_id)
+                self._show_selected(task_id)
+        self._selection_changed()
+
+    def select_all(self):
+        """
+        Select every card in the column, or clear the selection if they all are already.
+        """
+
+        self.select(list(self.tasks), selected=len(self.selected) < len(self.tasks))
+
+    def clear_selection(self):
+        """
+        Deselect every card in the column.
+        """
+
+        if self.selected:
+            self.select(list(self.selected), selected=False)
+
+    def _show_selected(self, task_id):
+        selected = task_id in self.selected
+        self.canvas.itemconfigure(self._items[task_id][0], width=CARD_SELECTED_WIDTH if selected else 1,
+                                  outline=CARD_SELECTED_OUTLINE if selected else CARD_TEXT_COLOR)
+
+    def _selection_changed(self):
+        if self.on_select is not None:
+            self.on_select(self)
+
+    ################################################## DRAWING ##################################################
+    def _draw(self, task):
+        text = self.canvas.create_text(
+            0, 0, text=task.title, width=self._width - 2 * (CARD_MARGIN + CARD_PADDING),
+            justify="center", font=CARD_FONT, fill=CARD_TEXT_COLOR, tags="card"
+        )
+        rectangle = self.canvas.create_rectangle(0, 0, 0, 0, fill=task.color or CARD_FILL, outline=CARD_TEXT_COLOR, tags="card")
+        self.canvas.tag_lower(rectangle, text)
+        self._items[task.id] = (rectangle, text)
+        self._owners[rectangle] = self._owners[text] = task.id
+
+    def _erase(self, task_id):
+        rectangle, text = self._items.pop(task_id)
+        self.canvas.delete(rectangle, text)
+        del self._owners[rectangle], self._owners[text], self.tasks[task_id]
+        self.selected.discard(task_id)
+        if self._anchor == task_id:
+            self._anchor = None
+        self._tops.pop(task_id, None)
+        self._bottoms.pop(task_id, None)
+
+    def _layout(self, start_index):
+        """
+        Position the cards from 'start_index' down, each below the previous one.
+
+        Returns:
+            int: Number of cards that were already drawn and changed position.
+        """
+
+        order = list(self.tasks)
+        top = self._bottoms[order[start_index - 1]] + CARD_MARGIN if start_index else CARD_MARGIN
+        moved = 0
+        for task_id in order[start_index:]:
+            rectangle, text = self._items[task_id]
+            x0, y0, x1, y1 = self.canvas.bbox(text)
+            bottom = top + (y1 - y0) + 2 * CARD_PADDING
+            if self._tops.get(task_id, top) != top:
+                moved += 1
+            self.canvas.coords(rectangle, CARD_MARGIN, top, self._width - CARD_MARGIN, bottom)
+            self.canvas.coords(text, self._width / 2, (top + bottom) / 2)
+            self._tops[task_id] = top
+            self._bottoms[task_id] = bottom
+            top = bottom + CARD_MARGIN
+        self.canvas.configure(scrollregion=(0, 0, self._width, top))
+        return moved
+
+    ################################################## EVENTS ##################################################
+    def _task_under_pointer(self):
+        current = self.canvas.find_withtag("current")
+        return self._owners.get(current[0]) if current else None
+
+    def _highlight(self, task_id, highlighted):
+        rectangle, text = self._items[task_id]
+        self.canvas.itemconfigure(rectangle, fill=self.color if highlighted else self.tasks[task_id].color or CARD_FILL)
+        self.canvas.itemconfigure(text, fill="white" if highlighted else CARD_TEXT_COLOR)
+
+    def _on_enter(self, event):
+        task_id = self._task_under_pointer()
+        if task_id is not None:
+            self._highlight(task_id, True)
+
+    def _on_leave(self, event):
+        task_id = self._task_under_pointer()
+        if task_id is not None:
+            self._highlight(task_id, False)
+
+    def _on_press(self, event):
+        self._press = None
+        task_id = self._task_under_pointer()
+        if task_id is None:
+            return
+        if event.state & SHIFT_MASK and self._anchor is not None:
+            order = list(self.tasks)
+            first, last = sorted((order.index(self._anchor), order.index(task_id)))
+            self.select(order[first:last + 1])
+        elif event.state & CONTROL_MASK:
+            self.select([task_id], selected=task_id not in self.selected)
+            self._anchor = task_id
+        else:
+            self._anchor = task_id
+            self._press = (task_id, event.x_root, event.y_root)  # A click or the start of a drag
+
+    def _on_motion(self, event):
+        if self._press is None or self._press[0] not in self.tasks:
+            return
+        task_id, x_root, y_root = self._press
+        if self._proxy is None:
+            if abs(event.x_root - x_root) < DRAG_THRESHOLD and abs(event.y_root - y_root) < DRAG_THRESHOLD:
+                return
+            self._start_drag(task_id, event)
+        # Only the proxy moves during the drag: one geometry change per motion event
+        self._proxy.place_configure(x=event.x_root - self._proxy_offset[0], y=event.y_root - self._proxy_offset[1])
+        if self.on_drag is not None:
+            self.on_drag(self.tasks[task_id], event.x_root, event.y_root)
+
+    def _start_drag(self, task_id, event):
+        window = self.canvas.winfo_toplevel()
+        self._proxy = tk.Label(window, text=self.tasks[task_id].title, font=CARD_FONT, fg="white", bg=self.color,
+                               relief="solid", bd=1, padx=CARD_PADDING, pady=CARD_PADDING // 2, wraplength=CARD_MIN_WIDTH)
+        self._proxy_offset = (window.winfo_rootx() - 10, window.winfo_rooty() - 10)  # Just below and right of the pointer
+        self._proxy.lift()
+        self.canvas.itemconfigure(self._items[task_id][1], fill=CARD_DRAGGED_TEXT_COLOR)
+
+    def _on_release(self, event):
+        if self._press is None:
+            return
+        task_id = self._press[0]
+        self._press = None
+        dragged = self._proxy is not None
+        if dragged:
+            self._proxy.destroy()
+            self._proxy = None
+        task = self.tasks.get(task_id)
+        if task is None:
+            return  # A refresh erased the card meanwhile
+        if not dragged:
+            self.on_open(task)
+            return
+        self._highlight(task_id, False)
+        if self.on_drop is not None:
+            self.on_drop(task, event.x_root, event.y_root)
+
+    def _on_resize(self, event):
+        width = max(event.width, CARD_MIN_WIDTH)
+        if width == self._width:
+            return
+        self._width = width
+        for rectangle, text in self._items.values():
+            self.canvas.itemconfigure(text, width=width - 2 * (CARD_MARGIN + CARD_PADDING))
+        if self.tasks:
+            self._layout(0)
+
+    def _on_mousewheel(self, event):
+        self.canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
@@ -0,0 +1,215 @@
+"""
+Headless command line: bulk import/export and the cold-import time check.
+
+    python -m tasktrack import syllabus.csv
+    python -m tasktrack export backup.ics
+    python -m tasktrack import-time
+    python -m tasktrack migrate
+    python -m tasktrack maintain --archive-after 90
+    python -m tasktrack --database shared.db serve --port 8765
+    python -m tasktrack --database replica.db replicate ws://localhost:8765
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from .db import DEFAULT_DATABASE_PATH
+
+# Formats accepted by --format (kept here so --help doesn't import the transfer module)
+FILE_FORMATS = ["csv", "ics", "jsonl"]
+
+# Longest acceptable cold import of the headless core, in milliseconds
+IMPORT_TIME_BUDGET_MS = 50
+
+# Modules a headless script needs; none of them may pull in tkinter
+CORE_MODULES = ["tasktrack.repository", "tasktrack.executor", "tasktrack.transfer"]
+
+def measure_import_time(modules=CORE_MODULES, runs=5):
+    """
+    Time a cold import of 'modules' in fresh interpreters.
+
+    Args:
+        modules (list): Module names to import.
+        runs (int): Number of interpreters to start; the fastest run is reported.
+
+    Returns:
+        tuple: (milliseconds, whether tkinter was imported).
+    """
+
+    script = (
+        "import sys, time; started = time.perf_counter(); "
+        + "; ".join(f"import {module}" for module in modules)
+        + "; print((time.perf_counter() - started) * 1000, 'tkinter' in sys.modules)"
+    )
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        milliseconds, imported_tkinter = output.split()
+        timings.append((float(milliseconds), imported_tkinter == "True"))
+    return min(timings)
+
+def database_file_size(path):
+    """
+    Args:
+        path (str): Location of the database file.
+
+    Returns:
+        int: Bytes the database takes on disk, including its write-ahead log.
+    """
+
+    return sum(os.path.getsize(path + suffix) for suffix in ("", "-wal") if os.path.exists(path + suffix))
+
+def migrate_database(path):
+    """
+    Bring a database's schema up to date, then VACUUM it so the space the migrations freed is
+    returned to the file system and later maintenance passes can release free pages
+    incrementally (see tasktrack.maintenance).
+
+    Args:
+        path (str): Location of the database file.
+
+    Returns:
+        dict: Schema 'from_version' and 'to_version', file size in bytes 'size_before' and
+            'size_after', and elapsed 'seconds'.
+    """
+
+    import sqlite3
+
+    from .db import initialize_database
+
+    size_before = database_file_size(path)
+    started = time.perf_counter()
+    probe = sqlite3.connect(path)
+    from_version = probe.execute("PRAGMA user_version").fetchone()[0]
+    probe.close()
+    conn = initialize_database(path)
+    try:
+        to_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    return {"from_version": from_version, "to_version": to_version, "size_before": size_before,
+            "size_after": database_file_size(path), "seconds": time.perf_counter() - started}
+
+def run_cli(argv):
+    """
+    Run a command without opening the weekly view.
+
+    Args:
+        argv (list): Command line arguments, e.g. ['import', 'syllabus.csv'].
+
+    Returns:
+        int: Process exit status.
+    """
+
+    parser = argparse.ArgumentParser(prog="tasktrack", description="Headless TaskTrack commands.")
+    parser.add_argument("--database", default=DEFAULT_DATABASE_PATH, help="database file (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="import tasks from a CSV, JSON Lines or iCalendar file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=FILE_FORMATS, help="file format (default: from the extension)")
+    import_parser.add_argument("--chunk-size", type=int, help="tasks read and inserted at a time (default: 5000)")
+
+    export_parser = commands.add_parser("export", help="export every task to a CSV, JSON Lines or iCalendar file")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", choices=FILE_FORMATS, help="file format (default: from the extension)")
+
+    serve_parser = commands.add_parser("serve", help="share the database with sync clients over HTTP/WebSocket")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: %(default)s)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="port to listen on (default: %(default)s)")
+
+    replicate_parser = commands.add_parser("replicate", help="keep the database in sync as a replica of a sync server")
+    replicate_parser.add_argument("url", help="server address, e.g. ws://localhost:8765")
+
+    commands.add_parser("migrate", help="bring the database schema up to date and report its size on disk before and after")
+
+    maintain_parser = commands.add_parser("maintain", help="archive old completed tasks, release free space, "
+                                          "refresh planner statistics and check integrity")
+    maintain_parser.add_argument("--archive-after", type=int, metavar="DAYS",
+                                 help="archive completed tasks due more than DAYS days ago (default: 90)")
+    maintain_parser.add_argument("--archive", help="archive database (default: next to the database, e.g. tasks-archive.db)")
+
+    commands.add_parser("import-time", help=f"check the cold import of the core against its {IMPORT_TIME_BUDGET_MS} ms budget")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "import-time":
+        milliseconds, imported_tkinter = measure_import_time()
+        within_budget = milliseconds <= IMPORT_TIME_BUDGET_MS and not imported_tkinter
+        print(f"Cold import of {', '.join(CORE_MODULES)}: {milliseconds:.1f} ms "
+              f"(budget {IMPORT_TIME_BUDGET_MS} ms){', tkinter was imported' if imported_tkinter else ''}")
+        return 0 if within_budget else 1
+
+    if "TASKTRACK_PROFILE" not in os.environ:
+        from .profiling import profiler
+
+        profiler.enabled = False  # Nobody sees a one-off command's spans
+
+    if args.command == "migrate":
+        result = migrate_database(args.database)
+        print(f"Schema version {result['from_version']} -> {result['to_version']} in {result['seconds']:.1f}s; "
+              f"{args.database}: {result['size_before'] / 2 ** 20:.1f} MiB -> {result['size_after'] / 2 ** 20:.1f} MiB")
+        return 0
+
+    if args.command == "maintain":
+        from .maintenance import format_report, run_maintenance
+        from .repository import TaskRepository
+
+        archive_after = {"archive_after_days": args.archive_after} if args.archive_after is not None else {}
+        repository = TaskRepository(args.database)
+        try:
+            report = run_maintenance(repository, archive_path=args.archive, **archive_after)
+        finally:
+            repository.close()
+        print(format_report(report))
+        return 0 if not report["integrity"] else 1
+
+    if args.command in ("serve", "replicate"):
+        import asyncio
+
+        from . import sync
+
+        if args.command == "serve":
+            server = sync.SyncServer(args.database, args.host, args.port)
+            started = lambda: print(f"Serving {args.database} on ws://{args.host}:{server.port}{sync.SYNC_PATH}", flush=True)
+            session = server.serve_forever(on_started=started)
+        else:
+            session = sync.replicate(args.url, args.database,
+                                     on_changes=lambda deltas: print(f"Applied {len(deltas)} changes", flush=True))
+        try:
+            asyncio.run(session)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    from .repository import TaskRepository
+    from .transfer import export_tasks, import_tasks
+
+    repository = TaskRepository(args.database)
+    try:
+        if args.command == "import":
+            chunk_size = {"chunk_size": args.chunk_size} if args.chunk_size else {}
+            result = import_tasks(repository, args.path, args.format, **chunk_size)
+        else:
+            result = export_tasks(repository, args.path, args.format)
+    except (OSError, ValueError) as error:
+        print(f"{args.command} failed: {error}", file=sys.stderr)
+        return 1
+    finally:
+        repository.close()
+
+    print(f"{args.command.capitalize()}ed {result['rows']} tasks in {result['seconds']:.2f}s "
+          f"({result['rows_per_second']:.0f} tasks/s)")
+    return 0
+
+def main():
+    """
+    Console entry point.
+    """
+
+    sys.exit(run_cli(sys.argv[1:]))
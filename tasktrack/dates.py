@@ -0,0 +1,74 @@
+"""
+Due dates are stored as epoch days: whole days since 1970-01-01. Weeks run Sunday to Saturday.
+"""
+
+from datetime import date, timedelta
+
+from .db import DAYS_OF_WEEK
+
+_EPOCH = date(1970, 1, 1)
+
+def to_epoch_day(value):
+    """
+    Args:
+        value (datetime.date): A date (or datetime).
+
+    Returns:
+        int: Days since 1970-01-01.
+    """
+
+    if hasattr(value, "date"):
+        value = value.date()
+    return (value - _EPOCH).days
+
+def from_epoch_day(epoch_day):
+    """
+    Returns:
+        datetime.date: The date 'epoch_day' days after 1970-01-01.
+    """
+
+    return _EPOCH + timedelta(days=epoch_day)
+
+def today_epoch_day():
+    """
+    Returns:
+        int: Today's epoch day.
+    """
+
+    return to_epoch_day(date.today())
+
+def weekday_index(epoch_day):
+    """
+    Returns:
+        int: Position of the day in the week, with Sunday as 0 (1970-01-01 was a Thursday).
+    """
+
+    return (epoch_day + 4) % 7
+
+def weekday_name(epoch_day):
+    """
+    Returns:
+        str: The day's name, e.g. 'Monday'.
+    """
+
+    return DAYS_OF_WEEK[weekday_index(epoch_day)]
+
+def week_start(epoch_day):
+    """
+    Returns:
+        int: Epoch day of the Sunday that starts the week containing 'epoch_day'.
+    """
+
+    return epoch_day - weekday_index(epoch_day)
+
+def day_in_week(day, start):
+    """
+    Args:
+        day (str): A day name, e.g. 'Monday'.
+        start (int): Epoch day of the week's Sunday.
+
+    Returns:
+        int: Epoch day of that day in the week.
+    """
+
+    return start + DAYS_OF_WEEK.index(day)
@@ -0,0 +1,638 @@
+"""
+SQLite schema, migrations and the write-behind TaskStore.
+"""
+
+from contextlib import contextmanager
+import os
+import sqlite3
+import time
+import weakref
+
+from .notes import register_note_functions
+from .profiling import TracedConnection
+
+# Days in the order the weekly view displays them
+DAYS_OF_WEEK = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+# Location of the task database when none is given
+DEFAULT_DATABASE_PATH = "tasks.db"
+
+# Oldest SQLite library the schema works with: migrations drop a column (3.35), and the schema
+# relies on generated columns (3.31), iif() (3.32) and the JSON functions
+MINIMUM_SQLITE_VERSION = (3, 35, 0)
+
+# Task columns the change journal records, besides the ID ('content' is the note, from task_notes)
+JOURNAL_COLUMNS = ("title", "content", "day", "status", "due_day", "color")
+
+def initialize_database(path=DEFAULT_DATABASE_PATH):
+    """
+    Initialize the SQLite database, create the 'tasks' table if it doesn't already exist
+    and bring the schema up to the latest version.
+
+    Args:
+        path (str): Location of the database file.
+
+    Returns:
+        sqlite3.Connection: Connection object to the database.
+
+    Raises:
+        sqlite3.NotSupportedError: Python's SQLite library is older than MINIMUM_SQLITE_VERSION.
+    """
+
+    if sqlite3.sqlite_version_info < MINIMUM_SQLITE_VERSION:
+        raise sqlite3.NotSupportedError(
+            f"TaskTrack needs SQLite {'.'.join(map(str, MINIMUM_SQLITE_VERSION))} or newer, but this Python uses "
+            f"SQLite {sqlite3.sqlite_version}; install a Python built with a newer SQLite"
+        )
+
+    conn = sqlite3.connect(path, factory=TracedConnection)
+    register_note_functions(conn)
+    register_journal_functions(conn)
+
+    # Let the maintenance pass hand free pages back to the file system a few at a time. This only
+    # takes effect before the first write to a new database, and switching to WAL already writes
+    # its header, so it comes first; 'python -m tasktrack migrate' converts an existing database.
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+    # Write-ahead logging lets commits append to the log instead of rewriting pages,
+    # and synchronous=NORMAL only fsyncs at checkpoints, which is safe in WAL mode
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+
+    cursor = conn.cursor()
+    
+    # Create a table for tasks
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            content TEXT,
+            day TEXT NOT NULL,
+            status TEXT NOT NULL
+        )
+    ''')
+    conn.commit()
+    migrate_schema(conn)
+    return conn
+
+def _migration_add_day_and_status(conn):
+    """
+    Schema version 1: add the 'day' and 'status' columns to databases created before they existed.
+    """
+
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+    if "day" not in columns:
+        conn.execute("ALTER TABLE tasks ADD COLUMN day TEXT DEFAULT 'Monday'")
+    if "status" not in columns:
+        conn.execute("ALTER TABLE tasks ADD COLUMN status TEXT DEFAULT 'not-completed'")
+
+def _migration_add_task_indexes(conn):
+    """
+    Schema version 2: covering indexes for the weekly view and title lookups.
+    (status, day, title) plus the implicit rowid answers the weekly query without touching the table.
+    """
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status_day ON tasks (status, day, title)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_title ON tasks (title)")
+
+def _migration_add_completed_index(conn):
+    """
+    Schema version 3: covering index ordered by (status, ID) for keyset paging through completed tasks.
+    """
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status_id ON tasks (status, id, title, day)")
+
+def _migration_add_search_index(conn):
+    """
+    Schema version 4: FTS5 full-text index over task titles and content, kept in sync by triggers.
+    Prefix indexes make short prefix queries cheap, and titles weigh ten times more than content.
+    """
+
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            title, content,
+            content='tasks', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    ''')
+    conn.execute("INSERT INTO tasks_fts (tasks_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, content ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO tasks_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    ''')
+    conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")  # Index the existing tasks
+
+def _migration_add_due_dates(conn):
+    """
+    Schema version 5: give every task a real due date, stored as an epoch day (see tasktrack.dates),
+    with a covering index for date range scans. Existing tasks are placed on their weekday in the
+    current week, which is where the weekly view used to show them.
+    """
+
+    from .dates import today_epoch_day, week_start
+
+    conn.execute("ALTER TABLE tasks ADD COLUMN due_day INTEGER")
+    conn.execute(
+        "UPDATE tasks SET due_day = ? + CASE day "
+        + " ".join(f"WHEN '{day}' THEN {index}" for index, day in enumerate(DAYS_OF_WEEK))
+        + " ELSE 0 END",
+        (week_start(today_epoch_day()),),
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_due_day ON tasks (due_day, status, title)")
+
+def _migration_drop_title_index(conn):
+    """
+    Schema version 6: tasks are only ever addressed by ID now, so the title index is dead weight
+    on every insert and rename.
+    """
+
+    conn.execute("DROP INDEX IF EXISTS idx_tasks_title")
+
+def _journal_row(prefix, columns, content=None):
+    """
+    SQL expression that captures a task row ('new' or 'old' in a trigger) as a JSON object.
+    'content', if given, is the SQL expression recorded as the content instead of the row's column.
+    """
+
+    values = {column: f"{prefix}.{column}" for column in columns}
+    if content is not None:
+        values["content"] = content
+    return "json_object(" + ", ".join(f"'{column}', {value}" for column, value in values.items()) + ")"
+
+# The text of a task's note (see tasktrack.notes), or '' if it has none; format with the task ID expression.
+# Plain text notes are read without a call into Python; only compressed ones go through note_text.
+_NOTE_TEXT = "COALESCE((SELECT iif(typeof(body) = 'text', body, note_text(body)) FROM task_notes WHERE task_id = {task_id}), '')"
+
+# The current journal action of the writing connection (see register_journal_functions); a task
+# write made outside an action fails instead of joining whichever action happens to be newest
+_CURRENT_ACTION = "COALESCE(journal_action(), RAISE(ABORT, 'tasks can only be changed inside a journal action'))"
+
+def register_journal_functions(conn):
+    """
+    Make journal_action() available to SQL on a connection: the ID of the action its writes
+    belong to, which TaskRepository.action() keeps in the connection's 'journal_action'
+    attribute, or NULL outside an action. The journal triggers call it, so every connection
+    that writes tasks needs it.
+
+    Args:
+        conn (TracedConnection): The connection.
+    """
+
+    conn.journal_action = None
+    connection = weakref.ref(conn)  # The connection holds the function, so don't hold it back
+    conn.create_function("journal_action", 0, lambda: connection().journal_action)
+
+def _create_journal_triggers(conn, columns, notes=False):
+    """
+    (Re)create the triggers that journal every insert, update and delete of a task.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the database being migrated.
+        columns (tuple): The task columns recorded, as of the calling migration.
+        notes (bool): Whether notes live in task_notes (schema version 10 on). Their content is
+            then read from there, and adding, changing or removing a note is journaled as a
+            change of its task. Updating the task itself (a move, say) leaves its note alone,
+            so those entries don't record the note at all.
+    """
+
+    for trigger in ("task_journal_insert", "task_journal_update", "task_journal_delete",
+                    "task_notes_journal_insert", "task_notes_journal_update", "task_notes_journal_delete"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    new_content = _NOTE_TEXT.format(task_id="new.id") if notes else None
+    old_content = _NOTE_TEXT.format(task_id="old.id") if notes else None
+    update_columns = tuple(column for column in columns if column != "content") if notes else columns
+    conn.execute(f'''
+        CREATE TRIGGER task_journal_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO task_journal (action, task_id, new_row) VALUES ({_CURRENT_ACTION}, new.id, {_journal_row("new", columns, new_content)});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER task_journal_update AFTER UPDATE ON tasks BEGIN
+            INSERT INTO task_journal (action, task_id, old_row, new_row)
+            VALUES ({_CURRENT_ACTION}, new.id, {_journal_row("old", update_columns)}, {_journal_row("new", update_columns)});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER task_journal_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO task_journal (action, task_id, old_row) VALUES ({_CURRENT_ACTION}, old.id, {_journal_row("old", columns, old_content)});
+        END
+    ''')
+    if not notes:
+        return
+
+    # The task's other columns come from its row; a note without a task (mid-delete) isn't journaled
+    for event, old_note, new_note in (
+        ("INSERT", "''", "note_text(new.body)"),
+        ("UPDATE OF body", "note_text(old.body)", "note_text(new.body)"),
+        ("DELETE", "note_text(old.body)", "''"),
+    ):
+        task_id = "old.task_id" if event == "DELETE" else "new.task_id"
+        conn.execute(f'''
+            CREATE TRIGGER task_notes_journal_{event.split()[0].lower()} AFTER {event} ON task_notes BEGIN
+                INSERT INTO task_journal (action, task_id, old_row, new_row)
+                SELECT {_CURRENT_ACTION}, id, {_journal_row("tasks", columns, old_note)}, {_journal_row("tasks", columns, new_note)}
+                FROM tasks WHERE id = {task_id};
+            END
+        ''')
+
+def _migration_add_journal(conn):
+    """
+    Schema version 7: append-only change journal. Triggers record every insert, update and delete
+    of a task, with its state before and after, under the current action; undo and redo
+    replay those states. The existing tasks are recorded as one
+    snapshot action, so the journal alone can rebuild the table.
+    """
+
+    conn.execute('''
+        CREATE TABLE journal_actions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            label TEXT NOT NULL,
+            kind TEXT NOT NULL DEFAULT 'do',     -- do, undo, redo or snapshot
+            state TEXT NOT NULL DEFAULT 'done',  -- done, undone or compacted
+            done_at INTEGER,                     -- Action that last applied it: itself or a redo
+            undone_at INTEGER                    -- Action that last reverted it
+        )
+    ''')
+    conn.execute("CREATE INDEX idx_journal_actions_done ON journal_actions (state, done_at)")
+    conn.execute("CREATE INDEX idx_journal_actions_undone ON journal_actions (state, undone_at)")
+    conn.execute('''
+        CREATE TABLE task_journal (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            action INTEGER NOT NULL,
+            task_id INTEGER NOT NULL,
+            old_row TEXT,  -- JSON of the task before the change; NULL for an insert
+            new_row TEXT   -- JSON of the task after the change; NULL for a delete
+        )
+    ''')
+    conn.execute("CREATE INDEX idx_task_journal_task ON task_journal (task_id, seq)")
+    conn.execute("CREATE INDEX idx_task_journal_action ON task_journal (action)")
+
+    columns = ("title", "content", "day", "status", "due_day")  # JOURNAL_COLUMNS as of this version
+    _create_journal_triggers(conn, columns)
+
+    conn.execute("INSERT INTO journal_actions (label, kind) VALUES ('Snapshot', 'snapshot')")
+    conn.execute(
+        "INSERT INTO task_journal (action, task_id, new_row) "
+        f"SELECT (SELECT MAX(id) FROM journal_actions), id, {_journal_row('tasks', columns)} FROM tasks ORDER BY id"
+    )
+
+def _migration_add_course_index(conn):
+    """
+    Schema version 8: a virtual 'course' column (the part of the title before a colon, as in
+    'HIST 201: Essay 1') and an index on it, so per-course statistics are one ordered index scan
+    instead of a sort of every title.
+    """
+
+    conn.execute('''
+        ALTER TABLE tasks ADD COLUMN course TEXT GENERATED ALWAYS AS (
+            CASE WHEN instr(title, ':') > 1 THEN trim(substr(title, 1, instr(title, ':') - 1)) ELSE '' END
+        ) VIRTUAL
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_course ON tasks (course, status, due_day)")
+
+def _migration_add_task_colors(conn):
+    """
+    Schema version 9: an optional card color per task. The due day index now covers it too,
+    so the weekly query still never touches the table, and the journal records it for undo.
+    """
+
+    conn.execute("ALTER TABLE tasks ADD COLUMN color TEXT")
+    conn.execute("DROP INDEX IF EXISTS idx_tasks_due_day")
+    conn.execute("CREATE INDEX idx_tasks_due_day ON tasks (due_day, status, title, color)")
+    _create_journal_triggers(conn, ("title", "content", "day", "status", "due_day", "color"))
+
+def _migration_move_notes(conn):
+    """
+    Schema version 10: note bodies move out of the tasks table into task_notes, compressed above
+    a size threshold (see tasktrack.notes), so every scan of tasks reads only short rows and a
+    note is read only when its task is opened. Tasks without notes get no row.
+
+    The search index now reads its content through the task_documents view, and triggers on
+    both tables keep it and the journal in step. Deleting a task first deletes its note, in a
+    BEFORE trigger, so the AFTER triggers of the task never see a note that is about to go.
+    """
+
+    conn.execute("CREATE TABLE task_notes (task_id INTEGER PRIMARY KEY, body NOT NULL)")  # TEXT or compressed BLOB
+    conn.execute("INSERT INTO task_notes (task_id, body) SELECT id, note_body(content) FROM tasks WHERE content <> ''")
+
+    for trigger in ("tasks_fts_insert", "tasks_fts_delete", "tasks_fts_update"):
+        conn.execute(f"DROP TRIGGER {trigger}")
+    conn.execute("DROP TABLE tasks_fts")
+    for trigger in ("task_journal_insert", "task_journal_update", "task_journal_delete"):
+        conn.execute(f"DROP TRIGGER {trigger}")
+    conn.execute("ALTER TABLE tasks DROP COLUMN content")
+
+    conn.execute('''
+        CREATE VIEW task_documents AS
+        SELECT tasks.id, tasks.title, COALESCE(note_text(task_notes.body), '') AS content
+        FROM tasks LEFT JOIN task_notes ON task_notes.task_id = tasks.id
+    ''')
+    conn.execute('''
+        CREATE VIRTUAL TABLE tasks_fts USING fts5(
+            title, content,
+            content='task_documents', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    ''')
+    conn.execute("INSERT INTO tasks_fts (tasks_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+    conn.execute('''
+        CREATE TRIGGER tasks_delete_note BEFORE DELETE ON tasks BEGIN
+            DELETE FROM task_notes WHERE task_id = old.id;
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, title, content) VALUES (new.id, new.title, {_NOTE_TEXT.format(task_id="new.id")});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, content) VALUES ('delete', old.id, old.title, {_NOTE_TEXT.format(task_id="old.id")});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title ON tasks WHEN new.title IS NOT old.title BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, content) VALUES ('delete', old.id, old.title, {_NOTE_TEXT.format(task_id="old.id")});
+            INSERT INTO tasks_fts (rowid, title, content) VALUES (new.id, new.title, {_NOTE_TEXT.format(task_id="new.id")});
+        END
+    ''')
+    for event, old_note, new_note in (
+        ("INSERT", "''", "note_text(new.body)"),
+        ("UPDATE OF body", "note_text(old.body)", "note_text(new.body)"),
+        ("DELETE", "note_text(old.body)", "''"),
+    ):
+        task_id = "old.task_id" if event == "DELETE" else "new.task_id"
+        conn.execute(f'''
+            CREATE TRIGGER task_notes_fts_{event.split()[0].lower()} AFTER {event} ON task_notes BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, title, content) SELECT 'delete', id, title, {old_note} FROM tasks WHERE id = {task_id};
+                INSERT INTO tasks_fts (rowid, title, content) SELECT id, title, {new_note} FROM tasks WHERE id = {task_id};
+            END
+        ''')
+
+    _create_journal_triggers(conn, ("title", "content", "day", "status", "due_day", "color"), notes=True)
+
+def _migration_attribute_journal_to_actions(conn):
+    """
+    Schema version 11: the journal triggers used to credit every write to the newest action,
+    so a write made outside an action silently joined an unrelated earlier one (and its undo).
+    They now take the connection's current action (see register_journal_functions) and refuse
+    writes made outside one.
+    """
+
+    _create_journal_triggers(conn, ("title", "content", "day", "status", "due_day", "color"), notes=True)
+
+def _migration_journal_notes_only_when_changed(conn):
+    """
+    Schema version 12: every update of a task (a move, a completion) used to decompress its
+    note twice and journal two uncompressed copies of it. Updates now journal only the task's
+    own columns; the note is journaled when it changes, by the task_notes triggers.
+    """
+
+    _create_journal_triggers(conn, ("title", "content", "day", "status", "due_day", "color"), notes=True)
+
+# Ordered list of migrations; entry N upgrades the schema from version N to N + 1
+SCHEMA_MIGRATIONS = [
+    _migration_add_day_and_status,
+    _migration_add_task_indexes,
+    _migration_add_completed_index,
+    _migration_add_search_index,
+    _migration_add_due_dates,
+    _migration_drop_title_index,
+    _migration_add_journal,
+    _migration_add_course_index,
+    _migration_add_task_colors,
+    _migration_move_notes,
+    _migration_attribute_journal_to_actions,
+    _migration_journal_notes_only_when_changed,
+]
+
+def migrate_schema(conn):
+    """
+    Apply every migration newer than the database's PRAGMA user_version, each in its own transaction.
+
+    Args:
+        conn (sqlite3.Connection): Connection to migrate.
+    """
+
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target_version in range(version + 1, len(SCHEMA_MIGRATIONS) + 1):
+        conn.execute("BEGIN")
+        try:
+            SCHEMA_MIGRATIONS[target_version - 1](conn)
+            conn.execute(f"PRAGMA user_version = {target_version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+def connect_read_only(path=DEFAULT_DATABASE_PATH):
+    """
+    Open a read-only connection to an existing, already migrated database.
+
+    Args:
+        path (str): Location of the database file.
+
+    Returns:
+        sqlite3.Connection: Read-only connection object to the database.
+    """
+
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, factory=TracedConnection)
+    register_note_functions(conn)  # The search index reads notes through note_text
+    return conn
+
+def archive_path_for(path):
+    """
+    Location of the archive database that belongs to a task database ('tasks.db' -> 'tasks-archive.db').
+
+    Args:
+        path (str): Location of the task database file.
+
+    Returns:
+        str: Location of its archive database file.
+    """
+
+    root, extension = os.path.splitext(path)
+    return f"{root}-archive{extension or '.db'}"
+
+def attach_archive(conn, path):
+    """
+    Attach an archive database as schema 'archive', creating its table if needed. Archived tasks
+    keep their task ID, columns and note (in its task_notes form), plus when they were archived.
+
+    Task IDs are reused once the newest task is gone, so one ID can be archived more than once;
+    every archived row gets its own archive_id instead. An archive written before that is
+    converted in place.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the task database; it must not be in a transaction.
+        path (str): Location of the archive database file.
+    """
+
+    conn.execute("ATTACH DATABASE ? AS archive", (path,))
+    columns = {row[1] for row in conn.execute("PRAGMA archive.table_info(archived_tasks)")}
+    if columns and "archive_id" not in columns:
+        conn.execute("ALTER TABLE archive.archived_tasks RENAME TO archived_tasks_by_id")
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS archive.archived_tasks (
+            archive_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            day TEXT NOT NULL,
+            status TEXT NOT NULL,
+            due_day INTEGER,
+            color TEXT,
+            note,                          -- task_notes.body, or NULL
+            archived_at INTEGER NOT NULL   -- Unix time
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS archive.idx_archived_tasks_task ON archived_tasks (task_id)")
+    if columns and "archive_id" not in columns:
+        conn.execute('''
+            INSERT INTO archive.archived_tasks (task_id, title, day, status, due_day, color, note, archived_at)
+            SELECT id, title, day, status, due_day, color, note, archived_at FROM archive.archived_tasks_by_id ORDER BY archived_at, id
+        ''')
+        conn.execute("DROP TABLE archive.archived_tasks_by_id")
+    conn.commit()
+
+class TaskStore:
+    """
+    Write-behind unit of work around the database connection.
+
+    Mutations run immediately on the connection, so later reads (and cursor.lastrowid) see them,
+    but the COMMIT (and its fsync) is deferred until enough writes are pending, the oldest pending
+    write is older than the flush interval, or the store is flushed explicitly or on shutdown.
+    Use 'with tasks.batch():' to group a bulk operation into a single transaction.
+
+    Like its connection, a store belongs to one thread. In the UI that is the database writer
+    thread, which also flushes it whenever it goes idle (see DatabaseExecutor).
+    """
+
+    def __init__(self, connection=None, max_pending=50, flush_interval_ms=500, on_commit=None):
+        """
+        Args:
+            connection (sqlite3.Connection): Connection the mutations are run on.
+            max_pending (int): Number of uncommitted writes that triggers a flush.
+            flush_interval_ms (int): Longest time a write may stay uncommitted.
+            on_commit (callable): Called with no arguments after each commit.
+        """
+
+        self.connection = connection
+        self.max_pending = max_pending
+        self.flush_interval_ms = flush_interval_ms
+        self.on_commit = on_commit
+        self.pending = 0  # Writes run since the last commit
+        self._first_pending_at = None
+        self._batch_depth = 0
+
+    def execute(self, sql, parameters=()):
+        """
+        Run a mutation as part of the current unit of work.
+
+        Returns:
+            sqlite3.Cursor: The cursor the statement ran on.
+        """
+
+        cursor = self.connection.execute(sql, parameters)
+        self._record_writes(1)
+        return cursor
+
+    def executemany(self, sql, parameter_rows):
+        """
+        Run a mutation once per parameter row as part of the current unit of work.
+
+        Returns:
+            sqlite3.Cursor: The cursor the statements ran on.
+        """
+
+        cursor = self.connection.executemany(sql, parameter_rows)
+        self._record_writes(max(cursor.rowcount, 1))
+        return cursor
+
+    def _record_writes(self, count):
+        if self._first_pending_at is None:
+            self._first_pending_at = time.monotonic()
+        self.pending += count
+        self._flush_if_due()
+
+    def _flush_if_due(self):
+        if self._batch_depth or self._first_pending_at is None:
+            return  # The batch (or savepoint) decides when it ends
+        pending_ms = (time.monotonic() - self._first_pending_at) * 1000
+        if self.pending >= self.max_pending or pending_ms >= self.flush_interval_ms:
+            self.flush()
+
+    def flush(self):
+        """
+        Commit every pending write in one transaction.
+        """
+
+        if self.connection.in_transaction:
+            self.connection.commit()
+            if self.on_commit is not None:
+                self.on_commit()
+        self.pending = 0
+        self._first_pending_at = None
+
+    @contextmanager
+    def batch(self):
+        """
+        Group every write made inside the block into one transaction. Batches can be nested;
+        the outermost one commits on success and rolls the whole batch back on an exception.
+        """
+
+        if not self._batch_depth:
+            self.flush()  # Keep earlier writes out of a possible rollback
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.connection.rollback()
+                self.pending = 0
+                self._first_pending_at = None
+            raise
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self.flush()
+
+    @contextmanager
+    def savepoint(self, name):
+        """
+        Make the writes of the block all-or-nothing without committing them: an exception rolls
+        back to a SAVEPOINT taken on entry, and on success the writes stay pending like any
+        others. Nothing is flushed while the block runs. Savepoints and batches can be nested.
+
+        Args:
+            name (str): The savepoint's SQL name.
+        """
+
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN")  # Otherwise releasing the savepoint would commit
+        self.connection.execute(f"SAVEPOINT {name}")
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self.connection.in_transaction:  # Some errors roll back the whole transaction
+                self.connection.execute(f"ROLLBACK TO {name}")
+                self.connection.execute(f"RELEASE {name}")
+            raise
+        self._batch_depth -= 1
+        self.connection.execute(f"RELEASE {name}")
+        self._flush_if_due()
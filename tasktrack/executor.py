@@ -0,0 +1,144 @@
+"""
+DatabaseExecutor: runs TaskRepository work off the calling (UI) thread and returns futures.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import queue
+import threading
+
+from .cache import TaskCache
+from .db import DEFAULT_DATABASE_PATH
+from .repository import TaskRepository
+
+class DatabaseExecutor:
+    """
+    Runs repository operations on background threads and returns concurrent.futures.Future objects.
+
+    A single writer thread owns the read/write TaskRepository and runs jobs in submission order.
+    A small pool of threads with read-only repositories serves queries; while writes are still
+    uncommitted, queries go to the writer instead so they see those writes.
+
+    Jobs are called as function(repository, *args), so unbound TaskRepository methods work
+    directly: executor.submit(TaskRepository.save_task, "Essay", "", "Monday").
+    No threads are started until the first job is submitted.
+    """
+
+    def __init__(self, path=DEFAULT_DATABASE_PATH, read_workers=2, cache_size=256):
+        """
+        Args:
+            path (str): Location of the database file.
+            read_workers (int): Number of read-only connections in the query pool.
+            cache_size (int): Number of task records kept in the cache all repositories share.
+        """
+
+        self.path = path
+        self.read_workers = read_workers
+        self.cache = TaskCache(cache_size)
+        self._jobs = queue.Queue()
+        self._uncommitted_writes = 0  # Writes submitted but not committed yet
+        self._lock = threading.Lock()
+        self._writer = None
+        self._writer_error = None  # Why the writer couldn't open the database
+        self._readers = None
+        self._reader_local = threading.local()
+
+    def _start(self):
+        with self._lock:
+            if self._writer is not None:
+                return
+            ready = threading.Event()
+            self._writer = threading.Thread(
+                target=self._run_writer, args=(ready,), name="tasktrack-db-writer", daemon=True
+            )
+            self._writer.start()
+            ready.wait()  # The writer creates and migrates the schema before readers connect
+            if self._writer_error is not None:
+                error, self._writer_error, self._writer = self._writer_error, None, None
+                raise error
+            self._readers = ThreadPoolExecutor(max_workers=self.read_workers, thread_name_prefix="tasktrack-db-reader")
+
+    def _run_writer(self, ready):
+        repository = TaskRepository(self.path, cache=self.cache)
+        try:
+            store = repository.store  # Opens (and creates or migrates) the database
+        except BaseException as error:
+            self._writer_error = error  # _start() raises it in the submitting thread
+            return
+        finally:
+            ready.set()
+        writes_since_flush = 0
+
+        while True:
+            # Sleep until the next job, or until pending writes are due to be committed
+            timeout = store.flush_interval_ms / 1000 if store.pending else None
+            try:
+                job = self._jobs.get(timeout=timeout)
+            except queue.Empty:
+                job = ()
+            if job is None:
+                break
+            if job:
+                function, args, future, is_write = job
+                writes_since_flush += is_write
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(function(repository, *args))
+                    except BaseException as error:
+                        future.set_exception(error)
+            if self._jobs.empty():
+                store.flush()  # Idle: commit everything in one transaction
+                with self._lock:
+                    self._uncommitted_writes -= writes_since_flush
+                writes_since_flush = 0
+
+        repository.close()
+
+    def _run_reader(self, function, args):
+        repository = getattr(self._reader_local, "repository", None)
+        if repository is None:
+            repository = self._reader_local.repository = TaskRepository(self.path, read_only=True, cache=self.cache)
+        return function(repository, *args)
+
+    def submit(self, function, *args):
+        """
+        Run a repository operation on the writer thread, after every job submitted before it.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the operation's return value.
+
+        Raises:
+            Exception: The writer thread could not open or migrate the database.
+        """
+
+        self._start()
+        future = Future()
+        with self._lock:
+            self._uncommitted_writes += 1
+        self._jobs.put((function, args, future, True))
+        return future
+
+    def submit_read(self, function, *args):
+        """
+        Run a read-only repository operation on the query pool.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the operation's return value.
+        """
+
+        self._start()
+        if self._uncommitted_writes:
+            future = Future()
+            self._jobs.put((function, args, future, False))  # Read our own uncommitted writes
+            return future
+        return self._readers.submit(self._run_reader, function, args)
+
+    def shutdown(self):
+        """
+        Finish every queued job, commit pending writes and stop the threads.
+        """
+
+        if self._writer is not None and self._writer.is_alive():
+            self._jobs.put(None)
+            self._writer.join()
+        if self._readers is not None:
+            self._readers.shutdown()
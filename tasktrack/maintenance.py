@@ -0,0 +1,188 @@
+"""
+MaintenancePass: one round of database upkeep, split into steps short enough to run on the
+database writer thread between the board's own writes. It archives completed tasks older than
+a configurable age, compacts the search index, releases the freed pages to the file system,
+refreshes the query planner's statistics and checks the database's integrity, and reports the
+space and query time saved.
+"""
+
+import logging
+import time
+
+from .dates import from_epoch_day, today_epoch_day, week_start
+from .repository import ARCHIVE_BATCH_SIZE
+
+logger = logging.getLogger("tasktrack.maintenance")
+
+# Completed tasks due more than this many days ago are moved to the archive database
+ARCHIVE_AFTER_DAYS = 90
+
+# Search index pages merged, and free pages released, per step (4 MiB with the default 4 KiB pages)
+MERGE_PAGES_PER_STEP = 500
+VACUUM_PAGES_PER_STEP = 1024
+
+# The steps of a pass, in order; 'check' only reads and may run on a read-only repository
+MAINTENANCE_PHASES = ["measure", "archive", "merge", "vacuum", "analyze", "remeasure", "check"]
+
+def time_active_queries(repository, today, repeat=3):
+    """
+    Time the queries that have to skip past completed tasks to find the active ones.
+
+    Args:
+        repository (TaskRepository): The repository to query.
+        today (int): Today's epoch day.
+        repeat (int): Runs of each query; the fastest counts.
+
+    Returns:
+        float: Milliseconds the queries take together.
+    """
+
+    probes = [
+        lambda: repository.load_tasks_for_day("Monday"),
+        lambda: repository.load_tasks_for_week(week_start(today)),
+        lambda: repository.load_upcoming_reminders(today),
+    ]
+    total = 0.0
+    for probe in probes:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            probe()
+            timings.append(time.perf_counter() - started)
+        total += min(timings)
+    return total * 1000
+
+class MaintenancePass:
+    """
+    The state of one maintenance pass. Call step() until it returns False, passing a writable
+    repository, or a read-only one while 'read_only' is True. Every step is bounded (one batch
+    of archived tasks, MERGE_PAGES_PER_STEP of search index merging, VACUUM_PAGES_PER_STEP
+    released pages, a sampled ANALYZE), so a caller on a shared writer thread can interleave
+    other work or pause between steps. The integrity check is the exception: it reads the
+    whole database, which is why it may run on a read-only connection.
+    """
+
+    def __init__(self, archive_after_days=ARCHIVE_AFTER_DAYS, today=None, archive_path=None):
+        """
+        Args:
+            archive_after_days (int): Completed tasks due more than this many days ago are archived.
+            today (int): Today's epoch day (default is today).
+            archive_path (str): The archive database (default is next to the task database).
+        """
+
+        if today is None:
+            today = today_epoch_day()
+        self.today = today
+        self.due_before = today - archive_after_days
+        self.archive_path = archive_path
+        self.phase = MAINTENANCE_PHASES[0]
+        self.report = {"archived": 0, "due_before": self.due_before, "pages_released": 0, "integrity": None}
+        self._started = time.perf_counter()
+
+    @property
+    def done(self):
+        """
+        bool: Whether every step has run.
+        """
+
+        return self.phase is None
+
+    @property
+    def read_only(self):
+        """
+        bool: Whether the next step only reads.
+        """
+
+        return self.phase == "check"
+
+    def step(self, repository):
+        """
+        Run the next step of the pass.
+
+        Args:
+            repository (TaskRepository): The repository of the database being maintained.
+
+        Returns:
+            bool: Whether steps remain.
+        """
+
+        report = self.report
+        if self.phase == "measure":
+            stats = repository.storage_stats()
+            report["bytes_before"] = stats["bytes"]
+            report["incremental_vacuum"] = stats["incremental_vacuum"]
+            report["query_ms_before"] = time_active_queries(repository, self.today)
+            self._advance()
+        elif self.phase == "archive":
+            archived = repository.archive_completed_tasks(self.due_before, ARCHIVE_BATCH_SIZE, self.archive_path)
+            report["archived"] += archived
+            if archived < ARCHIVE_BATCH_SIZE:
+                self._advance()
+        elif self.phase == "merge":
+            if not repository.merge_search_index(MERGE_PAGES_PER_STEP):
+                self._advance()
+        elif self.phase == "vacuum":
+            released = repository.incremental_vacuum(VACUUM_PAGES_PER_STEP) if report["incremental_vacuum"] else 0
+            report["pages_released"] += released
+            if released < VACUUM_PAGES_PER_STEP:
+                self._advance()
+        elif self.phase == "analyze":
+            repository.analyze()
+            self._advance()
+        elif self.phase == "remeasure":
+            report["bytes_after"] = repository.storage_stats()["bytes"]
+            report["query_ms_after"] = time_active_queries(repository, self.today)
+            self._advance()
+        elif self.phase == "check":
+            report["integrity"] = repository.check_integrity()
+            report["seconds"] = time.perf_counter() - self._started
+            self._advance()
+            logger.info(format_report(report))
+        return not self.done
+
+    def _advance(self):
+        index = MAINTENANCE_PHASES.index(self.phase) + 1
+        self.phase = MAINTENANCE_PHASES[index] if index < len(MAINTENANCE_PHASES) else None
+
+def run_maintenance(repository, archive_after_days=ARCHIVE_AFTER_DAYS, archive_path=None):
+    """
+    Run a whole maintenance pass on one repository.
+
+    Args:
+        repository (TaskRepository): The repository of the database to maintain.
+        archive_after_days (int): Completed tasks due more than this many days ago are archived.
+        archive_path (str): The archive database (default is next to the task database).
+
+    Returns:
+        dict: The pass's report: tasks 'archived' (those due before epoch day 'due_before'),
+            database file size in 'bytes_before' and 'bytes_after', 'pages_released' to the file
+            system, 'query_ms_before' and 'query_ms_after' of the active-task queries,
+            'integrity' problems (empty if none) and elapsed 'seconds'.
+    """
+
+    maintenance = MaintenancePass(archive_after_days, archive_path=archive_path)
+    while maintenance.step(repository):
+        pass
+    return maintenance.report
+
+def format_report(report):
+    """
+    Describe a maintenance report in one line.
+
+    Args:
+        report (dict): See run_maintenance.
+
+    Returns:
+        str: What the pass did and saved.
+    """
+
+    mib = 2 ** 20
+    parts = [
+        f"archived {report['archived']} completed tasks due before {from_epoch_day(report['due_before']).isoformat()}",
+        f"database {report['bytes_before'] / mib:.1f} MiB -> {report['bytes_after'] / mib:.1f} MiB "
+        f"({report['pages_released']} free pages released"
+        + ("" if report["incremental_vacuum"] else "; run 'python -m tasktrack migrate' to enable releasing them") + ")",
+        f"active-task queries {report['query_ms_before']:.1f} ms -> {report['query_ms_after']:.1f} ms",
+        "integrity ok" if not report["integrity"] else f"{len(report['integrity'])} integrity problems: {report['integrity'][0]}",
+    ]
+    return f"Maintenance in {report['seconds']:.1f}s: " + "; ".join(parts)
@@ -0,0 +1,38 @@
+"""
+Task: the compact record the weekly board keeps for every task it shows.
+"""
+
+class Task:
+    """
+    One task on the board. With __slots__ there is no per-instance __dict__, so a record costs
+    a fixed handful of machine words instead of a dictionary (see benchmarks/measure_task_memory.py).
+    """
+
+    __slots__ = ("id", "title", "day", "status", "color")
+
+    def __init__(self, task_id, title, day, status="not-completed", color=None):
+        """
+        Args:
+            task_id (int): The ID of the task.
+            title (str): The title of the task.
+            day (str): The day of the week the task is shown on.
+            status (str): 'not-completed' or 'completed'.
+            color (str): The card's fill color, or None for the default.
+        """
+
+        self.id = task_id
+        self.title = title
+        self.day = day
+        self.status = status
+        self.color = color
+
+    def __repr__(self):
+        return f"Task({self.id!r}, {self.title!r}, {self.day!r}, {self.status!r}, {self.color!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return ((self.id, self.title, self.day, self.status, self.color)
+                == (other.id, other.title, other.day, other.status, other.color))
+
+    __hash__ = None  # Mutable
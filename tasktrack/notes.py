@@ -0,0 +1,79 @@
+"""
+Storage format of task notes: the note bodies live in their own table (see tasktrack.db), as
+plain text when short and compressed above NOTE_COMPRESSION_THRESHOLD bytes.
+
+Compressed bodies are stored as BLOBs and plain ones as TEXT, so decoding never has to guess.
+zstd is used when the optional 'zstandard' package is installed, zlib otherwise; both decode
+anywhere the codec is available, so databases move freely between machines that have it.
+"""
+
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # Optional: zlib is always available
+    zstandard = None
+
+# Notes up to this many UTF-8 bytes are stored as plain text; compressing them saves next to nothing
+NOTE_COMPRESSION_THRESHOLD = 512
+
+# Compression levels: notes are written one at a time, so favour ratio over speed
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 9
+
+# Every zstd frame starts with these bytes; zlib streams never do
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+def encode_note(text):
+    """
+    Turn note text into the value stored in task_notes.body.
+
+    Args:
+        text (str): The note.
+
+    Returns:
+        str or bytes: The text itself if it is short or doesn't compress, its compressed UTF-8
+            otherwise. Equal notes always encode to equal values.
+    """
+
+    data = text.encode("utf-8")
+    if len(data) <= NOTE_COMPRESSION_THRESHOLD:
+        return text
+    if zstandard is not None:
+        compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    else:
+        compressed = zlib.compress(data, ZLIB_LEVEL)
+    return compressed if len(compressed) < len(data) else text
+
+def decode_note(body):
+    """
+    Turn a stored task_notes.body back into note text.
+
+    Args:
+        body (str or bytes): The stored value (None is treated as an empty note).
+
+    Returns:
+        str: The note.
+    """
+
+    if body is None:
+        return ""
+    if isinstance(body, str):
+        return body
+    if body[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError("this note is zstd-compressed; install the 'zstandard' package to read it")
+        return zstandard.ZstdDecompressor().decompress(body).decode("utf-8")
+    return zlib.decompress(body).decode("utf-8")
+
+def register_note_functions(conn):
+    """
+    Make note_body(text) and note_text(body) available to SQL on a connection. The search
+    index and journal triggers call note_text, so every connection that writes tasks needs them.
+
+    Args:
+        conn (sqlite3.Connection): The connection.
+    """
+
+    conn.create_function("note_body", 1, lambda text: encode_note(text) if text else None, deterministic=True)
+    conn.create_function("note_text", 1, decode_note, deterministic=True)
@@ -0,0 +1,259 @@
+"""
+Profiler: timing spans around database calls and UI handlers, slow-query logging (optionally
+with EXPLAIN QUERY PLAN), latency percentiles and Chrome-trace export.
+"""
+
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+
+# Database spans at least this long are logged as slow
+SLOW_QUERY_MS = 50
+
+# Durations kept per operation for the percentiles, and spans kept for the trace export
+SPAN_HISTORY = 1000
+TRACE_HISTORY = 50000
+
+logger = logging.getLogger("tasktrack.profiling")
+
+def _percentile(ordered, fraction):
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]  # Nearest rank
+
+class Profiler:
+    """
+    Collects timing spans from any thread.
+
+    Every span's duration is kept per operation name (for the p50/p99 statistics) and as a
+    complete event (for export_chrome_trace); both histories are bounded, so a profiler can stay
+    enabled for the whole session. Slow database spans are logged on one line; with
+    'explain_slow_queries', the statements run on a TracedConnection inside a 'db' span are
+    remembered until the span ends, and a slow span is logged with their query plans.
+    """
+
+    def __init__(self, enabled=True, slow_query_ms=SLOW_QUERY_MS, history=SPAN_HISTORY, trace_history=TRACE_HISTORY,
+                 explain_slow_queries=False):
+        """
+        Args:
+            enabled (bool): Whether spans are recorded at all.
+            slow_query_ms (float): Duration from which a database span is logged as slow.
+            history (int): Durations kept per operation.
+            trace_history (int): Spans kept for the Chrome trace.
+            explain_slow_queries (bool): Log slow database spans with the EXPLAIN QUERY PLAN of
+                each statement (re-running the planner for every one of them).
+        """
+
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.explain_slow_queries = explain_slow_queries
+        self.history = history
+        self._durations = defaultdict(lambda: deque(maxlen=self.history))  # Name -> seconds
+        self._counts = defaultdict(int)
+        self._categories = {}
+        self._events = deque(maxlen=trace_history)  # (name, category, start, seconds, thread ID)
+        self._thread_names = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def record(self, name, seconds, category="app", started=None):
+        """
+        Record a finished operation.
+
+        Args:
+            name (str): Operation name.
+            seconds (float): How long it took.
+            category (str): Group shown in the trace, e.g. 'db' or 'ui'.
+            started (float): Its time.perf_counter() start (default is 'seconds' ago).
+        """
+
+        if not self.enabled:
+            return
+        if started is None:
+            started = time.perf_counter() - seconds
+        thread = threading.current_thread()
+        with self._lock:
+            self._durations[name].append(seconds)
+            self._counts[name] += 1
+            self._categories[name] = category
+            self._events.append((name, category, started, seconds, thread.ident))
+            self._thread_names[thread.ident] = thread.name
+
+    @contextmanager
+    def span(self, name, category="app"):
+        """
+        Time the block as one operation. Spans in the 'db' category are logged when they are
+        slow (see explain_slow_queries).
+        """
+
+        if not self.enabled:
+            yield
+            return
+
+        statements = None
+        if category == "db":
+            stack = self._statement_stack()
+            statements = []
+            stack.append(statements)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            self.record(name, seconds, category, started)
+            if statements is not None:
+                stack.pop()
+                if stack:
+                    stack[-1].extend(statements)  # An enclosing span ran these too
+                elif seconds * 1000 >= self.slow_query_ms:
+                    self._log_slow_query(name, seconds, statements)
+
+    def _statement_stack(self):
+        stack = getattr(self._local, "statements", None)
+        if stack is None:
+            stack = self._local.statements = []
+        return stack
+
+    def note_statement(self, connection, sql, parameters):
+        """
+        Remember a statement run inside the current thread's database span (if any).
+        """
+
+        if not self.explain_slow_queries:
+            return
+        stack = getattr(self._local, "statements", None)
+        if stack:
+            stack[-1].append((connection, sql, parameters))
+
+    def _log_slow_query(self, name, seconds, statements):
+        if not self.explain_slow_queries:
+            logger.info("Slow database call %s took %.1f ms", name, seconds * 1000)
+            return
+        lines = [f"Slow database call {name} took {seconds * 1000:.1f} ms"]
+        for connection, sql, parameters in statements:
+            lines.append(f"  {' '.join(sql.split())}")
+            if parameters is None:
+                continue  # executemany: no single set of parameters to plan with
+            try:
+                plan = sqlite3.Connection.execute(connection, f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+            except sqlite3.Error as error:
+                lines.append(f"    (no query plan: {error})")
+                continue
+            lines.extend(f"    {detail}" for _, _, _, detail in plan)
+        logger.warning("\n".join(lines))
+
+    def statistics(self):
+        """
+        Summarize the recorded operations.
+
+        Returns:
+            dict: Operation name -> {'category', 'count', 'p50_ms', 'p99_ms', 'max_ms'}; the
+                percentiles cover the most recent durations only.
+        """
+
+        with self._lock:
+            snapshot = {name: (sorted(durations), self._counts[name]) for name, durations in self._durations.items()}
+            categories = dict(self._categories)
+        return {
+            name: {
+                "category": categories[name],
+                "count": count,
+                "p50_ms": _percentile(ordered, 0.50) * 1000,
+                "p99_ms": _percentile(ordered, 0.99) * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+            for name, (ordered, count) in snapshot.items() if ordered
+        }
+
+    def export_chrome_trace(self, path):
+        """
+        Write the recorded spans as a Chrome trace (open it in chrome://tracing or Perfetto).
+
+        Args:
+            path (str): Destination JSON file.
+
+        Returns:
+            int: Number of spans written.
+        """
+
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+
+        process_id = os.getpid()
+        trace_events = [
+            {"name": "thread_name", "ph": "M", "pid": process_id, "tid": thread_id, "args": {"name": thread_name}}
+            for thread_id, thread_name in thread_names.items()
+        ]
+        for name, category, started, seconds, thread_id in events:
+            trace_events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",  # Complete event: start and duration
+                "ts": (started - self._origin) * 1e6,
+                "dur": seconds * 1e6,
+                "pid": process_id,
+                "tid": thread_id,
+            })
+
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, trace_file)
+        return len(events)
+
+    def reset(self):
+        """
+        Forget every recorded span.
+        """
+
+        with self._lock:
+            self._durations.clear()
+            self._counts.clear()
+            self._events.clear()
+
+# The profiler the repository and the UI report to; set TASKTRACK_PROFILE=0 to turn it off, or
+# TASKTRACK_PROFILE=explain to log slow database calls with their query plans
+_PROFILE_SETTING = os.environ.get("TASKTRACK_PROFILE", "1").lower()
+profiler = Profiler(enabled=_PROFILE_SETTING != "0", explain_slow_queries=_PROFILE_SETTING == "explain")
+
+def traced(name=None, category="app"):
+    """
+    Decorator that runs every call of a function in a span of the shared profiler.
+
+    Args:
+        name (str): Operation name (default is the function's qualified name).
+        category (str): Span category; 'db' spans log their slow statements.
+    """
+
+    def decorate(function):
+        span_name = name or function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return function(*args, **kwargs)
+            with profiler.span(span_name, category):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+class TracedConnection(sqlite3.Connection):
+    """
+    sqlite3 connection that tells the shared profiler which statements each database span runs.
+    Pass it as sqlite3.connect(..., factory=TracedConnection).
+    """
+
+    def execute(self, sql, parameters=()):
+        profiler.note_statement(self, sql, parameters)
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, parameter_rows):
+        profiler.note_statement(self, sql, None)
+        return super().executemany(sql, parameter_rows)
@@ -0,0 +1,180 @@
+"""
+ReminderScheduler: the pending reminders of not-completed tasks, kept in a heap ordered by
+fire time so the board needs a single Tk timer (for the earliest one) instead of polling the
+database. Tasks due before today (or before today plus the lead days) get no reminder.
+"""
+
+from datetime import datetime
+import heapq
+import time
+
+from .dates import from_epoch_day, today_epoch_day
+
+# Reminders fire at this hour (local time), this many days before the task is due
+REMINDER_HOUR = 9
+REMINDER_LEAD_DAYS = 0
+
+# Stale heap entries (left behind by cancelled or rescheduled reminders) tolerated before a rebuild
+STALE_ENTRY_SLACK = 1024
+
+class ReminderScheduler:
+    """
+    A min-heap of (fire time, task ID) entries plus a task ID -> (fire time, title) map.
+
+    Scheduling is a heap push and cancelling only drops the map entry: the heap entry goes
+    stale and is skipped when it reaches the top, and the heap is rebuilt once stale entries
+    outnumber live ones. Each entry is one small tuple, so 100k pending reminders cost a few
+    megabytes and waiting for the next one costs nothing but one timer.
+    """
+
+    def __init__(self, lead_days=REMINDER_LEAD_DAYS, hour=REMINDER_HOUR):
+        """
+        Args:
+            lead_days (int): Days before the due day that a task's reminder fires.
+            hour (int): Local hour of the day it fires at.
+        """
+
+        self.lead_days = lead_days
+        self.hour = hour
+        self._heap = []  # (fire time, task ID), including stale entries
+        self._pending = {}  # Task ID -> (fire time, title)
+        self._fire_times = {}  # Due epoch day -> fire time, since many tasks share a day
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __contains__(self, task_id):
+        return task_id in self._pending
+
+    def first_due_day(self):
+        """
+        Returns:
+            int: The earliest epoch day a task can be due on and still get a reminder: today,
+                plus the lead days. Reminders of earlier tasks would be overdue the moment they
+                were scheduled.
+        """
+
+        return today_epoch_day() + self.lead_days
+
+    def fire_time(self, due_day):
+        """
+        Args:
+            due_day (int): Epoch day the task is due.
+
+        Returns:
+            float: When its reminder fires, as a time.time() timestamp.
+        """
+
+        fire_time = self._fire_times.get(due_day)
+        if fire_time is None:
+            reminder_day = from_epoch_day(due_day - self.lead_days)
+            fire_time = datetime(reminder_day.year, reminder_day.month, reminder_day.day, self.hour).timestamp()
+            self._fire_times[due_day] = fire_time
+        return fire_time
+
+    def load(self, rows):
+        """
+        Replace every pending reminder. Rows due before first_due_day() are skipped.
+
+        Args:
+            rows (iterable): (task ID, title, due epoch day) rows, e.g. from
+                TaskRepository.load_upcoming_reminders.
+        """
+
+        first_due_day = self.first_due_day()
+        self._pending = {
+            task_id: (self.fire_time(due_day), title) for task_id, title, due_day in rows if due_day >= first_due_day
+        }
+        self._heap = [(fire_time, task_id) for task_id, (fire_time, _) in self._pending.items()]
+        heapq.heapify(self._heap)
+
+    def schedule(self, task_id, title, due_day):
+        """
+        Add or move a task's reminder; a task due before first_due_day() loses its reminder instead.
+
+        Args:
+            task_id (int): The ID of the task.
+            title (str): The title to show when it fires.
+            due_day (int): Epoch day the task is due.
+        """
+
+        if due_day < self.first_due_day():
+            self.cancel(task_id)
+            return
+        fire_time = self.fire_time(due_day)
+        current = self._pending.get(task_id)
+        self._pending[task_id] = (fire_time, title)
+        if current is None or current[0] != fire_time:
+            heapq.heappush(self._heap, (fire_time, task_id))
+            self._compact()
+
+    def cancel(self, task_id):
+        """
+        Drop a task's reminder, if it has one.
+
+        Args:
+            task_id (int): The ID of the task.
+        """
+
+        if self._pending.pop(task_id, None) is not None:
+            self._compact()
+
+    def refresh(self, task_ids, rows):
+        """
+        Bring the reminders of some tasks in line with the database.
+
+        Args:
+            task_ids (iterable): The tasks that changed.
+            rows (list): Their current (task ID, title, due epoch day) rows, e.g. from
+                TaskRepository.load_reminders; tasks without a row, or due before
+                first_due_day(), lose their reminder.
+        """
+
+        for task_id in task_ids:
+            self.cancel(task_id)
+        for task_id, title, due_day in rows:
+            self.schedule(task_id, title, due_day)
+
+    def next_fire_time(self):
+        """
+        Returns:
+            float: When the earliest pending reminder fires (a time.time() timestamp), or None.
+        """
+
+        self._drop_stale_top()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now=None):
+        """
+        Remove and return the reminders whose time has come.
+
+        Args:
+            now (float): The current time.time() (default is now).
+
+        Returns:
+            list: (task ID, title) pairs, earliest first.
+        """
+
+        if now is None:
+            now = time.time()
+        due = []
+        self._drop_stale_top()
+        while self._heap and self._heap[0][0] <= now:
+            fire_time, task_id = heapq.heappop(self._heap)
+            due.append((task_id, self._pending.pop(task_id)[1]))
+            self._drop_stale_top()
+        return due
+
+    def _drop_stale_top(self):
+        heap = self._heap
+        while heap:
+            fire_time, task_id = heap[0]
+            current = self._pending.get(task_id)
+            if current is not None and current[0] == fire_time:
+                return
+            heapq.heappop(heap)
+
+    def _compact(self):
+        if len(self._heap) > 2 * len(self._pending) + STALE_ENTRY_SLACK:
+            self._heap = [(fire_time, task_id) for task_id, (fire_time, _) in self._pending.items()]
+            heapq.heapify(self._heap)
@@ -0,0 +1,967 @@
+"""
+TaskRepository: the task service layer shared by the Tk UI, the command line and scripts.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+import json
+import re
+import time
+
+from .cache import TaskCache
+from .dates import day_in_week, today_epoch_day, week_start, weekday_name
+from .db import (DAYS_OF_WEEK, DEFAULT_DATABASE_PATH, JOURNAL_COLUMNS, TaskStore, archive_path_for, attach_archive,
+                 connect_read_only, initialize_database)
+from .notes import decode_note, encode_note
+from .profiling import traced
+
+# Number of completed tasks fetched per page by load_completed_tasks
+COMPLETED_PAGE_SIZE = 100
+
+# Number of search results search_tasks returns by default, and the search window draws at a time
+SEARCH_PAGE_SIZE = 25
+
+# Characters search_tasks puts around matched words in titles and snippets
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
+# Number of journal changes fetched per page by load_changes_since
+CHANGES_PAGE_SIZE = 1000
+
+# Actions kept whole in the journal (the undo depth); older ones are compacted every
+# JOURNAL_COMPACT_EVERY actions into one snapshot entry per task
+UNDO_DEPTH = 100
+JOURNAL_COMPACT_EVERY = 1000
+
+# Number of tasks archive_completed_tasks moves per transaction, so other writes are never held up for long
+ARCHIVE_BATCH_SIZE = 500
+
+# Rows ANALYZE samples per index (PRAGMA analysis_limit): plenty for the planner, and it bounds the run time
+ANALYSIS_LIMIT = 1000
+
+# Journaled columns stored in the tasks table; the content (note) is in task_notes
+_TASK_COLUMNS = tuple(column for column in JOURNAL_COLUMNS if column != "content")
+
+# Keep an explicit due date, or move the task to :weekday within the week it is already due
+_DUE_DAY_UPDATE = "COALESCE(:due_day, due_day - ((due_day + 4) % 7) + :weekday)"
+
+def _journaled(label):
+    """
+    Decorator that runs a mutation method as one undoable action named 'label'.
+    """
+
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.action(label):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+def _change(seq, task_id, new_row, note=None):
+    """
+    Turn a journal entry into a change: {'seq', 'id', 'deleted'} plus the task's columns.
+    Entries that left the note alone don't record it; 'note' is then its stored body.
+    """
+
+    change = {"seq": seq, "id": task_id, "deleted": new_row is None}
+    if new_row is None:
+        change.update(dict.fromkeys(JOURNAL_COLUMNS))
+    else:
+        change.update(json.loads(new_row))
+        if "content" not in change:
+            change["content"] = decode_note(note)
+    return change
+
+def build_search_query(text):
+    """
+    Turn free text typed by the user into an FTS5 query: every word must match, as a prefix.
+    Words are quoted, so FTS5 operators and punctuation in the text are searched for literally.
+
+    Args:
+        text (str): What the user typed.
+
+    Returns:
+        str: The MATCH expression, or an empty string if the text has no words.
+    """
+
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", text))
+
+class TaskRepository:
+    """
+    Create, update, move, complete, delete and query tasks in one database.
+
+    Nothing is opened when the repository is created; the connection is made (and the schema
+    migrated) on first use. Like its sqlite3 connection, a repository belongs to one thread.
+    Writes go through a write-behind TaskStore, so call flush() or close() (or use batch())
+    when they have to be on disk.
+
+    Task records loaded by ID are kept in a TaskCache that every mutation method writes through.
+    Repositories on different threads can share one cache (DatabaseExecutor does).
+
+    Every database call runs in a 'db' span of tasktrack.profiling.profiler.
+
+    Every write is recorded in the change journal (see tasktrack.db) as part of an action:
+    each mutation method is one, and action() groups several. load_changes_since() lets a
+    consumer catch up from a sequence number, and undo() / redo() replay whole actions.
+    """
+
+    def __init__(self, path=DEFAULT_DATABASE_PATH, read_only=False, max_pending=50, flush_interval_ms=500, cache=None):
+        """
+        Args:
+            path (str): Location of the database file.
+            read_only (bool): Open a read-only connection to an existing database.
+            max_pending (int): Number of uncommitted writes that triggers a flush.
+            flush_interval_ms (int): Longest time a write may stay uncommitted.
+            cache (TaskCache): Record cache to use (default is a new one for this repository).
+        """
+
+        self.path = path
+        self.read_only = read_only
+        self.cache = cache if cache is not None else TaskCache()
+        self._store = TaskStore(max_pending=max_pending, flush_interval_ms=flush_interval_ms, on_commit=self.cache.committed)
+        self._action_depth = 0
+
+    @property
+    def store(self):
+        """
+        TaskStore: The write-behind store, connected on first use.
+        """
+
+        if self._store.connection is None:
+            if self.read_only:
+                self._store.connection = connect_read_only(self.path)
+            else:
+                self._store.connection = initialize_database(self.path)
+        return self._store
+
+    @property
+    def connection(self):
+        """
+        sqlite3.Connection: The repository's connection, opened on first use.
+        """
+
+        return self.store.connection
+
+    @contextmanager
+    def batch(self):
+        """
+        Group every write made inside a 'with repository.batch() as store:' block into one transaction.
+        """
+
+        try:
+            with self.store.batch() as store:
+                yield store
+        except BaseException:
+            self.cache.clear()  # The rolled back writes may have been written through to the cache
+            raise
+
+    @contextmanager
+    def action(self, label, kind="do"):
+        """
+        Record every write made inside the block in the journal as one undoable action.
+        Actions can be nested; the writes then belong to the outermost one. Task writes made
+        outside any action fail (see tasktrack.db.register_journal_functions).
+
+        An action is all-or-nothing: if the block raises, its writes and the action itself are
+        rolled back (see TaskStore.savepoint), so a failed mutation never leaves an empty or
+        half-applied action for undo to find.
+
+        Args:
+            label (str): What the action did, e.g. 'Move task'.
+            kind (str): 'do', or 'undo', 'redo', 'archive' or 'snapshot' for the actions undo passes over.
+
+        Yields:
+            int: The ID of the outermost action.
+        """
+
+        connection = self.connection
+        if self._action_depth:
+            self._action_depth += 1
+            try:
+                yield connection.journal_action
+            finally:
+                self._action_depth -= 1
+            return
+
+        try:
+            with self.store.savepoint("action"):
+                action_id = self.store.execute(
+                    "INSERT INTO journal_actions (label, kind) VALUES (?, ?)", (label, kind)
+                ).lastrowid
+                self.store.execute("UPDATE journal_actions SET done_at = id WHERE id = ?", (action_id,))
+                connection.journal_action = action_id
+                self._action_depth = 1
+                try:
+                    yield action_id
+                finally:
+                    self._action_depth = 0
+                    connection.journal_action = None
+        except BaseException:
+            self.cache.clear()  # The rolled back writes may have been written through to the cache
+            raise
+        if kind == "do" and action_id % JOURNAL_COMPACT_EVERY == 0:
+            self.compact_journal()
+
+    @traced(category="db")
+    def flush(self):
+        """
+        Commit every pending write.
+        """
+
+        if self._store.connection is not None:
+            self._store.flush()
+
+    def close(self):
+        """
+        Commit pending writes and close the connection. The repository reconnects if used again.
+        """
+
+        if self._store.connection is not None:
+            self._store.flush()
+            self._store.connection.close()
+            self._store.connection = None
+
+    ################################################## MUTATIONS ##################################################
+    @traced(category="db")
+    def clear(self):
+        """
+        Clear all data from the 'tasks' table for debugging purposes.
+        """
+
+        with self.action("Clear tasks"):
+            self.store.execute("DELETE FROM tasks")  # Deletes all rows from the 'tasks' table
+        self.store.flush()
+        self.cache.clear()
+        self.incremental_vacuum()  # Give the freed pages back to the file system
+
+    @traced(category="db")
+    @_journaled("Create task")
+    def save_task(self, task_title, task_content, day, due_day=None):
+        """
+        Insert a new task into the database.
+
+        Args:
+            task_title (str): The title of the task.
+            task_content (str): The content or details of the task.
+            day (str): The day of the week associated with the task (ignored if 'due_day' is given).
+            due_day (int): Epoch day the task is due (default is 'day' in the current week).
+
+        Returns:
+            int: The ID of the new task.
+        """
+
+        if due_day is None:
+            due_day = day_in_week(day, week_start(today_epoch_day()))
+        day = weekday_name(due_day)  # The due day wins over a 'day' that disagrees with it
+        task_id = self.store.execute(
+            "INSERT INTO tasks (title, day, status, due_day) VALUES (?, ?, 'not-completed', ?)",
+            (task_title, day, due_day),
+        ).lastrowid
+        if task_content:
+            self._write_note(task_id, task_content)
+        self.cache.put((task_id, task_title, task_content, day, "not-completed"))
+        return task_id
+
+    @traced(category="db")
+    @_journaled("Delete task")
+    def delete_task(self, task_id):
+        """
+        Delete a task from the database.
+
+        Args:
+            task_id (int): The ID of the task to delete.
+        """
+
+        self.store.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        self.cache.discard(task_id)
+
+    @traced(category="db")
+    @_journaled("Edit notes")
+    def update_content(self, task_id, task_content):
+        """
+        Update the content of an existing task in the database.
+
+        Args:
+            task_id (int): The ID of the task to update.
+            task_content (str): The new content for the task.
+        """
+
+        self._write_note(task_id, task_content)
+        self.cache.update(task_id, content=task_content)
+
+    @traced(category="db")
+    @_journaled("Edit task")
+    def update_task(self, task_id, task_title, day, task_content, due_day=None):
+        """
+        Update the title, day and content of an existing task.
+
+        Args:
+            task_id (int): The ID of the task to update.
+            task_title (str): The new title for the task.
+            day (str): The new day for the task.
+            task_content (str): The new content for the task.
+            due_day (int): New epoch day the task is due (default is 'day' in the week it is already due).
+        """
+
+        if due_day is not None:
+            day = weekday_name(due_day)
+        self.store.execute(
+            f"UPDATE tasks SET title = :title, day = :day, due_day = {_DUE_DAY_UPDATE} WHERE id = :id",
+            {"title": task_title, "day": day, "id": task_id, "due_day": due_day, "weekday": DAYS_OF_WEEK.index(day)},
+        )
+        self._write_note(task_id, task_content)
+        self.cache.update(task_id, title=task_title, day=day, content=task_content)
+
+    @traced(category="db")
+    @_journaled("Move task")
+    def move_task(self, task_id, new_day, due_day=None):
+        """
+        Move a task to a different day.
+
+        Args:
+            task_id (int): The ID of the task to update.
+            new_day (str): The new day of the week to assign the task to.
+            due_day (int): New epoch day the task is due (default is 'new_day' in the week it is already due).
+        """
+
+        if due_day is not None:
+            new_day = weekday_name(due_day)
+        self.store.execute(
+            f"UPDATE tasks SET day = :day, due_day = {_DUE_DAY_UPDATE} WHERE id = :id",
+            {"day": new_day, "id": task_id, "due_day": due_day, "weekday": DAYS_OF_WEEK.index(new_day)},
+        )
+        self.cache.update(task_id, day=new_day)
+
+    @traced(category="db")
+    @_journaled("Complete task")
+    def complete_task(self, task_id):
+        """
+        Mark a task as completed.
+
+        Args:
+            task_id (int): The ID of the task to mark as completed.
+        """
+
+        self.store.execute("UPDATE tasks SET status = 'completed' WHERE id = ?", (task_id,))
+        self.cache.update(task_id, status="completed")
+
+    def _write_note(self, task_id, task_content):
+        """
+        Store, replace or (for empty content) remove a task's note. Rewriting an unchanged note
+        writes nothing, so it isn't journaled or reindexed either.
+        """
+
+        if task_content:
+            self.store.execute(
+                "INSERT INTO task_notes (task_id, body) VALUES (?, ?) "
+                "ON CONFLICT (task_id) DO UPDATE SET body = excluded.body WHERE body IS NOT excluded.body",
+                (task_id, encode_note(task_content)),
+            )
+        else:
+            self.store.execute("DELETE FROM task_notes WHERE task_id = ?", (task_id,))
+
+    ################################################## BULK OPERATIONS ##################################################
+    # Each one is a single set-based statement over the IDs (passed as one JSON array) and one journal action
+
+    @traced(category="db")
+    @_journaled("Insert tasks")
+    def insert_tasks(self, rows):
+        """
+        Insert many tasks with executemany, in one transaction. Inside an action (an import,
+        say) the tasks join it; otherwise they are an action of their own.
+
+        Args:
+            rows (list): (title, content, day, status, due epoch day) tuples.
+
+        Returns:
+            list: The IDs of the new tasks, in the order of 'rows'.
+        """
+
+        with self.batch() as store:
+            store.executemany(
+                "INSERT INTO tasks (title, day, status, due_day) VALUES (?, ?, ?, ?)",
+                [(title, day, status, due_day) for title, _, day, status, due_day in rows],
+            )
+            # The transaction holds the write lock, so the new tasks are exactly the newest IDs
+            task_ids = [row[0] for row in self.connection.execute(
+                "SELECT id FROM tasks ORDER BY id DESC LIMIT ?", (len(rows),)
+            )][::-1]
+            store.executemany(
+                "INSERT INTO task_notes (task_id, body) VALUES (?, ?)",
+                [(task_id, encode_note(row[1])) for task_id, row in zip(task_ids, rows) if row[1]],
+            )
+        return task_ids
+
+    @traced(category="db")
+    @_journaled("Move tasks")
+    def move_tasks(self, task_ids, new_day):
+        """
+        Move several tasks to a different day, each within the week it is already due.
+
+        Args:
+            task_ids (list): The IDs of the tasks.
+            new_day (str): The new day of the week.
+        """
+
+        self.store.execute(
+            f"UPDATE tasks SET day = :day, due_day = {_DUE_DAY_UPDATE} WHERE id IN (SELECT value FROM json_each(:ids))",
+            {"day": new_day, "ids": json.dumps(list(task_ids)), "due_day": None, "weekday": DAYS_OF_WEEK.index(new_day)},
+        )
+        for task_id in task_ids:
+            self.cache.update(task_id, day=new_day)
+
+    @traced(category="db")
+    @_journaled("Complete tasks")
+    def complete_tasks(self, task_ids):
+        """
+        Mark several tasks as completed.
+
+        Args:
+            task_ids (list): The IDs of the tasks.
+        """
+
+        self.store.execute(
+            "UPDATE tasks SET status = 'completed' WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(task_ids)),),
+        )
+        for task_id in task_ids:
+            self.cache.update(task_id, status="completed")
+
+    @traced(category="db")
+    @_journaled("Delete tasks")
+    def delete_tasks(self, task_ids):
+        """
+        Delete several tasks.
+
+        Args:
+            task_ids (list): The IDs of the tasks.
+        """
+
+        self.store.execute("DELETE FROM tasks WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(list(task_ids)),))
+        for task_id in task_ids:
+            self.cache.discard(task_id)
+
+    @traced(category="db")
+    @_journaled("Recolor tasks")
+    def recolor_tasks(self, task_ids, color):
+        """
+        Give several tasks a card color.
+
+        Args:
+            task_ids (list): The IDs of the tasks.
+            color (str): A Tk color such as '#90BE6D', or None for the default.
+        """
+
+        self.store.execute(
+            "UPDATE tasks SET color = ? WHERE id IN (SELECT value FROM json_each(?))",
+            (color, json.dumps(list(task_ids))),
+        )
+
+    ################################################## JOURNAL ##################################################
+    @_journaled("Restore task")
+    def restore_task(self, task_id, fields):
+        """
+        Put a task into a given state, creating it with that ID if needed.
+
+        Args:
+            task_id (int): The ID of the task.
+            fields (dict): Values for the journaled columns (see tasktrack.db.JOURNAL_COLUMNS;
+                missing ones are NULL, except a missing 'content', which leaves the note as
+                it is), or None to delete the task.
+        """
+
+        if fields is None:
+            self.store.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        else:
+            self.store.execute(f'''
+                INSERT INTO tasks (id, {", ".join(_TASK_COLUMNS)}) VALUES (:id, {", ".join(":" + column for column in _TASK_COLUMNS)})
+                ON CONFLICT (id) DO UPDATE SET {", ".join(f"{column} = excluded.{column}" for column in _TASK_COLUMNS)}
+            ''', {"id": task_id, **{column: fields.get(column) for column in _TASK_COLUMNS}})
+            if "content" in fields:
+                self._write_note(task_id, fields["content"])
+        self.cache.discard(task_id)
+
+    def _replay(self, action_id, label, kind, column):
+        with self.batch(), self.action(f"{kind.capitalize()} {label}", kind) as replay_id:
+            entries = self.connection.execute(
+                f"SELECT task_id, {column} FROM task_journal WHERE action = ? ORDER BY seq {'DESC' if kind == 'undo' else 'ASC'}",
+                (action_id,),
+            ).fetchall()
+            for task_id, row in entries:
+                self.restore_task(task_id, json.loads(row) if row is not None else None)
+            if kind == "undo":
+                self.store.execute("UPDATE journal_actions SET state = 'undone', undone_at = ? WHERE id = ?", (replay_id, action_id))
+            else:
+                self.store.execute("UPDATE journal_actions SET state = 'done', done_at = ? WHERE id = ?", (replay_id, action_id))
+        return label, sorted({task_id for task_id, _ in entries})
+
+    @traced(category="db")
+    def undo(self):
+        """
+        Revert the most recent action that is still applied.
+
+        Returns:
+            tuple: (label of the undone action, IDs of the tasks it touched), or None if there is nothing to undo.
+        """
+
+        row = self.connection.execute(
+            "SELECT id, label FROM journal_actions WHERE state = 'done' AND kind = 'do' ORDER BY done_at DESC LIMIT 1"
+        ).fetchone()
+        return self._replay(row[0], row[1], "undo", "old_row") if row else None
+
+    @traced(category="db")
+    def redo(self):
+        """
+        Re-apply the most recently undone action, unless a new action has been made since.
+
+        Returns:
+            tuple: (label of the redone action, IDs of the tasks it touched), or None if there is nothing to redo.
+        """
+
+        row = self.connection.execute('''
+            SELECT id, label FROM journal_actions
+            WHERE state = 'undone' AND undone_at > (SELECT COALESCE(MAX(id), 0) FROM journal_actions WHERE kind = 'do')
+            ORDER BY undone_at DESC LIMIT 1
+        ''').fetchone()
+        return self._replay(row[0], row[1], "redo", "new_row") if row else None
+
+    @traced(category="db")
+    def compact_journal(self, keep_actions=UNDO_DEPTH):
+        """
+        Fold everything but the last 'keep_actions' actions into a snapshot: one entry per task,
+        its latest state. load_changes_since() answers exactly as before, but the compacted
+        actions can no longer be undone.
+
+        Args:
+            keep_actions (int): Number of recent actions to keep whole.
+
+        Returns:
+            int: Number of journal entries removed.
+        """
+
+        with self.batch():
+            newest_action = self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM journal_actions").fetchone()[0]
+            cutoff = newest_action - keep_actions
+            floor = self.connection.execute(
+                "SELECT COALESCE(MIN(seq), (SELECT COALESCE(MAX(seq), 0) + 1 FROM task_journal)) FROM task_journal WHERE action > ?",
+                (cutoff,),
+            ).fetchone()[0]
+            removed = self.store.execute('''
+                DELETE FROM task_journal
+                WHERE seq < :floor
+                  AND seq < (SELECT MAX(seq) FROM task_journal AS later WHERE later.task_id = task_journal.task_id AND later.seq < :floor)
+            ''', {"floor": floor}).rowcount
+            self.store.execute("UPDATE journal_actions SET state = 'compacted' WHERE id <= ? AND state <> 'compacted'", (cutoff,))
+        return removed
+
+    @traced(category="db")
+    def latest_change(self):
+        """
+        Returns:
+            int: Sequence number of the newest journal entry (0 if there is none).
+        """
+
+        return self.connection.execute("SELECT COALESCE(MAX(seq), 0) FROM task_journal").fetchone()[0]
+
+    @traced(category="db")
+    def load_changes_since(self, since, limit=CHANGES_PAGE_SIZE):
+        """
+        Retrieve the current state of every task that changed after journal sequence number 'since'.
+
+        Args:
+            since (int): Sequence number the consumer has already seen (0 for everything).
+            limit (int): Maximum number of changes; page on with the last change's 'seq'.
+
+        Returns:
+            list: Changes in sequence order, one per task, as dicts with 'seq', 'id', 'deleted'
+                and the task's columns (None for a deleted task).
+        """
+
+        cursor = self.connection.execute('''
+            SELECT seq, task_id, new_row,
+                   iif(json_type(new_row, '$.content') IS NULL, (SELECT body FROM task_notes WHERE task_notes.task_id = entry.task_id), NULL)
+            FROM task_journal AS entry
+            WHERE seq > ? AND seq = (SELECT MAX(seq) FROM task_journal WHERE task_id = entry.task_id)
+            ORDER BY seq LIMIT ?
+        ''', (since, limit))
+        return [_change(*row) for row in cursor]
+
+    ################################################## MAINTENANCE ##################################################
+    @traced(category="db")
+    def archive_completed_tasks(self, due_before, limit=ARCHIVE_BATCH_SIZE, archive_path=None):
+        """
+        Move up to 'limit' completed tasks due before a day, with their notes, into the archive
+        database (see tasktrack.db.attach_archive) in one transaction. Tasks changed by an action
+        that can still be undone are left alone, so an undo never revives an archived task.
+
+        The move is journaled as an 'archive' action, which undo skips; consumers of
+        load_changes_since see the tasks as deleted. Nothing will ever replay the tasks' history,
+        so their journal entries shrink to the deletes themselves, without the old state.
+
+        Args:
+            due_before (int): Epoch day; completed tasks due before it are archived.
+            limit (int): Maximum number of tasks to move.
+            archive_path (str): The archive database (default is next to the task database, see archive_path_for).
+
+        Returns:
+            int: Number of tasks archived; fewer than 'limit' means none are left to archive.
+        """
+
+        if not any(row[1] == "archive" for row in self.connection.execute("PRAGMA database_list")):
+            self.flush()  # ATTACH can't run inside a transaction
+            attach_archive(self.connection, archive_path or archive_path_for(self.path))
+
+        with self.batch():
+            task_ids = [row[0] for row in self.connection.execute('''
+                SELECT id FROM tasks
+                WHERE status = 'completed' AND due_day < ? AND id NOT IN (
+                    SELECT task_id FROM task_journal
+                    WHERE action IN (SELECT id FROM journal_actions WHERE kind = 'do' AND state <> 'compacted')
+                )
+                ORDER BY due_day LIMIT ?
+            ''', (due_before, limit))]
+            if not task_ids:
+                return 0
+
+            ids = json.dumps(task_ids)
+            with self.action("Archive completed tasks", "archive") as action_id:
+                self.store.execute('''
+                    INSERT INTO archive.archived_tasks (task_id, title, day, status, due_day, color, note, archived_at)
+                    SELECT id, title, day, status, due_day, color, body, ?
+                    FROM tasks LEFT JOIN task_notes ON task_id = id WHERE id IN (SELECT value FROM json_each(?)) ORDER BY id
+                ''', (int(time.time()), ids))
+                self.store.execute("DELETE FROM tasks WHERE id IN (SELECT value FROM json_each(?))", (ids,))
+                self.store.execute(
+                    "DELETE FROM task_journal WHERE task_id IN (SELECT value FROM json_each(?)) AND (action <> ? OR new_row IS NOT NULL)",
+                    (ids, action_id),
+                )
+                self.store.execute("UPDATE task_journal SET old_row = NULL WHERE action = ?", (action_id,))
+        for task_id in task_ids:
+            self.cache.discard(task_id)
+        return len(task_ids)
+
+    @traced(category="db")
+    def merge_search_index(self, pages=500):
+        """
+        Do one bounded step of merging the search index's segments, which drops the entries of
+        deleted and archived tasks for good.
+
+        Args:
+            pages (int): Roughly how many index pages to write.
+
+        Returns:
+            bool: Whether there was anything to merge; repeat until there isn't.
+        """
+
+        changes = self.connection.total_changes
+        self.store.execute("INSERT INTO tasks_fts (tasks_fts, rank) VALUES ('merge', ?)", (-int(pages),))  # Negative: merge any segments
+        self.flush()
+        return self.connection.total_changes - changes >= 2
+
+    @traced(category="db")
+    def storage_stats(self):
+        """
+        Returns:
+            dict: 'page_size' in bytes, 'pages' and 'free_pages' in the database file, its size in
+                'bytes' (its write-ahead log aside), and whether free pages can be released by
+                'incremental_vacuum'.
+        """
+
+        page_size, pages, free_pages, auto_vacuum = (
+            self.connection.execute(f"PRAGMA {pragma}").fetchone()[0]
+            for pragma in ("page_size", "page_count", "freelist_count", "auto_vacuum")
+        )
+        return {"page_size": page_size, "pages": pages, "free_pages": free_pages,
+                "bytes": pages * page_size, "incremental_vacuum": auto_vacuum == 2}
+
+    @traced(category="db")
+    def incremental_vacuum(self, pages=None):
+        """
+        Release free pages to the file system (in WAL mode, at the next checkpoint). Only a
+        database with auto_vacuum = INCREMENTAL can; new ones have it, and
+        'python -m tasktrack migrate' converts older ones.
+
+        Args:
+            pages (int): Maximum number of pages to release (default is every free page).
+
+        Returns:
+            int: Number of pages released.
+        """
+
+        self.flush()
+        free_pages = self.connection.execute("PRAGMA freelist_count").fetchone()[0]
+        self.connection.executescript(f"PRAGMA incremental_vacuum({int(pages or 0)})")  # execute() releases only one page
+        return free_pages - self.connection.execute("PRAGMA freelist_count").fetchone()[0]
+
+    @traced(category="db")
+    def analyze(self, analysis_limit=ANALYSIS_LIMIT):
+        """
+        Refresh the statistics the query planner chooses the task indexes by.
+
+        The journal is left out: its snapshot action holds one entry per task, and statistics
+        averaged over that would make the planner scan the whole journal instead of using the
+        action index that undo, redo and archiving rely on.
+
+        Args:
+            analysis_limit (int): Rows sampled per index.
+        """
+
+        self.flush()
+        self.connection.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+        self.connection.execute("ANALYZE tasks")
+        self.connection.execute("DELETE FROM sqlite_stat1 WHERE tbl = 'task_journal'")
+        self.connection.commit()
+
+    @traced(category="db")
+    def check_integrity(self, max_errors=100):
+        """
+        Run SQLite's integrity check over the whole database. Works on a read-only repository.
+
+        Args:
+            max_errors (int): Stop after this many problems.
+
+        Returns:
+            list: The problems found, as messages; empty if the database is sound.
+        """
+
+        messages = [row[0] for row in self.connection.execute(f"PRAGMA integrity_check({int(max_errors)})")]
+        return [] if messages == ["ok"] else messages
+
+    ################################################## QUERIES ##################################################
+    @traced(category="db")
+    def load_tasks_for_day(self, day):
+        """
+        Retrieve all active (non-completed) tasks for a specific day.
+
+        Args:
+            day (str): The day to fetch tasks for.
+
+        Returns:
+            list: A list of tuples containing task IDs and titles.
+        """
+
+        cursor = self.connection.execute(
+            "SELECT id, title FROM tasks WHERE day = ? AND status != 'completed'", (day,)
+        )
+        return cursor.fetchall()
+
+    @traced(category="db")
+    def load_tasks_between(self, start_day, end_day):
+        """
+        Retrieve the active (non-completed) tasks due in a date range with one indexed range scan.
+        Works for any span: a week, a month or a whole semester.
+
+        Args:
+            start_day (int): First epoch day of the range.
+            end_day (int): Epoch day just after the range.
+
+        Returns:
+            list: A list of tuples (due epoch day, task ID, title, card color or None) ordered by due day and ID.
+        """
+
+        cursor = self.connection.execute(
+            "SELECT due_day, id, title, color FROM tasks "
+            "WHERE due_day >= ? AND due_day < ? AND (status < 'completed' OR status > 'completed')",
+            (start_day, end_day),
+        )
+        return sorted(cursor)
+
+    @traced(category="db")
+    def load_tasks_for_week(self, start_day=None):
+        """
+        Retrieve the active (non-completed) tasks for every day of one week in a single query.
+
+        Args:
+            start_day (int): Epoch day of the week's Sunday (default is the current week).
+
+        Returns:
+            dict: Maps each day name to a list of (task ID, title, card color or None) tuples ordered by ID.
+        """
+
+        if start_day is None:
+            start_day = week_start(today_epoch_day())
+
+        week = {day: [] for day in DAYS_OF_WEEK}
+        for due_day, task_id, task_title, color in self.load_tasks_between(start_day, start_day + 7):
+            week[DAYS_OF_WEEK[due_day - start_day]].append((task_id, task_title, color))
+        return week
+
+    @traced(category="db")
+    def load_upcoming_reminders(self, from_day):
+        """
+        Retrieve the active (non-completed) tasks due on or after a day, to schedule their reminders.
+
+        Args:
+            from_day (int): First epoch day to include.
+
+        Returns:
+            list: A list of tuples (task ID, title, due epoch day).
+        """
+
+        cursor = self.connection.execute(
+            "SELECT id, title, due_day FROM tasks WHERE due_day >= ? AND (status < 'completed' OR status > 'completed')",
+            (from_day,),
+        )
+        return cursor.fetchall()
+
+    @traced(category="db")
+    def load_reminders(self, task_ids, from_day=None):
+        """
+        Retrieve the reminder details of specific tasks, e.g. after they were edited or an undo.
+
+        Args:
+            task_ids (list): The IDs of the tasks.
+            from_day (int): First epoch day to include (default is any due day).
+
+        Returns:
+            list: A (task ID, title, due epoch day) tuple for each of them that is still active and
+                has a due day (on or after 'from_day').
+        """
+
+        cursor = self.connection.execute(
+            "SELECT id, title, due_day FROM tasks WHERE id IN (SELECT value FROM json_each(?)) "
+            "AND due_day >= COALESCE(?, due_day) AND (status < 'completed' OR status > 'completed')",
+            (json.dumps(list(task_ids)), from_day),
+        )
+        return cursor.fetchall()
+
+    @traced(category="db")
+    def load_completed_tasks(self, after_id=0, limit=COMPLETED_PAGE_SIZE):
+        """
+        Retrieve one page of completed tasks using keyset pagination.
+        The task content is not included; use load_task_content when a task is opened.
+
+        Args:
+            after_id (int): Only return tasks with an ID greater than this (the last ID of the previous page).
+            limit (int): Maximum number of tasks to return.
+
+        Returns:
+            list: A list of tuples containing task details (ID, title, day), ordered by ID.
+        """
+
+        cursor = self.connection.execute(
+            "SELECT id, title, day FROM tasks WHERE status = 'completed' AND id > ? ORDER BY id LIMIT ?",
+            (after_id, limit),
+        )
+        return cursor.fetchall()
+
+    @traced(category="db")
+    def count_completed_tasks(self):
+        """
+        Count the completed tasks in the database.
+
+        Returns:
+            int: Number of completed tasks.
+        """
+
+        return self.connection.execute("SELECT COUNT(*) FROM tasks WHERE status = 'completed'").fetchone()[0]
+
+    @traced(category="db")
+    def count_tasks_by_due_day(self):
+        """
+        Count the tasks due on each day, with one pass over the due day index.
+
+        Returns:
+            list: (due epoch day, tasks, completed tasks) tuples ordered by due day.
+        """
+
+        return self.connection.execute(
+            "SELECT due_day, COUNT(*), SUM(status = 'completed') FROM tasks "
+            "WHERE due_day IS NOT NULL GROUP BY due_day ORDER BY due_day"
+        ).fetchall()
+
+    @traced(category="db")
+    def count_tasks_by_course(self, today):
+        """
+        Count the tasks of each course (the part of the title before a colon, as in 'HIST 201: Essay 1')
+        with one pass over the course index.
+
+        Args:
+            today (int): Today's epoch day; active tasks due before it are overdue.
+
+        Returns:
+            list: (course, tasks, completed tasks, overdue tasks) tuples ordered by course;
+                titles without a course are counted under ''.
+        """
+
+        return self.connection.execute(
+            "SELECT course, COUNT(*), SUM(status = 'completed'), SUM(status <> 'completed' AND due_day < ?) "
+            "FROM tasks GROUP BY course ORDER BY course",
+            (today,),
+        ).fetchall()
+
+    @traced(category="db")
+    def load_task(self, task_id):
+        """
+        Retrieve a whole task record, from the cache when possible.
+
+        Args:
+            task_id (int): The ID of the task.
+
+        Returns:
+            tuple: (ID, title, content, day, status), or None if there is no such task.
+        """
+
+        record = self.cache.get(task_id)
+        if record is None:
+            token = self.cache.load_token()
+            row = self.connection.execute(
+                "SELECT id, title, body, day, status FROM tasks LEFT JOIN task_notes ON task_id = id WHERE id = ?", (task_id,)
+            ).fetchone()
+            if row is not None:
+                record = (row[0], row[1], decode_note(row[2]), row[3], row[4])
+                self.cache.put_loaded(record, token)
+        return record
+
+    @traced(category="db")
+    def load_task_content(self, task_id):
+        """
+        Retrieve the content (notes) of a single task, from the cache when possible.
+
+        Args:
+            task_id (int): The ID of the task.
+
+        Returns:
+            str: The task content, or an empty string if it has none.
+        """
+
+        record = self.load_task(task_id)
+        return (record[2] or "") if record else ""
+
+    @traced(category="db")
+    def search_tasks(self, text, limit=SEARCH_PAGE_SIZE, offset=0):
+        """
+        Search task titles and content, best matches first. Every call ranks all the matches, so
+        fetch the results wanted in one call rather than page by page with 'offset'.
+
+        Matched words in the title and snippet are wrapped in HIGHLIGHT_START and HIGHLIGHT_END.
+
+        Args:
+            text (str): What the user typed; every word is matched as a prefix.
+            limit (int): Maximum number of results to return.
+            offset (int): Number of results to skip (the results already shown).
+
+        Returns:
+            list: A list of tuples (ID, highlighted title, highlighted content snippet, day, status).
+        """
+
+        query = build_search_query(text)
+        if not query:
+            return []
+        cursor = self.connection.execute(
+            '''
+            SELECT tasks.id,
+                   highlight(tasks_fts, 0, :start, :end),
+                   snippet(tasks_fts, 1, :start, :end, '...', 12),
+                   tasks.day, tasks.status
+            FROM tasks_fts JOIN tasks ON tasks.id = tasks_fts.rowid
+            WHERE tasks_fts MATCH :query
+            ORDER BY rank
+            LIMIT :limit OFFSET :offset
+            ''',
+            {"start": HIGHLIGHT_START, "end": HIGHLIGHT_END, "query": query, "limit": limit, "offset": offset},
+        )
+        return cursor.fetchall()
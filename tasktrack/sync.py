@@ -0,0 +1,497 @@
+"""
+Optional multi-user sync: an asyncio HTTP/WebSocket server in front of a task database, and a
+client that keeps a local SQLite replica of it. Standard library only.
+
+    python -m tasktrack --database shared.db serve --port 8765
+    python -m tasktrack --database replica.db replicate ws://study-group-host:8765
+
+Changes are tracked by the sequence numbers of the database's change journal, and clients
+exchange deltas (the latest state of each changed task) rather than snapshots: a client that
+reconnects says which sequence number it has seen and receives only what changed since.
+"""
+
+import asyncio
+import json
+import sqlite3
+import urllib.parse
+
+from .db import DEFAULT_DATABASE_PATH
+from .executor import DatabaseExecutor
+from .profiling import profiler, traced
+from .repository import CHANGES_PAGE_SIZE, TaskRepository
+from .websocket import OP_TEXT, WebSocketError, accept_key, connect, encode_frame, read_http_head, read_message
+
+DEFAULT_PORT = 8765
+
+# URL path of the WebSocket endpoint
+SYNC_PATH = "/sync"
+
+# How often the server looks for changes made to the database by other processes
+EXTERNAL_CHANGES_POLL_SECONDS = 1
+
+# Bytes a client may fall behind by before the server drops it; it reconnects and catches up
+MAX_CLIENT_BACKLOG = 1024 * 1024
+
+################################################## CHANGES ##################################################
+def apply_changes(repository, changes):
+    """
+    Apply operations pushed by a client as one transaction (and one journal action).
+    If any operation is invalid, none of them are applied.
+
+    Args:
+        repository (TaskRepository): Read/write repository of the shared database.
+        changes (list): Operations such as {'op': 'move', 'id': 7, 'day': 'Friday'}; 'op' is one
+            of create, update, move, complete or delete (see SyncClient for the fields of each).
+
+    Returns:
+        list: One delta (see TaskRepository.load_changes_since) per task the operations changed.
+    """
+
+    with repository.batch(), repository.action("Sync"):
+        since = repository.latest_change()
+        for change in changes:
+            operation = change.get("op")
+            if operation == "create":
+                task_id = repository.save_task(change["title"], change.get("content", ""), change["day"], change.get("due_day"))
+            elif operation == "update":
+                task_id = change["id"]
+                repository.update_task(task_id, change["title"], change["day"], change.get("content", ""), change.get("due_day"))
+            elif operation == "move":
+                task_id = change["id"]
+                repository.move_task(task_id, change["day"], change.get("due_day"))
+            elif operation == "complete":
+                task_id = change["id"]
+                repository.complete_task(task_id)
+            elif operation == "delete":
+                task_id = change["id"]
+                repository.delete_task(task_id)
+            else:
+                raise ValueError(f"unknown sync operation {operation!r}")
+    return repository.load_changes_since(since, len(changes))
+
+################################################## SERVER ##################################################
+class _Subscriber:
+    """
+    A connected WebSocket client. While it catches up, broadcasts are held in 'pending'.
+    """
+
+    __slots__ = ("writer", "pending")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.pending = []
+
+class SyncServer:
+    """
+    asyncio HTTP/WebSocket server for one shared task database.
+
+    Database work runs on a DatabaseExecutor (one writer thread plus a pool of read-only
+    connections), so the event loop never blocks on SQLite. A change is encoded into a frame
+    once and written to every subscriber's transport without waiting for it; a client that falls
+    more than MAX_CLIENT_BACKLOG bytes behind is disconnected and catches up when it reconnects.
+
+    Endpoints:
+        GET  /sync (WebSocket)       Send {"type": "hello", "since": N}, then {"type": "push",
+                                     "ref": R, "changes": [...]} messages; receive "changes",
+                                     "ack" and "error" messages.
+        GET  /changes?since=N        {"changes": [...], "seq": latest}
+        POST /changes                Body {"changes": [...]}; returns the deltas.
+        GET  /status                 {"clients": connected WebSocket clients, "seq": latest,
+                                     "broadcast": p50/p99 fan-out time (see tasktrack.profiling)}
+    """
+
+    def __init__(self, path=DEFAULT_DATABASE_PATH, host="127.0.0.1", port=DEFAULT_PORT, read_workers=4):
+        """
+        Args:
+            path (str): Location of the shared database.
+            host (str): Interface to listen on.
+            port (int): Port to listen on (0 picks a free one; see self.port after start()).
+            read_workers (int): Read-only connections in the database pool.
+        """
+
+        self.host = host
+        self.port = port
+        self.executor = DatabaseExecutor(path, read_workers=read_workers)
+        self.subscribers = set()
+        self.latest_seq = 0
+        self._server = None
+        self._watcher = None
+        self._apply_lock = asyncio.Lock()  # Keeps broadcasts in sequence order
+
+    async def _run(self, function, *args, read_only=False):
+        submit = self.executor.submit_read if read_only else self.executor.submit
+        return await asyncio.wrap_future(submit(function, *args))
+
+    async def start(self):
+        """
+        Start listening, and watching the journal for changes made by other processes.
+        """
+
+        self.latest_seq = await self._run(TaskRepository.latest_change)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._watcher = asyncio.create_task(self._watch_external_changes())
+
+    async def _watch_external_changes(self):
+        """
+        Broadcast changes that reached the database without going through this server, e.g.
+        from a Tk board opened on the shared file.
+        """
+
+        while True:
+            await asyncio.sleep(EXTERNAL_CHANGES_POLL_SECONDS)
+            async with self._apply_lock:
+                changes = await self._changes_since(self.latest_seq, read_only=True)
+                if changes:
+                    self.latest_seq = changes[-1]["seq"]
+                    self._broadcast(changes)
+
+    async def _changes_since(self, since, read_only=False):
+        """
+        Every change after sequence number 'since', all pages of it.
+        """
+
+        changes = []
+        while True:
+            page = await self._run(TaskRepository.load_changes_since, since, read_only=read_only)
+            changes.extend(page)
+            if len(page) < CHANGES_PAGE_SIZE:
+                return changes
+            since = page[-1]["seq"]
+
+    async def serve_forever(self, on_started=None):
+        """
+        Start the server and run until cancelled.
+
+        Args:
+            on_started (callable): Called once the server is listening.
+        """
+
+        await self.start()
+        if on_started is not None:
+            on_started()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Disconnect every client, stop listening and commit pending writes.
+        """
+
+        if self._watcher is not None:
+            self._watcher.cancel()
+        if self._server is not None:
+            self._server.close()
+        for subscriber in list(self.subscribers):
+            subscriber.writer.close()
+        self.subscribers.clear()
+        await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            request = await read_http_head(reader)
+            if request is None:
+                return
+            method, target, _ = request[0].split(" ", 2)
+            url = urllib.parse.urlsplit(target)
+            headers = request[1]
+            if url.path == SYNC_PATH and headers.get("upgrade", "").lower() == "websocket":
+                await self._serve_websocket(reader, writer, headers)
+            else:
+                await self._serve_http(method, url, headers, reader, writer)
+        except (ConnectionError, WebSocketError, ValueError, asyncio.IncompleteReadError):
+            pass  # The client went away or broke the protocol; drop the connection
+        finally:
+            writer.close()
+
+    ################################################## HTTP ##################################################
+    async def _serve_http(self, method, url, headers, reader, writer):
+        query = urllib.parse.parse_qs(url.query)
+        if method == "GET" and url.path == "/changes":
+            since = int(query.get("since", ["0"])[0])
+            changes = await self._run(TaskRepository.load_changes_since, since, read_only=True)
+            status, body = 200, {"changes": changes, "seq": self.latest_seq}
+        elif method == "POST" and url.path == "/changes":
+            payload = json.loads(await reader.readexactly(int(headers.get("content-length", "0"))) or b"{}")
+            try:
+                changes = await self._apply(payload.get("changes", []))
+                status, body = 200, {"changes": changes, "seq": self.latest_seq}
+            except (KeyError, ValueError, TypeError, sqlite3.Error) as error:
+                status, body = 400, {"error": str(error)}
+        elif method == "GET" and url.path == "/status":
+            status, body = 200, {"clients": len(self.subscribers), "seq": self.latest_seq,
+                                 "broadcast": profiler.statistics().get("SyncServer._broadcast")}
+        else:
+            status, body = 404, {"error": f"no such endpoint: {method} {url.path}"}
+
+        content = json.dumps(body).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}[status]
+        writer.write((
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(content)}\r\nConnection: close\r\n\r\n"
+        ).encode("ascii") + content)
+        await writer.drain()
+
+    ################################################## WEBSOCKET ##################################################
+    async def _serve_websocket(self, reader, writer, headers):
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept_key(headers.get('sec-websocket-key', ''))}\r\n\r\n"
+        ).encode("ascii"))
+
+        message = await read_message(reader, writer)
+        if message is None:
+            return
+        hello = json.loads(message[1])
+        if hello.get("type") != "hello":
+            raise WebSocketError("expected a hello message")
+
+        # Subscribe before catching up so no change falls in between; broadcasts wait in 'pending'
+        subscriber = _Subscriber(writer)
+        self.subscribers.add(subscriber)
+        try:
+            since = int(hello.get("since", 0))
+            while True:
+                changes = await self._run(TaskRepository.load_changes_since, since, read_only=True)
+                if changes:
+                    since = changes[-1]["seq"]
+                    self._send(writer, {"type": "changes", "changes": changes})
+                    await writer.drain()
+                if len(changes) < CHANGES_PAGE_SIZE:
+                    break
+            pending, subscriber.pending = subscriber.pending, None
+            newer = [delta for delta in pending if delta["seq"] > since]
+            if newer:
+                self._send(writer, {"type": "changes", "changes": newer})
+            self._send(writer, {"type": "ready", "seq": max(since, self.latest_seq)})
+
+            while True:
+                message = await read_message(reader, writer)
+                if message is None:
+                    return
+                request = json.loads(message[1])
+                if request.get("type") != "push":
+                    continue
+                try:
+                    changes = await self._apply(request.get("changes", []), sender=subscriber)
+                except (KeyError, ValueError, TypeError, sqlite3.Error) as error:
+                    self._send(writer, {"type": "error", "ref": request.get("ref"), "message": str(error)})
+                else:
+                    self._send(writer, {"type": "ack", "ref": request.get("ref"), "changes": changes})
+        finally:
+            self.subscribers.discard(subscriber)
+
+    def _send(self, writer, message):
+        writer.write(encode_frame(json.dumps(message).encode("utf-8"), OP_TEXT))
+
+    async def _apply(self, changes, sender=None):
+        async with self._apply_lock:
+            deltas = await self._run(apply_changes, changes)
+            # Broadcast everything since the last broadcast, not just these deltas: writes other
+            # processes made since the watcher last looked have lower sequence numbers, and once
+            # latest_seq moves past them the watcher never would. The sender gets its own deltas
+            # in its ack and only needs the others.
+            changes = await self._changes_since(self.latest_seq)
+            if changes:
+                self.latest_seq = changes[-1]["seq"]
+                pushed = {delta["seq"] for delta in deltas}
+                self._broadcast(changes, sender, [change for change in changes if change["seq"] not in pushed])
+        return deltas
+
+    @traced(category="sync")
+    def _broadcast(self, deltas, sender=None, sender_deltas=()):
+        """
+        Send deltas to every subscriber except 'sender', which gets its own pushed changes in
+        its ack and only 'sender_deltas' here.
+        """
+
+        frame = encode_frame(json.dumps({"type": "changes", "changes": deltas}).encode("utf-8"), OP_TEXT)
+        for subscriber in list(self.subscribers):
+            if subscriber is sender:
+                if sender_deltas:
+                    self._send(subscriber.writer, {"type": "changes", "changes": sender_deltas})
+                continue
+            if subscriber.pending is not None:
+                subscriber.pending.extend(deltas)  # Still catching up
+            elif subscriber.writer.transport.get_write_buffer_size() > MAX_CLIENT_BACKLOG:
+                self.subscribers.discard(subscriber)
+                subscriber.writer.close()
+            else:
+                subscriber.writer.write(frame)
+
+################################################## CLIENT ##################################################
+class SyncClient:
+    """
+    Keeps a local SQLite replica of a sync server's tasks and pushes changes to the server.
+
+    The replica has the normal task schema, so 'repository' answers every query locally. Changes
+    made through this client are applied by the server first; the replica is updated when the
+    server's delta comes back (in the ack), and deltas from other clients are applied as they
+    are broadcast. The last sequence number applied is stored in the replica, so a restarted
+    client only downloads what changed since.
+    """
+
+    def __init__(self, url, path=DEFAULT_DATABASE_PATH, on_changes=None):
+        """
+        Args:
+            url (str): Server address, e.g. 'ws://localhost:8765'.
+            path (str): Location of the local replica database.
+            on_changes (callable): Called with each list of deltas after it is applied to the replica.
+        """
+
+        parts = urllib.parse.urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or DEFAULT_PORT
+        self.repository = TaskRepository(path)
+        self.on_changes = on_changes
+        self.ready = asyncio.Event()
+        self._reader = None
+        self._writer = None
+        self._receiver = None
+        self._acks = {}  # Push reference -> future resolved with its deltas
+        self._next_ref = 0
+
+        connection = self.repository.connection
+        connection.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value INTEGER)")
+        row = connection.execute("SELECT value FROM sync_state WHERE key = 'seq'").fetchone()
+        self.last_seq = row[0] if row else 0
+
+    async def connect(self):
+        """
+        Connect, catch up from the last applied sequence number and start receiving changes.
+        Wait on self.ready to know when the catch-up is complete.
+        """
+
+        self.ready.clear()
+        self._reader, self._writer = await connect(self.host, self.port, SYNC_PATH)
+        self._send({"type": "hello", "since": self.last_seq})
+        self._receiver = asyncio.create_task(self._receive())
+
+    async def close(self):
+        """
+        Disconnect and commit the replica.
+        """
+
+        if self._receiver is not None:
+            self._receiver.cancel()
+        if self._writer is not None:
+            self._writer.close()
+        self.repository.close()
+
+    async def wait_closed(self):
+        """
+        Wait until the server closes the connection.
+        """
+
+        if self._receiver is not None:
+            await asyncio.shield(self._receiver)
+
+    def _send(self, message):
+        self._writer.write(encode_frame(json.dumps(message).encode("utf-8"), OP_TEXT, mask=True))
+
+    async def _receive(self):
+        try:
+            while True:
+                message = await read_message(self._reader, self._writer, mask=True)
+                if message is None:
+                    break
+                message = json.loads(message[1])
+                kind = message.get("type")
+                if kind == "changes":
+                    self.apply_deltas(message["changes"])
+                elif kind == "ready":
+                    self.ready.set()
+                elif kind == "ack":
+                    self.apply_deltas(message["changes"])
+                    future = self._acks.pop(message["ref"], None)
+                    if future is not None and not future.done():
+                        future.set_result(message["changes"])
+                elif kind == "error":
+                    future = self._acks.pop(message["ref"], None)
+                    if future is not None and not future.done():
+                        future.set_exception(ValueError(message["message"]))
+        finally:
+            for future in self._acks.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("disconnected from the sync server"))
+            self._acks.clear()
+
+    def apply_deltas(self, deltas):
+        """
+        Apply deltas from the server to the replica in one transaction.
+
+        Args:
+            deltas (list): Deltas as produced by TaskRepository.load_changes_since.
+        """
+
+        deltas = [delta for delta in deltas if delta["seq"] > self.last_seq]
+        if not deltas:
+            return
+        with self.repository.batch(), self.repository.action("Sync"):
+            for delta in deltas:
+                self.repository.restore_task(delta["id"], None if delta["deleted"] else delta)
+            self.last_seq = deltas[-1]["seq"]
+            self.repository.store.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES ('seq', ?)", (self.last_seq,))
+        if self.on_changes is not None:
+            self.on_changes(deltas)
+
+    async def push(self, changes):
+        """
+        Send operations to the server and wait until they are applied.
+
+        Args:
+            changes (list): Operations, see apply_changes.
+
+        Returns:
+            list: The resulting deltas, already applied to the replica.
+        """
+
+        self._next_ref += 1
+        future = asyncio.get_running_loop().create_future()
+        self._acks[self._next_ref] = future
+        self._send({"type": "push", "ref": self._next_ref, "changes": changes})
+        return await future
+
+    async def create_task(self, task_title, task_content, day, due_day=None):
+        """
+        Returns:
+            int: The ID the server gave the new task.
+        """
+
+        deltas = await self.push([{"op": "create", "title": task_title, "content": task_content, "day": day, "due_day": due_day}])
+        return deltas[0]["id"]
+
+    async def update_task(self, task_id, task_title, day, task_content, due_day=None):
+        await self.push([{"op": "update", "id": task_id, "title": task_title, "day": day, "content": task_content, "due_day": due_day}])
+
+    async def move_task(self, task_id, new_day, due_day=None):
+        await self.push([{"op": "move", "id": task_id, "day": new_day, "due_day": due_day}])
+
+    async def complete_task(self, task_id):
+        await self.push([{"op": "complete", "id": task_id}])
+
+    async def delete_task(self, task_id):
+        await self.push([{"op": "delete", "id": task_id}])
+
+async def replicate(url, path=DEFAULT_DATABASE_PATH, on_changes=None, retry_seconds=2):
+    """
+    Keep a replica in sync with a server until cancelled, reconnecting whenever the connection drops.
+
+    Args:
+        url (str): Server address, e.g. 'ws://localhost:8765'.
+        path (str): Location of the local replica database.
+        on_changes (callable): Called with each list of deltas applied to the replica.
+        retry_seconds (float): Delay before reconnecting.
+    """
+
+    client = SyncClient(url, path, on_changes)
+    try:
+        while True:
+            try:
+                await client.connect()
+                await client.wait_closed()
+            except (OSError, WebSocketError):
+                pass
+            await asyncio.sleep(retry_seconds)
+    finally:
+        await client.close()
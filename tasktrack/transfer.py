@@ -0,0 +1,287 @@
+"""
+Streaming bulk import and export of tasks as CSV, JSON Lines and iCalendar (.ics).
+
+The functions take a TaskRepository first, so they can be handed to DatabaseExecutor.submit.
+"""
+
+from datetime import datetime, timezone
+import csv
+import json
+import os
+import re
+import time
+
+from .dates import day_in_week, from_epoch_day, to_epoch_day, today_epoch_day, week_start, weekday_name
+from .db import DAYS_OF_WEEK
+
+# Number of rows read and inserted at a time by import_tasks
+IMPORT_CHUNK_SIZE = 5000
+
+# Columns read and written by the CSV and JSON Lines formats
+TASK_FIELDS = ["title", "content", "day", "status", "due"]
+
+def _normalize_task(title, content, day, status, due, source):
+    """
+    Validate one imported task and return it as an INSERT row.
+
+    Args:
+        title (str): The title of the task.
+        content (str): The content or details of the task.
+        day (str): The day of the week, in any letter case; only used when there is no due date.
+        status (str): 'completed', or anything else for an active task.
+        due (str): Due date as YYYY-MM-DD or YYYYMMDD (default is 'day' in the current week).
+        source (str): Where the record came from, for error messages.
+
+    Returns:
+        tuple: (title, content, day, status, due epoch day) ready for insertion.
+    """
+
+    title = (title or "").strip()
+    if not title:
+        raise ValueError(f"{source}: task has no title")
+    due = (due or "").strip().replace("-", "")
+    if due:
+        try:
+            due_day = to_epoch_day(datetime.strptime(due[:8], "%Y%m%d"))
+        except ValueError:
+            raise ValueError(f"{source}: '{due}' is not a date") from None
+    else:
+        day = (day or "").strip().capitalize()
+        if day not in DAYS_OF_WEEK:
+            raise ValueError(f"{source}: '{day}' is not a day of the week")
+        due_day = day_in_week(day, week_start(today_epoch_day()))
+    status = "completed" if (status or "").strip().lower() == "completed" else "not-completed"
+    return (title, content or "", weekday_name(due_day), status, due_day)
+
+def read_csv_tasks(path):
+    """
+    Stream tasks from a CSV file with a header row naming the title, content, day, status
+    and (optionally) due columns.
+
+    Args:
+        path (str): The file to read.
+
+    Yields:
+        tuple: (title, content, day, status, due epoch day) for each row.
+    """
+
+    with open(path, newline="", encoding="utf-8") as csv_file:
+        for line_number, record in enumerate(csv.DictReader(csv_file), start=2):
+            yield _normalize_task(record.get("title"), record.get("content"), record.get("day"),
+                                  record.get("status"), record.get("due"), f"{path}:{line_number}")
+
+def read_jsonl_tasks(path):
+    """
+    Stream tasks from a JSON Lines file with one task object per line.
+
+    Args:
+        path (str): The file to read.
+
+    Yields:
+        tuple: (title, content, day, status, due epoch day) for each object.
+    """
+
+    with open(path, encoding="utf-8") as jsonl_file:
+        for line_number, line in enumerate(jsonl_file, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                raise ValueError(f"{path}:{line_number}: not a JSON object ({error})") from None
+            yield _normalize_task(record.get("title"), record.get("content"), record.get("day"),
+                                  record.get("status"), record.get("due"), f"{path}:{line_number}")
+
+def _unfold_ics_lines(ics_file):
+    """
+    Join iCalendar continuation lines (lines starting with a space or tab) onto the line they continue.
+    """
+
+    current = None
+    for line in ics_file:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+def _unescape_ics_text(value):
+    return re.sub(r"\\([\\;,nN])", lambda match: "\n" if match.group(1) in "nN" else match.group(1), value)
+
+def _escape_ics_text(value):
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def read_ics_tasks(path):
+    """
+    Stream tasks from the VTODO and VEVENT components of an iCalendar file.
+    SUMMARY becomes the title, DESCRIPTION the content, and DUE (or DTSTART) the due date.
+
+    Args:
+        path (str): The file to read.
+
+    Yields:
+        tuple: (title, content, day, status, due epoch day) for each component.
+    """
+
+    with open(path, encoding="utf-8") as ics_file:
+        component = None
+        for line in _unfold_ics_lines(ics_file):
+            name, _, value = line.partition(":")
+            name, _, parameters = name.partition(";")
+            name = name.upper()
+
+            if name == "BEGIN" and value.upper() in ("VTODO", "VEVENT"):
+                component = {}
+            elif component is None:
+                continue
+            elif name == "END" and value.upper() in ("VTODO", "VEVENT"):
+                yield _normalize_task(component.get("SUMMARY"), component.get("DESCRIPTION"),
+                                      component.get("X-TASKTRACK-DAY"), component.get("STATUS"),
+                                      component.get("DUE") or component.get("DTSTART"),
+                                      f"{path}: {component.get('UID', 'component')}")
+                component = None
+            elif name in ("SUMMARY", "DESCRIPTION"):
+                component[name] = _unescape_ics_text(value)
+            else:
+                component.setdefault(name, value)
+
+# Readers by file format
+TASK_READERS = {"csv": read_csv_tasks, "jsonl": read_jsonl_tasks, "ics": read_ics_tasks}
+
+def _file_format(path, file_format):
+    """
+    Use the given format, or work it out from the file extension.
+    """
+
+    file_format = (file_format or os.path.splitext(path)[1].lstrip(".")).lower()
+    if file_format in ("json", "ndjson"):
+        file_format = "jsonl"
+    if file_format not in TASK_READERS:
+        raise ValueError(f"Unsupported task file format '{file_format}' (expected csv, jsonl or ics)")
+    return file_format
+
+def _throughput(rows, started):
+    seconds = time.perf_counter() - started
+    return {"rows": rows, "seconds": seconds, "rows_per_second": rows / seconds if seconds else 0.0}
+
+def import_tasks(repository, path, file_format=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Stream tasks from a file into the database with executemany, a chunk at a time, so the
+    file is never held in memory. The import is all-or-nothing: it is one journal action, so a
+    failing record rolls back every row before it (and a single undo removes a finished import),
+    and a corrected file can simply be imported again.
+
+    Args:
+        repository (TaskRepository): The repository to import into.
+        path (str): The file to import.
+        file_format (str): 'csv', 'jsonl' or 'ics' (default is taken from the file extension).
+        chunk_size (int): Number of tasks read and inserted at a time.
+
+    Returns:
+        dict: Number of 'rows' imported, elapsed 'seconds' and 'rows_per_second'.
+
+    Raises:
+        ValueError: A record is invalid; the message names its line (or component) and says
+            how many rows were read before it. Nothing is imported.
+    """
+
+    started = time.perf_counter()
+    rows = TASK_READERS[_file_format(path, file_format)](path)
+    imported = 0
+    with repository.action(f"Import {os.path.basename(path)}"):
+        chunk = []
+        try:
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) == chunk_size:
+                    repository.insert_tasks(chunk)
+                    imported += len(chunk)
+                    chunk = []
+        except ValueError as error:
+            raise ValueError(f"{error} (after {imported + len(chunk)} valid rows; nothing was imported)") from None
+        if chunk:
+            repository.insert_tasks(chunk)
+            imported += len(chunk)
+    return _throughput(imported, started)
+
+def _write_ics_tasks(export_file, rows):
+    """
+    Write tasks as VTODO components due on their due date.
+    """
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    def write_line(line):
+        # Fold lines longer than 75 characters as RFC 5545 requires
+        while len(line) > 75:
+            export_file.write(line[:75] + "\r\n")
+            line = " " + line[75:]
+        export_file.write(line + "\r\n")
+
+    write_line("BEGIN:VCALENDAR")
+    write_line("VERSION:2.0")
+    write_line("PRODID:-//TaskTrack//Task Export//EN")
+    for task_id, title, content, day, status, due_day in rows:
+        write_line("BEGIN:VTODO")
+        write_line(f"UID:task-{task_id}@tasktrack")
+        write_line(f"DTSTAMP:{stamp}")
+        write_line(f"SUMMARY:{_escape_ics_text(title)}")
+        if content:
+            write_line(f"DESCRIPTION:{_escape_ics_text(content)}")
+        if due_day is not None:
+            write_line(f"DUE;VALUE=DATE:{from_epoch_day(due_day).strftime('%Y%m%d')}")
+        write_line(f"X-TASKTRACK-DAY:{day}")
+        write_line(f"STATUS:{'COMPLETED' if status == 'completed' else 'NEEDS-ACTION'}")
+        write_line("END:VTODO")
+    write_line("END:VCALENDAR")
+
+def _export_row(row):
+    """
+    Turn a (ID, title, content, day, status, due epoch day) row into TASK_FIELDS values.
+    """
+
+    task_id, title, content, day, status, due_day = row
+    due = from_epoch_day(due_day).isoformat() if due_day is not None else ""
+    return (title, content, day, status, due)
+
+def export_tasks(repository, path, file_format=None):
+    """
+    Stream every task in the database to a CSV, JSON Lines or iCalendar file.
+
+    Args:
+        repository (TaskRepository): The repository to export from.
+        path (str): The file to write.
+        file_format (str): 'csv', 'jsonl' or 'ics' (default is taken from the file extension).
+
+    Returns:
+        dict: Number of 'rows' exported, elapsed 'seconds' and 'rows_per_second'.
+    """
+
+    file_format = _file_format(path, file_format)
+    started = time.perf_counter()
+    cursor = repository.connection.execute(
+        "SELECT id, title, COALESCE(note_text(body), ''), day, status, due_day FROM tasks LEFT JOIN task_notes ON task_id = id ORDER BY id"
+    )
+
+    exported = 0
+    def counted(rows):
+        nonlocal exported
+        for row in rows:
+            exported += 1
+            yield row
+
+    with open(path, "w", newline="", encoding="utf-8") as export_file:
+        if file_format == "csv":
+            writer = csv.writer(export_file)
+            writer.writerow(TASK_FIELDS)
+            writer.writerows(_export_row(row) for row in counted(cursor))
+        elif file_format == "jsonl":
+            for row in counted(cursor):
+                export_file.write(json.dumps(dict(zip(TASK_FIELDS, _export_row(row)))) + "\n")
+        else:
+            _write_ics_tasks(export_file, counted(cursor))
+    return _throughput(exported, started)
@@ -0,0 +1,1384 @@
+"""
+Tkinter weekly board. A thin client of TaskRepository: every database call runs on a
+DatabaseExecutor thread and its result is handed back to Tk with after() polling.
+"""
+
+import logging
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+import re
+import time
+
+from .analytics import load_analytics
+from .cards import TaskCardCanvas
+from .dates import day_in_week, from_epoch_day, today_epoch_day, week_start
+from .db import DAYS_OF_WEEK, DEFAULT_DATABASE_PATH
+from .executor import DatabaseExecutor
+from .maintenance import MaintenancePass, logger as maintenance_logger
+from .models import Task
+from .profiling import profiler, traced
+from .reminders import ReminderScheduler
+from .repository import COMPLETED_PAGE_SIZE, HIGHLIGHT_END, HIGHLIGHT_START, SEARCH_PAGE_SIZE, TaskRepository
+
+logger = logging.getLogger("tasktrack.ui")
+
+##################################################  UI UTILITIES  ##################################################
+def center_window(window, width, height):
+    """
+    Center a Tkinter window on the screen.
+    
+    Args:
+        window (tk.Tk or tk.Toplevel): The window to center.
+        width (int): Desired window width.
+        height (int): Desired window height.
+    """
+
+    # Get the screen dimensions
+    screen_width = window.winfo_screenwidth()
+    screen_height = window.winfo_screenheight()
+    
+    # Calculate the position
+    x = (screen_width - width) // 2
+    y = (screen_height - height) // 2
+    
+    # Set the geometry of the window
+    window.geometry(f"{width}x{height}+{x}+{y}")
+
+################################################## WEEKLY VIEW RENDERING ##################################################
+@traced(category="ui")
+def render_weekly_diff(week):
+    """
+    Bring the task cards in line with 'week' by touching only the cards that changed.
+
+    Deleted tasks are erased, new tasks are drawn in place, renamed tasks are relabeled,
+    recolored tasks are refilled and the cards below the first difference in each column are
+    moved. Everything else is left alone.
+
+    Args:
+        week (dict): Maps each day name to a list of (task ID, title, card color) tuples in display order.
+
+    Returns:
+        dict: Number of cards 'inserted', 'deleted', 'moved', 'relabeled' and 'recolored'.
+    """
+
+    touched = {"inserted": 0, "deleted": 0, "moved": 0, "relabeled": 0, "recolored": 0}
+
+    for day, cards in day_cards.items():
+        tasks = [Task(task_id, task_title, day, color=color) for task_id, task_title, color in week.get(day, [])]
+        for task_id in cards.tasks:
+            if task_days.get(task_id) == day:
+                del task_days[task_id]  # Re-added below if the task is still in this column
+
+        for change, count in cards.sync(tasks).items():
+            touched[change] += count
+        for task in tasks:
+            task_days[task.id] = day
+
+    return touched
+
+@traced(category="ui")
+def refresh_weekly_view(on_rendered=None):
+    """
+    Reload the displayed week from the database in the background, then apply only the
+    differences to the task buttons and prefetch the weeks on either side.
+
+    Args:
+        on_rendered (callable): Called on the Tk thread with the number of widgets the refresh
+            touched (see render_weekly_diff).
+    """
+
+    start_day = displayed_week_start
+    writes = board_writes
+    requested_at = time.perf_counter()
+
+    def render(week):
+        if start_day != displayed_week_start:
+            return  # The user has moved to another week since
+        if writes != board_writes:
+            # A local write (an optimistic move, a new task) was submitted after this read, which
+            # may not see it; drawing this week would undo it on the board, so read again behind it
+            refresh_weekly_view(on_rendered)
+            return
+        touched = render_weekly_diff(week)
+        profiler.record("refresh_weekly_view (until rendered)", time.perf_counter() - requested_at, "ui", requested_at)
+        prefetch_adjacent_weeks()
+        if on_rendered is not None:
+            on_rendered(touched)
+
+    run_in_background(TaskRepository.load_tasks_for_week, start_day, read_only=True, on_done=render)
+
+def prefetch_adjacent_weeks():
+    """
+    Load the previous and next weeks in the background so navigating to them is instant.
+    """
+
+    writes = board_writes
+
+    def prefetched(week, start_day):
+        if writes == board_writes:  # Otherwise a write submitted since may have changed the week
+            prefetched_weeks[start_day] = week
+
+    for start_day in (displayed_week_start - 7, displayed_week_start + 7):
+        if start_day not in prefetched_weeks:
+            run_in_background(TaskRepository.load_tasks_for_week, start_day, read_only=True,
+                              on_done=lambda week, start_day=start_day: prefetched(week, start_day))
+
+def show_week(start_day):
+    """
+    Display another week: relabel the columns, draw any prefetched tasks right away and
+    reconcile with the database in the background.
+
+    Args:
+        start_day (int): Epoch day of the week's Sunday.
+    """
+
+    global displayed_week_start
+    displayed_week_start = start_day
+
+    for day in DAYS_OF_WEEK:
+        date_labels[day].config(text=from_epoch_day(day_in_week(day, start_day)).strftime("%m/%d/%Y"))
+    week_label.config(text=f"Week of {from_epoch_day(start_day).strftime('%B %d, %Y')}")
+
+    # Drop prefetched weeks that are no longer next to the displayed one
+    for cached_start in [cached_start for cached_start in prefetched_weeks if abs(cached_start - start_day) > 7]:
+        del prefetched_weeks[cached_start]
+
+    week = prefetched_weeks.pop(start_day, None)
+    if week is not None:
+        render_weekly_diff(week)
+    refresh_weekly_view()
+
+def remove_task_card(task_id):
+    """
+    Erase a task's card from the weekly view. Does nothing if the task isn't on the board.
+
+    Args:
+        task_id (int): The ID of the task.
+    """
+
+    day = task_days.pop(task_id, None)
+    if day is not None:
+        day_cards[day].remove(task_id)
+
+def relabel_task_card(task_id, task_title):
+    """
+    Show a new title on a task's card, if the task is on the board.
+
+    Args:
+        task_id (int): The ID of the task.
+        task_title (str): The new title.
+    """
+
+    day = task_days.get(task_id)
+    if day is not None:
+        day_cards[day].relabel(task_id, task_title)
+
+################################################## SELECTION AND BULK ACTIONS ##################################################
+# Card colors offered by the selection bar (None restores the default)
+CARD_COLORS = ["#F94144", "#F8961E", "#F9C74F", "#90BE6D", "#43AA8B", "#577590", None]
+
+def selected_task_ids():
+    """
+    Returns:
+        list: IDs of the tasks selected in every column.
+    """
+
+    return [task_id for cards in day_cards.values() for task_id in cards.selected]
+
+def clear_selection():
+    """
+    Deselect every card on the board.
+    """
+
+    for cards in day_cards.values():
+        cards.clear_selection()
+
+def update_selection_bar(cards=None):
+    """
+    Show the bulk action bar while any card is selected (the on_select callback of every column).
+    """
+
+    count = len(selected_task_ids())
+    if count:
+        selection_label.config(text=f"{count} task{'s' if count != 1 else ''} selected")
+        selection_bar.grid()
+    else:
+        selection_bar.grid_remove()
+
+def board_week():
+    """
+    Returns:
+        dict: The board as it is drawn, in render_weekly_diff's format.
+    """
+
+    return {day: [(task.id, task.title, task.color) for task in cards.tasks.values()] for day, cards in day_cards.items()}
+
+def _with_tasks_moved(week, task_ids, new_day):
+    """
+    Returns:
+        dict: A copy of 'week' (in render_weekly_diff's format) with the given tasks in 'new_day'.
+    """
+
+    moving = set(task_ids)
+    moved_week = {day: [entry for entry in entries if entry[0] not in moving] for day, entries in week.items()}
+    entries = [entry for day in DAYS_OF_WEEK for entry in week[day] if entry[0] in moving]
+    moved_week[new_day] = sorted(moved_week[new_day] + entries)  # The board shows each day's tasks by ID
+    return moved_week
+
+def _move_and_commit(repository, task_ids, new_day):
+    if len(task_ids) == 1:
+        repository.move_task(task_ids[0], new_day)
+    else:
+        repository.move_tasks(task_ids, new_day)
+    repository.flush()  # The board already shows the move; make sure it is on disk
+
+def move_tasks_optimistically(task_ids, new_day):
+    """
+    Move tasks to another day on the board right away (one diff), persist the move in the
+    background and put the cards back if it fails.
+
+    Args:
+        task_ids (list): IDs of tasks on the board.
+        new_day (str): The day of the week to move them to.
+    """
+
+    origins = {task_id: task_days[task_id] for task_id in task_ids if task_id in task_days}
+    render_weekly_diff(_with_tasks_moved(board_week(), task_ids, new_day))
+
+    def failed(error):
+        week = board_week()
+        for day in DAYS_OF_WEEK:
+            week = _with_tasks_moved(week, [task_id for task_id, origin in origins.items() if origin == day], day)
+        render_weekly_diff(week)
+        messagebox.showerror("Move Failed", f"The tasks could not be moved and were put back: {error}")
+        refresh_weekly_view()  # Reconcile with whatever the database holds
+
+    run_in_background(_move_and_commit, task_ids, new_day, on_done=lambda result: reschedule_reminders(task_ids),
+                      on_error=failed)
+
+def bulk_move(new_day):
+    """
+    Move the selected tasks to another day with one statement.
+
+    Args:
+        new_day (str): The day of the week to move them to.
+    """
+
+    task_ids = selected_task_ids()
+    if task_ids and new_day:
+        move_tasks_optimistically(task_ids, new_day)
+
+################################################## DRAG AND DROP ##################################################
+drag_columns = None  # (day, left, right) screen extents of the columns while a card is dragged
+drop_target = None  # Day column highlighted as the drop target
+
+def column_at(x_root):
+    """
+    Returns:
+        str: The day whose column spans screen x coordinate 'x_root', or None.
+    """
+
+    global drag_columns
+    if drag_columns is None:  # Measured once per drag rather than on every motion event
+        drag_columns = [(day, frame.winfo_rootx(), frame.winfo_rootx() + frame.winfo_width()) for day, frame in day_frames.items()]
+    for day, left, right in drag_columns:
+        if left <= x_root < right:
+            return day
+    return None
+
+def highlight_drop_target(day):
+    """
+    Sink the column a card would be dropped in (None to clear the highlight).
+    """
+
+    global drop_target
+    if day == drop_target:
+        return
+    if drop_target is not None:
+        day_frames[drop_target].config(relief="raised")
+    if day is not None:
+        day_frames[day].config(relief="sunken")
+    drop_target = day
+
+def drag_task(task, x_root, y_root):
+    """
+    Highlight the column under a dragged card (the on_drag callback of every column).
+    """
+
+    day = column_at(x_root)
+    highlight_drop_target(day if day != task.day else None)
+
+def drop_task(task, x_root, y_root):
+    """
+    Move a dropped card, or the whole selection it belongs to, to the column under the pointer.
+    """
+
+    global drag_columns
+    day = column_at(x_root)
+    highlight_drop_target(None)
+    drag_columns = None
+    if day is None or day == task.day:
+        return
+    task_ids = selected_task_ids() if task.id in day_cards[task.day].selected else [task.id]
+    move_tasks_optimistically(task_ids, day)
+
+def _remove_from_board(task_ids):
+    removing = set(task_ids)
+    render_weekly_diff({day: [entry for entry in entries if entry[0] not in removing] for day, entries in board_week().items()})
+    for task_id in task_ids:
+        reminders.cancel(task_id)
+    schedule_next_reminder()
+
+def bulk_complete():
+    """
+    Mark the selected tasks as completed with one statement.
+    """
+
+    task_ids = selected_task_ids()
+    if task_ids:
+        run_in_background(TaskRepository.complete_tasks, task_ids, on_done=lambda result: _remove_from_board(task_ids))
+
+def bulk_delete():
+    """
+    Delete the selected tasks with one statement, after one confirmation.
+    """
+
+    task_ids = selected_task_ids()
+    if task_ids and messagebox.askyesno("Confirm Delete", f"Delete {len(task_ids)} selected tasks? (Ctrl+Z undoes this.)"):
+        run_in_background(TaskRepository.delete_tasks, task_ids, on_done=lambda result: _remove_from_board(task_ids))
+
+def bulk_recolor(color):
+    """
+    Give the selected tasks' cards a color with one statement.
+
+    Args:
+        color (str): The new color, or None for the default.
+    """
+
+    task_ids = selected_task_ids()
+    if not task_ids:
+        return
+
+    def recolored(result):
+        recoloring = set(task_ids)
+        render_weekly_diff({
+            day: [(task_id, task_title, color if task_id in recoloring else task_color)
+                  for task_id, task_title, task_color in entries]
+            for day, entries in board_week().items()
+        })
+
+    run_in_background(TaskRepository.recolor_tasks, task_ids, color, on_done=recolored)
+
+################################################## UNDO ##################################################
+def undo_last_action(event=None):
+    """
+    Undo the most recent action (Ctrl+Z) in the background and redraw the week.
+    """
+
+    run_in_background(TaskRepository.undo, on_done=refresh_after_replay)
+
+def redo_last_action(event=None):
+    """
+    Redo the most recently undone action (Ctrl+Y) in the background and redraw the week.
+    """
+
+    run_in_background(TaskRepository.redo, on_done=refresh_after_replay)
+
+def refresh_after_replay(replayed):
+    """
+    Redraw the week after undo() or redo(), unless there was nothing to replay.
+    """
+
+    if replayed is not None:
+        refresh_weekly_view()
+        reschedule_reminders(replayed[1])
+
+################################################## REMINDERS ##################################################
+# Longest single wait of the reminder timer, so a changed system clock or a resume from sleep
+# is noticed within a minute; waking up once a minute costs nothing measurable
+REMINDER_TIMER_MAX_MS = 60 * 1000
+
+# How long a reminder stays on screen, and how many task titles it lists
+REMINDER_DISPLAY_MS = 15 * 1000
+REMINDER_MAX_TITLES = 5
+
+reminders = ReminderScheduler()
+reminder_timer = None  # ID of the pending after() call, if any
+
+def start_reminders():
+    """
+    Load the reminders of every active task due from today on, then arm the timer.
+    """
+
+    def loaded(rows):
+        reminders.load(rows)
+        schedule_next_reminder()
+
+    run_in_background(TaskRepository.load_upcoming_reminders, reminders.first_due_day(), read_only=True, on_done=loaded)
+
+def schedule_next_reminder():
+    """
+    (Re)arm the one Tk timer for the earliest pending reminder.
+    """
+
+    global reminder_timer
+    if reminder_timer is not None:
+        window.after_cancel(reminder_timer)
+        reminder_timer = None
+    fire_time = reminders.next_fire_time()
+    if fire_time is not None:
+        delay_ms = int((fire_time - time.time()) * 1000)
+        reminder_timer = window.after(min(max(delay_ms, 0), REMINDER_TIMER_MAX_MS), fire_reminders)
+
+@traced(category="ui")
+def fire_reminders():
+    """
+    Show every reminder whose time has come and arm the timer for the next one.
+    """
+
+    global reminder_timer
+    reminder_timer = None
+    due = reminders.pop_due()
+    if due:
+        show_reminder([task_title for task_id, task_title in due])
+    schedule_next_reminder()
+
+def show_reminder(task_titles):
+    """
+    Pop up a small window listing tasks that are due; it closes itself after a while.
+
+    Args:
+        task_titles (list): Titles of the tasks to remind the user of.
+    """
+
+    popup = tk.Toplevel(window, bg="#6A7F8C", padx=15, pady=10)
+    popup.title("TaskTrack Reminder")
+    popup.attributes("-topmost", True)
+    tk.Label(popup, text="Due today:", font=("Montserrat", 12, "bold"), bg="#6A7F8C", fg="white").pack(anchor="w")
+    for task_title in task_titles[:REMINDER_MAX_TITLES]:
+        tk.Label(popup, text=task_title, font=("Roboto", 10), bg="#6A7F8C", fg="white", wraplength=300,
+                 justify="left").pack(anchor="w")
+    if len(task_titles) > REMINDER_MAX_TITLES:
+        tk.Label(popup, text=f"...and {len(task_titles) - REMINDER_MAX_TITLES} more", font=("Roboto", 10, "italic"),
+                 bg="#6A7F8C", fg="white").pack(anchor="w")
+    tk.Button(popup, text="Dismiss", command=popup.destroy).pack(pady=(10, 0))
+    popup.after(REMINDER_DISPLAY_MS, popup.destroy)
+    window.bell()
+
+def schedule_reminder(task_id, task_title, due_day):
+    """
+    Add or move the reminder of a task that was just created or moved (or drop it, if the task
+    is now due in the past; see ReminderScheduler.first_due_day).
+
+    Args:
+        task_id (int): The ID of the task.
+        task_title (str): The title of the task.
+        due_day (int): Epoch day the task is due.
+    """
+
+    reminders.schedule(task_id, task_title, due_day)
+    schedule_next_reminder()
+
+def cancel_reminder(task_id):
+    """
+    Drop the reminder of a task that was completed or deleted.
+
+    Args:
+        task_id (int): The ID of the task.
+    """
+
+    reminders.cancel(task_id)
+    schedule_next_reminder()
+
+def reschedule_reminders(task_ids):
+    """
+    Re-read the due days of tasks changed in ways the UI can't predict (edits, undo, redo)
+    and update their reminders.
+
+    Args:
+        task_ids (list): The IDs of the tasks.
+    """
+
+    def loaded(rows):
+        reminders.refresh(task_ids, rows)
+        schedule_next_reminder()
+
+    run_in_background(TaskRepository.load_reminders, task_ids, reminders.first_due_day(), read_only=True, on_done=loaded)
+
+################################################## MAINTENANCE ##################################################
+# A maintenance pass starts once the user has been idle this long, at most once per interval,
+# and pauses (between steps) whenever they come back
+MAINTENANCE_IDLE_MS = 60 * 1000
+MAINTENANCE_INTERVAL_MS = 24 * 60 * 60 * 1000
+
+maintenance_pass = None  # The pass in progress, if any
+maintenance_due_at = 0.0  # time.monotonic() after which the next pass may start
+last_input_at = time.monotonic()
+
+def note_user_input(event=None):
+    """
+    Remember when the user last pressed a key, clicked or moved the mouse.
+    """
+
+    global last_input_at
+    last_input_at = time.monotonic()
+
+def check_maintenance():
+    """
+    Run the next maintenance step if the user is idle and a pass is due; otherwise check again
+    when that could have changed.
+    """
+
+    global maintenance_pass
+    now = time.monotonic()
+    wait_ms = max(MAINTENANCE_IDLE_MS - (now - last_input_at) * 1000, (maintenance_due_at - now) * 1000)
+    if wait_ms > 0:
+        window.after(int(wait_ms) + 1, check_maintenance)
+        return
+    if maintenance_pass is None:
+        maintenance_pass = MaintenancePass()
+    run_in_background(maintenance_pass.step, read_only=maintenance_pass.read_only,
+                      on_done=maintenance_step_done, on_error=maintenance_failed)
+
+def maintenance_step_done(more):
+    """
+    Continue the pass, or (once it is over) schedule the next one.
+    """
+
+    global maintenance_pass, maintenance_due_at
+    if not more:
+        maintenance_pass = None
+        maintenance_due_at = time.monotonic() + MAINTENANCE_INTERVAL_MS / 1000
+    check_maintenance()
+
+def maintenance_failed(error):
+    """
+    Drop a failed pass without bothering the user; the next one starts after the usual interval.
+    """
+
+    maintenance_logger.warning("Maintenance failed: %s", error)
+    maintenance_step_done(False)
+
+################################################## BACKGROUND RESULTS ##################################################
+# How often the Tk thread checks for finished database jobs
+BACKGROUND_POLL_MS = 15
+
+background_jobs = []  # (future, on_done, on_error) waiting to be handed back to the Tk thread
+board_writes = 0  # Writes submitted so far; a read requested before the latest one may not see it
+
+def run_in_background(function, *args, read_only=False, on_done=None, on_error=None):
+    """
+    Run a repository operation on the database executor and hand its result back to the Tk thread.
+
+    Args:
+        function (callable): Called as function(repository, *args), e.g. TaskRepository.save_task.
+        *args: Arguments for the operation.
+        read_only (bool): Whether the operation only queries (and may run on the read-only pool).
+        on_done (callable): Called on the Tk thread with the operation's return value.
+        on_error (callable): Called on the Tk thread with the exception if the operation fails
+            (default is an error dialog).
+
+    Returns:
+        concurrent.futures.Future: The pending result.
+    """
+
+    global board_writes
+    if not read_only:
+        board_writes += 1
+        prefetched_weeks.clear()  # A write may change any week
+    submit = db_executor.submit_read if read_only else db_executor.submit
+    future = submit(function, *args)
+    background_jobs.append((future, on_done, on_error))
+    return future
+
+def poll_background_jobs():
+    """
+    Deliver finished database results to their callbacks; reschedules itself with 'after'.
+    A callback that raises is logged and skipped, so it can't stop the delivery of the others.
+    """
+
+    window.after(BACKGROUND_POLL_MS, poll_background_jobs)  # First, so nothing below can stop polling
+
+    finished = [job for job in background_jobs if job[0].done()]
+    for job in finished:
+        background_jobs.remove(job)
+        future, on_done, on_error = job
+        try:
+            try:
+                result = future.result()
+            except Exception as error:
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    messagebox.showerror("Database Error", f"The database operation failed: {error}")
+                continue
+            if on_done is not None:
+                on_done(result)
+        except Exception:
+            logger.exception("A background job's callback failed")
+
+################################################## TEXT EDITOR WINDOW ##################################################
+@traced(category="ui")
+def open_text_editor(task_title, task_id=None, day=None, status="not-complete"):
+    editor_window = tk.Toplevel()
+    editor_window.title(f"Editing Task - {task_title}")
+    center_window(editor_window, 400, 450)
+
+    frame = tk.Frame(editor_window, relief=tk.RAISED, bd=1, bg="white")
+    frame.pack(side="top", fill="x")
+
+    title_var = tk.StringVar(value=task_title)  # For managing title changes
+    day_var = tk.StringVar(value=day)  # For managing the day of the week
+
+    # Title section
+    title_frame = tk.Frame(frame, bg="white")
+    title_frame.pack(side="top", fill="x", pady=5)
+
+    tk.Label(title_frame, text="Title:", bg="white", fg="#6A7F8C", font=("Montserrat", 12, "bold")).pack(side="left", padx=5)
+    title_entry = tk.Entry(title_frame, textvariable=title_var, font=("Montserrat", 12))
+    title_entry.pack(side="left", padx=5, fill="x", expand=True)
+
+    # "Move to Day" section, centered
+    day_frame = tk.Frame(frame, bg="white")
+    day_frame.pack(side="top", fill="x", pady=5)
+
+    day_label = tk.Label(day_frame, text="Move to Day:", bg="white", fg="#6A7F8C", font=("Montserrat", 10, "bold"))
+    day_label.grid(row=0, column=0, padx=5, pady=5, sticky="e")
+
+    day_dropdown = tk.OptionMenu(day_frame, day_var, "Monday", "Tuesday", "Wednesday", 
+                                  "Thursday", "Friday", "Saturday", "Sunday")
+    day_dropdown.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+
+    # Center the "Move to Day" section
+    day_frame.grid_columnconfigure(0, weight=1)
+    day_frame.grid_columnconfigure(1, weight=1)
+
+    # Text editor for task content
+    text_edit = tk.Text(editor_window, font="Roboto 12")
+    text_edit.pack(expand=True, fill="both", padx=10, pady=10)
+
+    # Action buttons, centered
+    button_frame = tk.Frame(frame, bg="white")
+    button_frame.pack(side="top", fill="x", pady=5)
+
+    button_save = tk.Button(button_frame, text="Save", command=lambda: save_content())
+    button_save.grid(row=0, column=0, padx=5)
+
+    button_delete = tk.Button(button_frame, text="Delete", command=lambda: delete_content())
+    button_delete.grid(row=0, column=1, padx=5)
+
+    button_complete = tk.Button(button_frame, text="Mark as Completed", command=lambda: mark_as_completed())
+    button_complete.grid(row=0, column=2, padx=5)
+
+    # Center the buttons
+    button_frame.grid_columnconfigure(0, weight=1)
+    button_frame.grid_columnconfigure(1, weight=1)
+    button_frame.grid_columnconfigure(2, weight=1)
+
+    def save_content():
+        new_title = title_var.get().strip()
+        new_day = day_var.get()
+        content = text_edit.get("1.0", tk.END).strip()
+
+        if not new_title:
+            messagebox.showwarning("Missing Title", "Please provide a task title.")
+            return
+
+        def saved(new_task_id=None):
+            nonlocal task_id
+            if task_id is None:
+                task_id = new_task_id
+                schedule_reminder(task_id, new_title, day_in_week(new_day, displayed_week_start))
+            else:
+                if task_days.get(task_id, new_day) != new_day:
+                    # Handle UI changes for moving a task shown in the displayed week
+                    remove_task_card(task_id)
+                    create_task_card(new_title, task_id, new_day)
+                else:
+                    relabel_task_card(task_id, new_title)
+                reschedule_reminders([task_id])  # The title or due day may have changed
+
+            messagebox.showinfo("Saved", f"Task '{new_title}' saved!")
+            editor_window.destroy()
+
+        if task_id is None:  # New task
+            run_in_background(TaskRepository.save_task, new_title, content, new_day,
+                              day_in_week(new_day, displayed_week_start), on_done=saved)
+        else:  # Update existing task
+            run_in_background(TaskRepository.update_task, task_id, new_title, new_day, content, on_done=saved)
+
+    def delete_content():
+        if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete the task '{task_title}'?"):
+            def deleted(result):
+                remove_task_card(task_id)
+                cancel_reminder(task_id)
+                messagebox.showinfo("Deleted", f"Task '{task_title}' deleted!")
+                editor_window.destroy()
+
+            run_in_background(TaskRepository.delete_task, task_id, on_done=deleted)
+
+    def mark_as_completed():
+        if messagebox.askyesno("Mark as Completed", f"Mark task '{task_title}' as completed?"):
+            def completed(result):
+                # Removes the task button from the weekly view
+                remove_task_card(task_id)
+                cancel_reminder(task_id)
+                messagebox.showinfo("Task Marked as Completed", f"Task '{task_title}' has been marked as completed!")
+                editor_window.destroy()
+
+            run_in_background(TaskRepository.complete_task, task_id, on_done=completed)
+
+    def fill_content(content):
+        if content and text_edit.winfo_exists():
+            text_edit.insert("1.0", content)
+
+    # Pre-fill the content if the task exists
+    if task_id is not None:
+        run_in_background(TaskRepository.load_task_content, task_id, read_only=True, on_done=fill_content)
+
+################################################## TASK CREATION ##################################################
+@traced(category="ui")
+def create_task_card(task_title, task_id, day, status="not-completed"):
+    """
+    Draws a card for a task at the bottom of its day's column; clicking it opens the editor.
+
+    Args:
+        task_title (str): The title of the task.
+        task_id (int): The ID of the task.
+        day (str): The day the task is assigned to.
+        status (str): The current status of the task (default is 'not-completed').
+    """
+
+    day_cards[day].add(Task(task_id, task_title, day, status))
+    task_days[task_id] = day
+
+def open_task_card(task):
+    """
+    Open the editor for a clicked card (the one click handler every card column shares).
+    A plain click also ends any multi-selection.
+
+    Args:
+        task (Task): The task on the card.
+    """
+
+    clear_selection()
+    open_text_editor(task.title, task.id, task.day, task.status)
+
+#function for creating task form
+def add_task():
+    # Create a pop-up window
+    task_window = tk.Toplevel(window)
+    task_window.title("Creating a Task")
+    center_window(task_window, 300, 200)
+    
+    # Task Title Label and Entry
+    tk.Label(task_window, text="Task Title:").pack(pady=5)
+    task_title_entry = tk.Entry(task_window, width=25)
+    task_title_entry.pack(pady=5)
+    
+    # Day Selection Label and Combobox
+    tk.Label(task_window, text="Select Day:").pack(pady=5)
+    day_selector = ttk.Combobox(task_window, values=list(day_frames.keys()), state="readonly")
+    day_selector.pack(pady=5)
+    
+    # Function to handle task creation
+    @traced("submit_task", "ui")
+    def submit_task():
+        task_title = task_title_entry.get().strip()
+        day = day_selector.get().strip()
+        
+        if not task_title:
+            messagebox.showwarning("Missing Title", "Please enter a task title.")
+            return
+        
+        if not day:
+            messagebox.showwarning("Missing Day", "Please select a day.")
+            return
+        
+        def saved(new_task_id):
+            create_task_card(task_title, new_task_id, day)  # Draw the task's card in the selected day's column
+            schedule_reminder(new_task_id, task_title, day_in_week(day, displayed_week_start))
+            messagebox.showinfo("Task Created", f"Task '{task_title}' added to {day}!")
+            task_window.destroy()  # Close the pop-up form
+
+        # Save the task to the database in the background
+        run_in_background(TaskRepository.save_task, task_title, "", day, day_in_week(day, displayed_week_start),
+                          on_done=saved)
+
+    # Submit Button
+    tk.Button(task_window, text="Create Task", command=submit_task).pack(pady=15)
+
+# Height of one row in the completed tasks window, and how many rows to keep beyond the viewport
+COMPLETED_ROW_HEIGHT = 36
+COMPLETED_ROW_BUFFER = 5
+
+# Pop up window to view and access completed tasks
+def completed_task_menu():
+    """
+    Show the completed tasks in a virtualized list.
+
+    Only the rows in the visible viewport (plus a small buffer) have widgets; those widgets are
+    recycled as the user scrolls. Rows are paged in from the database as they come into view,
+    and a task's content is only loaded when it is opened.
+    """
+
+    total_tasks = 0
+    loaded_tasks = []  # (ID, title, day) for every row paged in so far
+    more_to_load = True
+    page_loading = False
+
+    # Create a new popup window to display completed tasks
+    completed_window = tk.Toplevel()
+    completed_window.title("Completed Tasks")
+    center_window(completed_window, 400, 400)
+
+    # Create a scrollbar and a canvas to hold the visible rows
+    scroll_frame = tk.Frame(completed_window)
+    scroll_frame.pack(expand=True, fill="both")
+
+    canvas = tk.Canvas(scroll_frame)
+    canvas.pack(side="left", fill="both", expand=True)
+
+    scrollbar = tk.Scrollbar(scroll_frame, orient="vertical", command=lambda *args: scroll(*args))
+    scrollbar.pack(side="right", fill="y")
+
+    canvas.configure(yscrollcommand=scrollbar.set, yscrollincrement=COMPLETED_ROW_HEIGHT)
+
+    row_slots = []  # Recycled (canvas item, button) pairs
+    slot_rows = []  # Row index currently shown by each slot
+
+    def counted(count):
+        nonlocal total_tasks
+        total_tasks = count
+        if completed_window.winfo_exists():
+            canvas.config(scrollregion=(0, 0, 0, total_tasks * COMPLETED_ROW_HEIGHT))
+            render_visible_rows()
+
+    def request_rows_through(row_index):
+        nonlocal page_loading
+        if page_loading or not more_to_load or len(loaded_tasks) > row_index:
+            return
+        page_loading = True
+        after_id = loaded_tasks[-1][0] if loaded_tasks else 0
+        run_in_background(TaskRepository.load_completed_tasks, after_id, read_only=True, on_done=page_loaded)
+
+    def page_loaded(page):
+        nonlocal page_loading, more_to_load
+        page_loading = False
+        loaded_tasks.extend(page)
+        more_to_load = len(page) == COMPLETED_PAGE_SIZE
+        if completed_window.winfo_exists():
+            render_visible_rows()  # Requests the next page if the viewport still needs one
+
+    def open_slot(slot):
+        task_id, task_title, task_day = loaded_tasks[slot_rows[slot]]
+        open_text_editor(task_title, task_id, task_day, "completed")
+
+    def render_visible_rows(event=None):
+        top = canvas.canvasy(0)
+        first_row = max(0, int(top // COMPLETED_ROW_HEIGHT) - COMPLETED_ROW_BUFFER)
+        last_row = min(total_tasks - 1, int((top + canvas.winfo_height()) // COMPLETED_ROW_HEIGHT) + COMPLETED_ROW_BUFFER)
+        request_rows_through(last_row)
+        last_row = min(last_row, len(loaded_tasks) - 1)
+        width = canvas.winfo_width() - 20
+
+        for slot, row_index in enumerate(range(first_row, last_row + 1)):
+            if slot == len(row_slots):
+                task_button = tk.Button(canvas, command=lambda slot=slot: open_slot(slot))
+                item = canvas.create_window(10, 0, window=task_button, anchor="nw")
+                row_slots.append((item, task_button))
+                slot_rows.append(None)
+
+            item, task_button = row_slots[slot]
+            if slot_rows[slot] != row_index:
+                slot_rows[slot] = row_index
+                task_id, task_title, task_day = loaded_tasks[row_index]
+                task_button.config(text=f"{task_title} - {task_day}")
+                canvas.coords(item, 10, row_index * COMPLETED_ROW_HEIGHT + 3)
+            canvas.itemconfigure(item, state="normal", width=width, height=COMPLETED_ROW_HEIGHT - 6)
+
+        # Hide any slots not needed for the current viewport
+        for slot in range(max(0, last_row - first_row + 1), len(row_slots)):
+            canvas.itemconfigure(row_slots[slot][0], state="hidden")
+            slot_rows[slot] = None
+
+    def scroll(*args):
+        canvas.yview(*args)
+        render_visible_rows()
+
+    def on_mousewheel(event):
+        scroll("scroll", -1 if event.delta > 0 else 1, "units")
+
+    canvas.bind("<Configure>", render_visible_rows)
+    canvas.bind("<MouseWheel>", on_mousewheel)
+    canvas.bind("<Button-4>", lambda e: scroll("scroll", -1, "units"))
+    canvas.bind("<Button-5>", lambda e: scroll("scroll", 1, "units"))
+
+    run_in_background(TaskRepository.count_completed_tasks, read_only=True, on_done=counted)
+
+################################################## SEARCH WINDOW ##################################################
+# Wait this long after the last keystroke before searching, and show at most this many results
+SEARCH_DEBOUNCE_MS = 150
+SEARCH_MAX_RESULTS = 500
+
+def _insert_highlighted(text_widget, marked_text, tags):
+    """
+    Insert text containing HIGHLIGHT_START/HIGHLIGHT_END markers, tagging the marked words as 'match'.
+    """
+
+    highlighted = False
+    for piece in re.split(f"([{HIGHLIGHT_START}{HIGHLIGHT_END}])", marked_text):
+        if piece == HIGHLIGHT_START or piece == HIGHLIGHT_END:
+            highlighted = piece == HIGHLIGHT_START
+        elif piece:
+            text_widget.insert(tk.END, piece, tags + (("match",) if highlighted else ()))
+
+def search_task_menu():
+    """
+    Search task titles and notes as the user types.
+
+    Each search is one query on the read-only database pool that reads every result from one
+    cursor: ranking the matches is what costs, and asking for each page separately ranked them
+    all again. The results are then drawn one page at a time, so the window stays responsive.
+    Results from a search the user has since typed past are thrown away.
+    """
+
+    search_window = tk.Toplevel()
+    search_window.title("Search Tasks")
+    center_window(search_window, 500, 450)
+
+    query_var = tk.StringVar()
+    search_entry = tk.Entry(search_window, textvariable=query_var, font=("Montserrat", 12))
+    search_entry.pack(side="top", fill="x", padx=10, pady=10)
+    search_entry.focus_set()
+
+    status_label = tk.Label(search_window, text="Type to search task titles and notes.", fg="#6A7F8C", anchor="w")
+    status_label.pack(side="top", fill="x", padx=10)
+
+    results = tk.Text(search_window, wrap="word", cursor="arrow", font=("Roboto", 10), state="disabled")
+    results.pack(expand=True, fill="both", padx=10, pady=10)
+    results.tag_configure("title", font=("Roboto", 11, "bold"), foreground="#6A7F8C")
+    results.tag_configure("details", foreground="gray40")
+    results.tag_configure("match", background="#F9C74F")
+
+    search_generation = 0  # Bumped on every new search so stale pages are ignored
+    pending_search = None
+    shown_results = 0
+    search_started = 0.0
+
+    def schedule_search(*args):
+        nonlocal pending_search
+        if pending_search is not None:
+            search_window.after_cancel(pending_search)
+        pending_search = search_window.after(SEARCH_DEBOUNCE_MS, start_search)
+
+    def start_search():
+        nonlocal search_generation, pending_search, shown_results, search_started
+        pending_search = None
+        search_generation += 1
+        shown_results = 0
+        search_started = time.perf_counter()
+        results.config(state="normal")
+        results.delete("1.0", tk.END)
+        results.config(state="disabled")
+
+        text = query_var.get()
+        if not text.strip():
+            status_label.config(text="Type to search task titles and notes.")
+            return
+        status_label.config(text="Searching...")
+        generation = search_generation
+        run_in_background(TaskRepository.search_tasks, text, SEARCH_MAX_RESULTS, read_only=True,
+                          on_done=lambda rows: show_page(generation, rows, 0))
+
+    def show_page(generation, rows, offset):
+        nonlocal shown_results
+        if generation != search_generation or not search_window.winfo_exists():
+            return  # The user has typed something else (or closed the window) since
+
+        page = rows[offset:offset + SEARCH_PAGE_SIZE]
+        results.config(state="normal")
+        for task_id, marked_title, marked_snippet, task_day, task_status in page:
+            result_tag = f"result-{task_id}"
+            task_title = marked_title.replace(HIGHLIGHT_START, "").replace(HIGHLIGHT_END, "")
+            _insert_highlighted(results, marked_title, ("title", result_tag))
+            completed_note = " (completed)" if task_status == "completed" else ""
+            results.insert(tk.END, f"  {task_day}{completed_note}\n", ("details", result_tag))
+            if marked_snippet:
+                _insert_highlighted(results, marked_snippet + "\n", ("details", result_tag))
+            results.insert(tk.END, "\n")
+            results.tag_bind(result_tag, "<Button-1>",
+                             lambda e, task_id=task_id, task_title=task_title, task_day=task_day, task_status=task_status:
+                             open_text_editor(task_title, task_id, task_day, task_status))
+        results.config(state="disabled")
+
+        shown_results += len(page)
+        elapsed_ms = (time.perf_counter() - search_started) * 1000
+        status_label.config(text=f"{shown_results} result{'s' if shown_results != 1 else ''} in {elapsed_ms:.0f} ms")
+
+        # Draw the next page once this one is on screen
+        if offset + len(page) < len(rows):
+            search_window.after_idle(show_page, generation, rows, offset + len(page))
+
+    query_var.trace_add("write", schedule_search)
+
+################################################## ANALYTICS WINDOW ##################################################
+# Size of one day's cell in the workload heatmap, and the color of the busiest day
+HEATMAP_CELL = 18
+HEATMAP_COLOR = (0xF9, 0x41, 0x44)
+
+def _percent(rate):
+    return f"{rate:.0%}" if rate is not None else "-"
+
+def _heat_color(count, busiest):
+    """
+    Blend from white (no tasks) to HEATMAP_COLOR (the busiest day).
+    """
+
+    share = count / busiest if busiest else 0
+    return "#" + "".join(f"{round(255 - (255 - channel) * share):02X}" for channel in HEATMAP_COLOR)
+
+def analytics_menu():
+    """
+    Show completion rates per week, day and course, the overdue count and a workload heatmap.
+
+    The statistics are computed on the read-only database pool (see tasktrack.analytics) and
+    reused until a task changes, so reopening the window is instant.
+    """
+
+    analytics_window = tk.Toplevel()
+    analytics_window.title("Task Analytics")
+    center_window(analytics_window, 640, 520)
+
+    summary_label = tk.Label(analytics_window, text="Computing statistics...", anchor="w", justify="left",
+                             font=("Roboto", 11, "bold"), fg="#6A7F8C")
+    summary_label.pack(side="top", fill="x", padx=10, pady=5)
+
+    notebook = ttk.Notebook(analytics_window)
+    notebook.pack(side="top", fill="both", expand=True, padx=10, pady=(0, 10))
+
+    def add_table(title, headings):
+        frame = tk.Frame(notebook)
+        table = ttk.Treeview(frame, columns=headings[1:])
+        table.heading("#0", text=headings[0])
+        table.column("#0", width=160)
+        for column in headings[1:]:
+            table.heading(column, text=column)
+            table.column(column, width=90, anchor="e")
+        scrollbar = tk.Scrollbar(frame, orient="vertical", command=table.yview)
+        table.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        table.pack(side="left", fill="both", expand=True)
+        notebook.add(frame, text=title)
+        return table
+
+    week_table = add_table("By Week", ("Week of", "Tasks", "Completed", "Rate"))
+    day_table = add_table("By Day", ("Day", "Tasks", "Completed", "Rate"))
+    course_table = add_table("By Course", ("Course", "Tasks", "Completed", "Rate", "Overdue"))
+
+    heatmap_frame = tk.Frame(notebook)
+    heatmap = tk.Canvas(heatmap_frame, bg="white", highlightthickness=0)
+    heatmap_scrollbar = tk.Scrollbar(heatmap_frame, orient="vertical", command=heatmap.yview)
+    heatmap.configure(yscrollcommand=heatmap_scrollbar.set)
+    heatmap_scrollbar.pack(side="right", fill="y")
+    heatmap.pack(side="left", fill="both", expand=True)
+    notebook.add(heatmap_frame, text="Workload")
+
+    @traced("render_analytics", "ui")
+    def render(analytics):
+        if not analytics_window.winfo_exists():
+            return
+        summary_label.config(text=(
+            f"{analytics['total']} tasks, {_percent(analytics['completion_rate'])} completed, "
+            f"{analytics['overdue']} overdue"
+        ))
+
+        for week, total, completed, rate in reversed(analytics["weeks"]):
+            week_table.insert("", tk.END, text=from_epoch_day(week).strftime("%m/%d/%Y"),
+                              values=(total, completed, _percent(rate)))
+        for day, total, completed, rate in reversed(analytics["days"]):
+            day_table.insert("", tk.END, text=from_epoch_day(day).strftime("%a %m/%d/%Y"),
+                             values=(total, completed, _percent(rate)))
+        for course, total, completed, rate, overdue in analytics["courses"]:
+            course_table.insert("", tk.END, text=course or "(no course)",
+                                values=(total, completed, _percent(rate), overdue))
+
+        # Workload heatmap: one row per week, one column per weekday, shaded by tasks due
+        counts = analytics["heatmap"]["counts"]
+        busiest = max((max(week) for week in counts), default=0)
+        left = 90
+        for weekday, day in enumerate(DAYS_OF_WEEK):
+            heatmap.create_text(left + (weekday + 0.5) * HEATMAP_CELL, HEATMAP_CELL / 2, text=day[0], font=("Roboto", 9))
+        for week_index, week in enumerate(counts):
+            top = (week_index + 1) * HEATMAP_CELL
+            week_of = from_epoch_day(analytics["heatmap"]["first_week"] + 7 * week_index)
+            heatmap.create_text(left - 5, top + HEATMAP_CELL / 2, text=week_of.strftime("%m/%d/%Y"), anchor="e",
+                                font=("Roboto", 9))
+            for weekday, count in enumerate(week):
+                heatmap.create_rectangle(left + weekday * HEATMAP_CELL, top, left + (weekday + 1) * HEATMAP_CELL,
+                                         top + HEATMAP_CELL, fill=_heat_color(count, busiest), outline="white")
+        heatmap.configure(scrollregion=(0, 0, left + 7 * HEATMAP_CELL, (len(counts) + 1) * HEATMAP_CELL))
+
+    run_in_background(load_analytics, read_only=True, on_done=render)
+
+################################################## PERFORMANCE OVERLAY ##################################################
+# How often the event loop's responsiveness is sampled, and how often the overlay refreshes
+EVENT_LOOP_PROBE_MS = 100
+OVERLAY_REFRESH_MS = 1000
+
+performance_window = None
+
+def probe_event_loop(scheduled_at=None):
+    """
+    Record how late Tk ran this timer callback (the event-loop lag) and schedule the next probe.
+
+    Args:
+        scheduled_at (float): time.perf_counter() when the probe was scheduled.
+    """
+
+    now = time.perf_counter()
+    if scheduled_at is not None:
+        lag = now - scheduled_at - EVENT_LOOP_PROBE_MS / 1000
+        profiler.record("tk event loop lag", max(lag, 0.0), "tk", now - max(lag, 0.0))
+    window.after(EVENT_LOOP_PROBE_MS, probe_event_loop, now)
+
+def count_widgets(widget):
+    """
+    Returns:
+        int: Number of widgets in the tree under 'widget', including itself.
+    """
+
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+def performance_overlay(event=None):
+    """
+    Open (or raise) the debug window with per-operation p50/p99 latencies, widget counts and
+    a Chrome-trace export. Bound to F12 on the main window.
+    """
+
+    global performance_window
+    if performance_window is not None and performance_window.winfo_exists():
+        performance_window.lift()
+        return
+
+    performance_window = tk.Toplevel(window)
+    performance_window.title("Performance")
+    center_window(performance_window, 640, 420)
+
+    summary_label = tk.Label(performance_window, anchor="w", justify="left", font=("Roboto", 10))
+    summary_label.pack(side="top", fill="x", padx=10, pady=5)
+
+    columns = ("count", "p50", "p99", "max")
+    table = ttk.Treeview(performance_window, columns=columns)
+    table.heading("#0", text="Operation")
+    table.column("#0", width=300)
+    for column, heading in zip(columns, ("Calls", "p50 (ms)", "p99 (ms)", "Max (ms)")):
+        table.heading(column, text=heading)
+        table.column(column, width=70, anchor="e")
+    table.pack(side="top", fill="both", expand=True, padx=10)
+
+    def export_trace():
+        path = filedialog.asksaveasfilename(parent=performance_window, defaultextension=".json",
+                                            filetypes=[("Chrome trace", "*.json")])
+        if path:
+            spans = profiler.export_chrome_trace(path)
+            messagebox.showinfo("Trace Exported", f"Wrote {spans} spans to {path}.", parent=performance_window)
+
+    tk.Button(performance_window, text="Export Chrome Trace...", command=export_trace).pack(side="left", padx=10, pady=10)
+    tk.Button(performance_window, text="Reset", command=profiler.reset).pack(side="left", pady=10)
+
+    def refresh():
+        if not performance_window.winfo_exists():
+            return
+        task_cards = sum(len(cards) for cards in day_cards.values())
+        cache = db_executor.cache
+        summary_label.config(text=(
+            f"Widgets: {count_widgets(window)} in total, {task_cards} task cards"
+            f"    Record cache: {cache.hits} hits, {cache.misses} misses"
+        ))
+
+        table.delete(*table.get_children())
+        statistics = profiler.statistics()
+        for name in sorted(statistics, key=lambda name: statistics[name]["p99_ms"], reverse=True):
+            row = statistics[name]
+            table.insert("", tk.END, text=f"[{row['category']}] {name}", values=(
+                row["count"], f"{row['p50_ms']:.2f}", f"{row['p99_ms']:.2f}", f"{row['max_ms']:.2f}"
+            ))
+        performance_window.after(OVERLAY_REFRESH_MS, refresh)
+
+    refresh()
+
+################################################## MAIN MENU ##################################################
+def initialize_weekly_view(database_path=DEFAULT_DATABASE_PATH):
+    """
+    Open the weekly board on the given database and run the Tk main loop until it is closed.
+
+    Args:
+        database_path (str): Location of the task database.
+    """
+
+    global window, day_frames, day_cards, task_days, date_labels, db_executor, selection_bar, selection_label
+    global displayed_week_start, prefetched_weeks, week_label
+    db_executor = DatabaseExecutor(database_path)
+    window = tk.Tk()
+    window.title("TaskTrack")
+    center_window(window, 1150, 900)
+
+    # Header frame for the title and subtitle
+    header_frame = tk.Frame(window, bg="#6A7F8C", pady=10)
+    header_frame.grid(row=0, column=0, columnspan=7, sticky="nsew")
+
+    # Title label
+    title_label = tk.Label(
+        header_frame,
+        text="Welcome to TaskTrack!",
+        font=("Montserrat", 25, "bold"),
+        bg="#6A7F8C",
+        fg="white"
+    )
+    title_label.pack()
+
+    # Subtitle label
+    subtitle_label = tk.Label(
+        header_frame,
+        text="FastTrack with TaskTrack and manage all your tasks with ease.",
+        font=("Roboto", 10, "italic"),
+        bg="#6A7F8C",
+        fg="white"
+    )
+    subtitle_label.pack()
+
+    # Week navigation
+    navigation_frame = tk.Frame(header_frame, bg="#6A7F8C")
+    navigation_frame.pack(pady=(5, 0))
+    tk.Button(navigation_frame, text="< Previous Week", command=lambda: show_week(displayed_week_start - 7)).pack(side="left", padx=10)
+    week_label = tk.Label(navigation_frame, font=("Roboto", 11, "bold"), bg="#6A7F8C", fg="white", width=28)
+    week_label.pack(side="left")
+    tk.Button(navigation_frame, text="Next Week >", command=lambda: show_week(displayed_week_start + 7)).pack(side="left", padx=10)
+
+    # Ensure header row resizes proportionally
+    window.grid_rowconfigure(0, weight=0)
+
+    # Initialize dictionaries to store each day's column, date label and task cards, and the
+    # day each task on the board is shown in, so any task's card is found by ID alone
+    days_of_week = DAYS_OF_WEEK
+    day_frames = {}
+    date_labels = {}
+    day_cards = {}
+    task_days = {}
+
+    # Start on the current week (Sunday to Saturday); adjacent weeks are prefetched into prefetched_weeks
+    displayed_week_start = week_start(today_epoch_day())
+    prefetched_weeks = {}
+    day_colors = {
+        "Sunday": "#F94144",
+        "Monday": "#F3722C",
+        "Tuesday": "#F8961E",
+        "Wednesday": "#F9C74F",
+        "Thursday": "#90BE6D",
+        "Friday": "#43AA8B",
+        "Saturday": "#577590"
+    }
+
+    for i, day in enumerate(days_of_week):
+        frame = tk.Frame(window, borderwidth=2, relief="raised", padx=10, pady=10)
+        frame.grid(row=1, column=i, sticky="nsew", padx=5, pady=5)
+        day_frames[day] = frame
+
+        # Set background color
+        frame.configure(bg=day_colors[day])
+
+        # Label for the day (show_week fills in the date)
+        # Clicking the day's name selects all of its cards
+        day_label = tk.Label(frame, text=day, font=("Montserrat", 15, "bold"), fg="white", bg=day_colors[day], cursor="hand2")
+        day_label.pack()
+        day_label.bind("<Button-1>", lambda e, day=day: day_cards[day].select_all())
+        date_label = tk.Label(frame, font=("Roboto", 10), fg="white", bg=day_colors[day])
+        date_label.pack()
+        date_labels[day] = date_label
+
+        # The day's tasks, drawn as cards on one canvas
+        cards = TaskCardCanvas(frame, day_colors[day], open_task_card, on_select=update_selection_bar,
+                               on_drag=drag_task, on_drop=drop_task)
+        cards.canvas.pack(fill="both", expand=True, pady=(5, 0))
+        day_cards[day] = cards
+
+        # setup the "Create New Task" button and "View Completed Tasks" button on the same row
+        add_task_button = tk.Button(window, text="Create New Task", command=add_task, width=20)
+        add_task_button.grid(row=2, column=1, columnspan=2, pady=10, padx=10)
+
+        completed_button = tk.Button(window, text="View Completed Tasks", command=completed_task_menu, width=20)
+        completed_button.grid(row=2, column=4, columnspan=2, pady=10, padx=10)
+
+    search_button = tk.Button(window, text="Search Tasks", command=search_task_menu, width=15)
+    search_button.grid(row=2, column=3, pady=10, padx=10)
+
+    analytics_button = tk.Button(window, text="Analytics", command=analytics_menu, width=15)
+    analytics_button.grid(row=2, column=6, pady=10, padx=10)
+
+    # Ensure columns resize proportionally
+    for i in range(7):
+        window.grid_columnconfigure(i, weight=1, uniform="equal")
+    window.grid_rowconfigure(1, weight=1)
+
+    # Bulk actions for the selected cards; shown only while there is a selection
+    selection_bar = tk.Frame(window, bg="#E9EEF1", pady=5)
+    selection_bar.grid(row=3, column=0, columnspan=7, sticky="nsew")
+    selection_label = tk.Label(selection_bar, font=("Roboto", 10, "bold"), bg="#E9EEF1", fg="#6A7F8C")
+    selection_label.pack(side="left", padx=10)
+    bulk_day_selector = ttk.Combobox(selection_bar, values=days_of_week, state="readonly", width=12)
+    bulk_day_selector.pack(side="left")
+    tk.Button(selection_bar, text="Move", command=lambda: bulk_move(bulk_day_selector.get())).pack(side="left", padx=5)
+    tk.Button(selection_bar, text="Complete", command=bulk_complete).pack(side="left", padx=5)
+    tk.Button(selection_bar, text="Delete", command=bulk_delete).pack(side="left", padx=5)
+    for color in CARD_COLORS:
+        tk.Button(selection_bar, text=" " if color else "x", bg=color or "white", width=2,
+                  command=lambda color=color: bulk_recolor(color)).pack(side="left", padx=1)
+    tk.Button(selection_bar, text="Clear Selection", command=clear_selection).pack(side="right", padx=10)
+    selection_bar.grid_remove()
+
+    # Load the week's existing tasks into view, and the reminders of every upcoming task
+    show_week(displayed_week_start)
+    start_reminders()
+    
+    # All Rights Reserved Footer
+    footer_label_frame = tk.Frame(window, bg="#6A7F8C", pady=5)
+    footer_label_frame.grid(row=4, column=0, columnspan=7, sticky="nsew")  # Use grid instead of pack
+
+    footer_label = tk.Label(
+        footer_label_frame,
+        text="TaskTrack © 2024 | All Rights Reserved to Michelle Palatty and Emily Tunnock",
+        font=("Roboto", 10, "bold"),
+        bg="#6A7F8C",
+        fg="white"
+    )
+    footer_label.pack()  # You can still use pack for the label inside the frame
+
+    # Hand database results back to the UI, and commit pending writes before the window closes
+    poll_background_jobs()
+    window.protocol("WM_DELETE_WINDOW", close_weekly_view)
+
+    # Measure event-loop latency; F12 opens the performance overlay
+    if profiler.enabled:
+        probe_event_loop()
+    window.bind("<F12>", performance_overlay)
+
+    # Undo and redo whole actions from the change journal
+    window.bind("<Control-z>", undo_last_action)
+    window.bind("<Control-y>", redo_last_action)
+
+    # Archive old completed tasks, reclaim space and check the database while the user is away
+    for sequence in ("<Any-KeyPress>", "<Any-ButtonPress>", "<Motion>"):
+        window.bind_all(sequence, note_user_input, add="+")
+    check_maintenance()
+
+    # Start the tkinter main loop
+    window.mainloop()
+
+def close_weekly_view():
+    """
+    Finish queued database work, commit pending writes and close the main window.
+    """
+
+    db_executor.shutdown()
+    window.destroy()
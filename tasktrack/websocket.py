@@ -0,0 +1,174 @@
+"""
+Minimal RFC 6455 WebSocket framing over asyncio streams, for the sync server and its clients.
+Text and binary messages, fragmentation, ping/pong and close are supported; extensions are not.
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import struct
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+# Largest message accepted from a peer
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+_ACCEPT_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+class WebSocketError(Exception):
+    """
+    The peer broke the WebSocket protocol or the handshake failed.
+    """
+
+def accept_key(key):
+    """
+    Compute the Sec-WebSocket-Accept value that answers a client's Sec-WebSocket-Key.
+
+    Args:
+        key (str): The client's key.
+
+    Returns:
+        str: The accept value.
+    """
+
+    return base64.b64encode(hashlib.sha1(key.encode("ascii") + _ACCEPT_GUID).digest()).decode("ascii")
+
+def _apply_mask(payload, mask):
+    if not payload:
+        return payload
+    length = len(payload)
+    key = int.from_bytes((mask * (length // 4 + 1))[:length], "big")
+    return (int.from_bytes(payload, "big") ^ key).to_bytes(length, "big")
+
+def encode_frame(payload, opcode=OP_TEXT, mask=False):
+    """
+    Build one final frame. Clients must mask what they send; servers must not.
+
+    Args:
+        payload (bytes): The frame's data.
+        opcode (int): OP_TEXT, OP_BINARY or a control opcode.
+        mask (bool): Whether to mask the payload (client to server).
+
+    Returns:
+        bytes: The encoded frame.
+    """
+
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, mask_bit | length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, mask_bit | 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, mask_bit | 127, length)
+    if not mask:
+        return header + payload
+    key = os.urandom(4)
+    return header + key + _apply_mask(payload, key)
+
+async def read_message(reader, writer, mask=False):
+    """
+    Read the next data message, answering pings and reassembling fragments on the way.
+
+    Args:
+        reader (asyncio.StreamReader): The connection's reader.
+        writer (asyncio.StreamWriter): The connection's writer, for pongs and the closing handshake.
+        mask (bool): Whether frames this side sends are masked (True for clients).
+
+    Returns:
+        tuple: (opcode, payload bytes), or None once the peer closed the connection.
+    """
+
+    fragments = []
+    message_opcode = None
+    while True:
+        try:
+            first, second = await reader.readexactly(2)
+        except asyncio.IncompleteReadError:
+            return None
+        final, opcode = first & 0x80, first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", await reader.readexactly(8))[0]
+        if length > MAX_MESSAGE_BYTES:
+            raise WebSocketError(f"message of {length} bytes is too large")
+        key = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length)
+        if key is not None:
+            payload = _apply_mask(payload, key)
+
+        if opcode == OP_CLOSE:
+            if not writer.is_closing():
+                writer.write(encode_frame(payload[:2], OP_CLOSE, mask))
+            return None
+        if opcode == OP_PING:
+            writer.write(encode_frame(payload, OP_PONG, mask))
+            continue
+        if opcode == OP_PONG:
+            continue
+
+        if opcode != OP_CONTINUATION:
+            message_opcode = opcode
+        elif message_opcode is None:
+            raise WebSocketError("continuation frame without a message")
+        fragments.append(payload)
+        if final:
+            return message_opcode, b"".join(fragments)
+
+async def read_http_head(reader):
+    """
+    Read an HTTP request or response head.
+
+    Returns:
+        tuple: (start line, headers dict with lower-case names), or None if the peer hung up.
+    """
+
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        return None
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    return lines[0], headers
+
+async def connect(host, port, path="/"):
+    """
+    Open a client WebSocket connection.
+
+    Args:
+        host (str): Server host.
+        port (int): Server port.
+        path (str): Request path.
+
+    Returns:
+        tuple: (asyncio.StreamReader, asyncio.StreamWriter) ready for read_message and masked frames.
+    """
+
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    writer.write((
+        f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+    ).encode("ascii"))
+    await writer.drain()
+
+    response = await read_http_head(reader)
+    if response is None or response[0].split()[1:2] != ["101"]:
+        writer.close()
+        raise WebSocketError(f"handshake failed: {response[0] if response else 'connection closed'}")
+    if response[1].get("sec-websocket-accept") != accept_key(key):
+        writer.close()
+        raise WebSocketError("handshake failed: bad Sec-WebSocket-Accept")
+    return reader, writer
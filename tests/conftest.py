@@ -0,0 +1,29 @@
+"""
+Shared fixtures: every test gets its own database files under pytest's tmp_path.
+"""
+
+import pytest
+
+from tasktrack.repository import TaskRepository
+
+@pytest.fixture
+def database_path(tmp_path):
+    return str(tmp_path / "tasks.db")
+
+@pytest.fixture
+def repository(database_path):
+    repository = TaskRepository(database_path)
+    yield repository
+    repository.close()
+
+@pytest.fixture
+def task_titles():
+    """
+    Returns:
+        callable: task_titles(repository) -> the sorted titles of every task in its database.
+    """
+
+    def titles(repository):
+        return sorted(row[0] for row in repository.connection.execute("SELECT title FROM tasks"))
+
+    return titles
@@ -0,0 +1,55 @@
+"""
+Analytics: completion rates, the weekday heatmap and overdue counts, and their cache.
+"""
+
+import pytest
+
+from tasktrack import analytics
+from tasktrack.analytics import compute_analytics, load_analytics
+from tasktrack.dates import week_start, weekday_name
+
+SUNDAY = week_start(20000)
+
+@pytest.fixture
+def coursework(repository):
+    repository.insert_tasks([
+        (title, "", weekday_name(due_day), status, due_day) for title, status, due_day in (
+            ("HIST: Essay", "not-completed", SUNDAY + 1),
+            ("HIST: Quiz", "completed", SUNDAY + 1),
+            ("Lab", "not-completed", SUNDAY + 9),
+        )
+    ])
+    return repository
+
+def test_statistics_of_the_analytics_view(coursework, monkeypatch):
+    monkeypatch.setattr(analytics, "numpy", None)
+    result = compute_analytics(coursework, today=SUNDAY + 5)
+
+    assert (result["total"], result["completed"], result["overdue"]) == (3, 1, 1)
+    assert result["completion_rate"] == pytest.approx(1 / 3)
+    assert result["days"] == [(SUNDAY + 1, 2, 1, 0.5), (SUNDAY + 9, 1, 0, 0.0)]
+    assert result["weeks"] == [(SUNDAY, 2, 1, 0.5), (SUNDAY + 7, 1, 0, 0.0)]
+    assert result["courses"] == [("", 1, 0, 0.0, 0), ("HIST", 2, 1, 0.5, 1)]
+    assert result["heatmap"] == {"first_week": SUNDAY, "counts": [[0, 2, 0, 0, 0, 0, 0], [0, 0, 1, 0, 0, 0, 0]]}
+
+def test_numpy_and_python_roll_ups_agree(coursework, monkeypatch):
+    pytest.importorskip("numpy")
+    with_numpy = compute_analytics(coursework, today=SUNDAY + 5)
+    monkeypatch.setattr(analytics, "numpy", None)
+
+    assert compute_analytics(coursework, today=SUNDAY + 5) == with_numpy
+
+def test_an_empty_database_has_no_rates(repository):
+    result = compute_analytics(repository, today=SUNDAY)
+
+    assert result["total"] == 0 and result["completion_rate"] is None
+    assert result["days"] == [] and result["heatmap"] == {"first_week": None, "counts": []}
+
+def test_cached_until_a_task_changes(coursework):
+    first = load_analytics(coursework, today=SUNDAY + 5)
+    assert load_analytics(coursework, today=SUNDAY + 5) is first
+
+    coursework.complete_task(1)
+    updated = load_analytics(coursework, today=SUNDAY + 5)
+    assert updated is not first and updated["completed"] == 2 and updated["overdue"] == 0
+    assert load_analytics(coursework, today=SUNDAY + 6) is not updated
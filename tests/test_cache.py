@@ -0,0 +1,55 @@
+"""
+TaskCache: LRU eviction, write-through, and loads racing with uncommitted writes.
+"""
+
+from tasktrack.cache import TaskCache
+from tasktrack.repository import TaskRepository
+
+def record(task_id, title="Essay", day="Monday"):
+    return (task_id, title, "", day, "not-completed")
+
+def test_least_recently_used_record_is_evicted():
+    cache = TaskCache(capacity=2)
+    cache.put(record(1))
+    cache.put(record(2))
+    cache.get(1)
+    cache.put(record(3))
+
+    assert cache.get(2) is None
+    assert cache.get(1) == record(1) and cache.get(3) == record(3)
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2, "capacity": 2}
+
+def test_loads_racing_with_a_mutation_or_commit_are_not_cached():
+    cache = TaskCache()
+    token = cache.load_token()
+    cache.update(1, day="Friday")
+    cache.put_loaded(record(1), token)
+    assert cache.get(1) is None
+
+    token = cache.load_token()
+    cache.put_loaded(record(1), token)  # Task 1's mutation isn't committed yet
+    assert cache.get(1) is None
+
+    token = cache.load_token()
+    cache.committed()
+    cache.put_loaded(record(1), token)  # May have read the row from before the commit
+    assert cache.get(1) is None
+
+    cache.put_loaded(record(1, day="Friday"), cache.load_token())
+    assert cache.get(1) == record(1, day="Friday")
+
+def test_a_reader_never_caches_a_row_the_writer_has_not_committed(database_path):
+    cache = TaskCache()
+    writer = TaskRepository(database_path, max_pending=1000, flush_interval_ms=60000, cache=cache)
+    reader = TaskRepository(database_path, read_only=True, cache=cache)
+    task_id = writer.save_task("Essay", "", "Monday")
+    writer.flush()
+    cache.clear()
+
+    writer.move_task(task_id, "Friday")  # Not cached, so only the version is bumped
+    assert reader.load_task(task_id)[3] == "Monday"  # The committed row, for now
+    writer.flush()
+    assert reader.load_task(task_id)[3] == "Friday"
+
+    reader.close()
+    writer.close()
@@ -0,0 +1,31 @@
+"""
+DatabaseExecutor: writes and reads from the calling thread, and a database that can't be opened.
+"""
+
+import sqlite3
+
+import pytest
+
+from tasktrack import db
+from tasktrack.executor import DatabaseExecutor
+from tasktrack.repository import TaskRepository
+
+def test_reads_see_earlier_writes(database_path):
+    executor = DatabaseExecutor(database_path)
+    try:
+        task_id = executor.submit(TaskRepository.save_task, "Essay", "Outline", "Monday").result(timeout=5)
+        executor.submit(TaskRepository.move_task, task_id, "Friday")
+        task = executor.submit_read(TaskRepository.load_task, task_id).result(timeout=5)
+    finally:
+        executor.shutdown()
+
+    assert task == (task_id, "Essay", "Outline", "Friday", "not-completed")
+
+def test_a_database_that_cannot_be_opened_raises_instead_of_hanging(database_path, monkeypatch):
+    monkeypatch.setattr(db, "MINIMUM_SQLITE_VERSION", (99, 0, 0))
+    executor = DatabaseExecutor(database_path)
+
+    for _ in range(2):  # Every submit tries again
+        with pytest.raises(sqlite3.NotSupportedError):
+            executor.submit(TaskRepository.save_task, "Essay", "", "Monday")
+    executor.shutdown()
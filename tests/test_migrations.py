@@ -0,0 +1,63 @@
+"""
+Schema migrations: a new database and one created before the first migration both end up on
+the latest schema.
+"""
+
+import sqlite3
+
+import pytest
+
+from tasktrack import db
+from tasktrack.db import SCHEMA_MIGRATIONS, initialize_database
+from tasktrack.repository import TaskRepository
+
+LONG_NOTE = "Chapter summaries for the midterm. " * 40
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def test_new_database_is_on_the_latest_schema(database_path):
+    conn = initialize_database(database_path)
+
+    assert schema_version(conn) == len(SCHEMA_MIGRATIONS)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # INCREMENTAL
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+def test_schema_zero_database_is_migrated(database_path):
+    with sqlite3.connect(database_path) as conn:
+        conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY, title TEXT NOT NULL, content TEXT)")
+        conn.executemany("INSERT INTO tasks (title, content) VALUES (?, ?)",
+                         [("History: Essay 1", LONG_NOTE), ("Lab report", ""), ("Reading", "Pages 10-40")])
+    conn.close()
+
+    repository = TaskRepository(database_path)
+    connection = repository.connection
+    assert schema_version(connection) == len(SCHEMA_MIGRATIONS)
+    assert "content" not in {row[1] for row in connection.execute("PRAGMA table_info(tasks)")}
+    assert connection.execute("SELECT COUNT(*) FROM task_notes").fetchone()[0] == 2
+    assert connection.execute("SELECT COUNT(*) FROM tasks WHERE due_day IS NULL").fetchone()[0] == 0
+    assert connection.execute("SELECT course FROM tasks WHERE id = 1").fetchone()[0] == "History"
+
+    assert repository.load_task(1) == (1, "History: Essay 1", LONG_NOTE, "Monday", "not-completed")
+    assert [row[0] for row in repository.search_tasks("midterm")] == [1]
+    assert len(repository.load_changes_since(0)) == 3  # The snapshot of the existing tasks
+    assert repository.undo() is None  # ...which can't be undone
+
+    repository.move_task(2, "Friday")
+    assert repository.undo() == ("Move task", [2])
+    assert repository.check_integrity() == []
+    repository.close()
+
+def test_migrating_twice_changes_nothing(database_path):
+    initialize_database(database_path).close()
+    conn = initialize_database(database_path)
+
+    assert schema_version(conn) == len(SCHEMA_MIGRATIONS)
+    conn.close()
+
+def test_old_sqlite_is_refused(database_path, monkeypatch):
+    monkeypatch.setattr(db, "MINIMUM_SQLITE_VERSION", (99, 0, 0))
+
+    with pytest.raises(sqlite3.NotSupportedError, match="SQLite 99.0.0 or newer"):
+        initialize_database(database_path)
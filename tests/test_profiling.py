@@ -0,0 +1,35 @@
+"""
+Profiler: percentiles, and slow database calls logged with or without their query plans.
+"""
+
+import logging
+
+import pytest
+
+from tasktrack.profiling import Profiler, profiler
+
+def test_statistics_cover_recorded_spans():
+    local = Profiler()
+    for milliseconds in range(1, 101):
+        local.record("load", milliseconds / 1000, "db")
+
+    stats = local.statistics()["load"]
+    assert stats["count"] == 100 and stats["category"] == "db"
+    assert stats["p50_ms"] == pytest.approx(50) and stats["p99_ms"] == pytest.approx(99)
+
+@pytest.mark.parametrize("explain", [False, True])
+def test_slow_database_calls_are_logged(repository, monkeypatch, caplog, explain):
+    monkeypatch.setattr(profiler, "enabled", True)
+    monkeypatch.setattr(profiler, "slow_query_ms", 0)
+    monkeypatch.setattr(profiler, "explain_slow_queries", explain)
+    task_id = repository.save_task("Essay", "", "Monday")
+    repository.cache.clear()
+    caplog.clear()  # Opening the database was slow too
+
+    with caplog.at_level(logging.INFO, logger="tasktrack.profiling"):
+        repository.load_task(task_id)
+
+    (record,) = caplog.records
+    assert "Slow database call TaskRepository.load_task" in record.getMessage()
+    assert ("SEARCH tasks" in record.getMessage()) == explain
+    assert record.levelno == (logging.WARNING if explain else logging.INFO)
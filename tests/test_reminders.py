@@ -0,0 +1,42 @@
+"""
+ReminderScheduler: fire order, cancelling, and tasks due in the past.
+"""
+
+import time
+
+from tasktrack.dates import today_epoch_day
+from tasktrack.reminders import ReminderScheduler
+
+def test_reminders_fire_in_order_and_once():
+    reminders = ReminderScheduler()
+    today = today_epoch_day()
+    reminders.load([(1, "Essay", today + 2), (2, "Quiz", today + 1), (3, "Lab", today + 3)])
+    reminders.schedule(3, "Lab", today + 1)  # Moved
+    reminders.cancel(2)
+
+    assert reminders.next_fire_time() == reminders.fire_time(today + 1)
+    assert reminders.pop_due(reminders.fire_time(today + 2)) == [(3, "Lab"), (1, "Essay")]
+    assert reminders.pop_due(time.time() + 10 * 86400) == [] and len(reminders) == 0
+
+def test_tasks_due_in_the_past_get_no_reminder(repository):
+    reminders = ReminderScheduler()
+    today = today_epoch_day()
+    essay = repository.save_task("Essay", "", "Monday", today + 1)
+    reminders.load(repository.load_upcoming_reminders(reminders.first_due_day()))
+    assert essay in reminders
+
+    repository.move_task(essay, None, today - 3)
+    assert repository.load_reminders([essay], reminders.first_due_day()) == []
+    reminders.refresh([essay], repository.load_reminders([essay]))
+    assert essay not in reminders and reminders.pop_due() == []
+
+    reminders.schedule(essay, "Essay", today - 1)
+    reminders.load([(essay, "Essay", today - 2)])
+    assert len(reminders) == 0
+
+def test_lead_days_move_the_first_due_day():
+    reminders = ReminderScheduler(lead_days=2)
+    today = today_epoch_day()
+    reminders.load([(1, "Essay", today + 1), (2, "Quiz", today + 2)])
+
+    assert 1 not in reminders and 2 in reminders
@@ -0,0 +1,242 @@
+"""
+TaskRepository: CRUD, the change journal (undo, redo, compaction, change feed), archiving and search.
+"""
+
+import sqlite3
+
+import pytest
+
+from tasktrack.dates import today_epoch_day, week_start, weekday_name
+from tasktrack.repository import HIGHLIGHT_END, HIGHLIGHT_START
+
+LONG_NOTE = " ".join(f"paragraph {number} of the reading notes" for number in range(200))
+
+def journal_bytes(repository):
+    return repository.connection.execute(
+        "SELECT COALESCE(SUM(LENGTH(old_row)), 0) + COALESCE(SUM(LENGTH(new_row)), 0) FROM task_journal"
+    ).fetchone()[0]
+
+################################################## CRUD ##################################################
+def test_save_and_load_task(repository):
+    task_id = repository.save_task("Essay", "Outline first", "Monday")
+
+    assert repository.load_task(task_id) == (task_id, "Essay", "Outline first", "Monday", "not-completed")
+    repository.cache.clear()
+    assert repository.load_task(task_id) == (task_id, "Essay", "Outline first", "Monday", "not-completed")
+    assert repository.load_tasks_for_week()["Monday"] == [(task_id, "Essay", None)]
+
+def test_long_notes_are_compressed_and_read_back(repository):
+    task_id = repository.save_task("Reading", LONG_NOTE, "Tuesday")
+    repository.cache.clear()
+
+    body = repository.connection.execute("SELECT body FROM task_notes WHERE task_id = ?", (task_id,)).fetchone()[0]
+    assert isinstance(body, bytes) and len(body) < len(LONG_NOTE)
+    assert repository.load_task_content(task_id) == LONG_NOTE
+
+def test_update_move_complete_and_delete(repository):
+    task_id = repository.save_task("Lab", "", "Monday")
+
+    repository.update_task(task_id, "Lab report", "Wednesday", "Graphs")
+    assert repository.load_task(task_id) == (task_id, "Lab report", "Graphs", "Wednesday", "not-completed")
+
+    repository.move_task(task_id, "Friday")
+    assert [entry[0] for entry in repository.load_tasks_for_week()["Friday"]] == [task_id]
+
+    repository.complete_task(task_id)
+    assert repository.load_tasks_for_week()["Friday"] == []
+    assert repository.load_completed_tasks() == [(task_id, "Lab report", "Friday")]
+
+    repository.delete_task(task_id)
+    assert repository.load_task(task_id) is None
+
+def test_save_task_takes_the_day_from_the_due_day(repository):
+    due_day = week_start(today_epoch_day()) + 2  # A Tuesday
+    task_id = repository.save_task("Quiz", "", "Monday", due_day)
+
+    stored_day = repository.connection.execute("SELECT day FROM tasks WHERE id = ?", (task_id,)).fetchone()[0]
+    assert stored_day == weekday_name(due_day) == "Tuesday"
+    assert repository.load_task(task_id)[3] == "Tuesday"
+
+def test_bulk_operations(repository, task_titles):
+    task_ids = repository.insert_tasks([
+        ("One", "", "Monday", "not-completed", week_start(today_epoch_day()) + 1),
+        ("Two", "note", "Monday", "not-completed", week_start(today_epoch_day()) + 1),
+        ("Three", "", "Monday", "not-completed", week_start(today_epoch_day()) + 1),
+    ])
+
+    repository.move_tasks(task_ids[:2], "Thursday")
+    repository.recolor_tasks(task_ids[:1], "#90BE6D")
+    assert repository.load_tasks_for_week()["Thursday"] == [(task_ids[0], "One", "#90BE6D"), (task_ids[1], "Two", None)]
+
+    repository.complete_tasks(task_ids[1:])
+    assert repository.count_completed_tasks() == 2
+    repository.delete_tasks(task_ids)
+    assert task_titles(repository) == []
+
+################################################## JOURNAL ##################################################
+def test_undo_and_redo_replay_whole_actions(repository):
+    task_id = repository.save_task("Essay", "Draft", "Monday")
+    repository.update_task(task_id, "Final essay", "Friday", "Final draft")
+
+    assert repository.undo() == ("Edit task", [task_id])
+    assert repository.load_task(task_id) == (task_id, "Essay", "Draft", "Monday", "not-completed")
+    assert repository.redo() == ("Edit task", [task_id])
+    assert repository.load_task(task_id) == (task_id, "Final essay", "Final draft", "Friday", "not-completed")
+
+    repository.delete_task(task_id)
+    repository.undo()
+    assert repository.load_task(task_id) == (task_id, "Final essay", "Final draft", "Friday", "not-completed")
+
+def test_a_new_action_ends_redo(repository, task_titles):
+    repository.save_task("Essay", "", "Monday")
+    repository.undo()
+    repository.save_task("Quiz", "", "Monday")
+
+    assert repository.redo() is None
+    assert task_titles(repository) == ["Quiz"]
+
+def test_insert_tasks_is_an_action_of_its_own(repository, task_titles):
+    repository.save_task("Single", "", "Monday")
+    repository.insert_tasks([(title, "", "Monday", "not-completed", today_epoch_day()) for title in ("A", "B", "C")])
+
+    label, task_ids = repository.undo()
+    assert label == "Insert tasks" and len(task_ids) == 3
+    assert task_titles(repository) == ["Single"]
+
+def test_writes_outside_an_action_are_refused(repository, task_titles):
+    repository.save_task("Essay", "", "Monday")
+
+    with pytest.raises(sqlite3.IntegrityError, match="journal action"):
+        repository.store.execute("INSERT INTO tasks (title, day, status) VALUES ('Stray', 'Monday', 'not-completed')")
+    assert repository.undo() == ("Create task", [1])
+    assert task_titles(repository) == []
+
+@pytest.mark.parametrize("day, content", [("Funday", "Notes"), ("Tuesday", object())])
+def test_a_failed_action_leaves_nothing_behind(repository, day, content):
+    task_id = repository.save_task("Essay", "Draft", "Monday")
+
+    with pytest.raises((ValueError, AttributeError)):
+        repository.update_task(task_id, "Renamed", day, content)
+    repository.flush()
+    repository.cache.clear()
+    assert repository.load_task(task_id) == (task_id, "Essay", "Draft", "Monday", "not-completed")
+    assert repository.undo() == ("Create task", [task_id])
+
+def test_a_failed_batch_insert_leaves_no_action(repository, task_titles):
+    repository.save_task("Single", "", "Monday")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        repository.insert_tasks([("Kept?", "", "Monday", "not-completed", 0), (None, "", "Monday", "not-completed", 0)])
+    assert task_titles(repository) == ["Single"]
+    assert repository.undo() == ("Create task", [1])
+
+def test_moving_a_task_does_not_journal_its_note(repository):
+    task_id = repository.save_task("Reading", LONG_NOTE, "Monday")
+    before = journal_bytes(repository)
+
+    for day in ("Tuesday", "Wednesday", "Thursday") * 5:
+        repository.move_task(task_id, day)
+    repository.complete_task(task_id)
+
+    assert journal_bytes(repository) - before < len(LONG_NOTE)
+    for _ in range(16):
+        repository.undo()
+    assert repository.load_task(task_id) == (task_id, "Reading", LONG_NOTE, "Monday", "not-completed")
+
+def test_changes_since_carry_the_current_state(repository):
+    first = repository.save_task("Essay", "Notes", "Monday")
+    second = repository.save_task("Quiz", "", "Monday")
+    seen = repository.latest_change()
+    repository.move_task(first, "Friday")
+    repository.delete_task(second)
+
+    changes = {change["id"]: change for change in repository.load_changes_since(seen)}
+    assert changes[first]["day"] == "Friday" and changes[first]["content"] == "Notes"
+    assert changes[second]["deleted"]
+    assert [change["id"] for change in repository.load_changes_since(0)] == [first, second]
+
+def test_compaction_keeps_the_change_feed_and_recent_undo(repository):
+    task_id = repository.save_task("Essay", "", "Monday")
+    for day in ("Tuesday", "Wednesday", "Thursday", "Friday"):
+        repository.move_task(task_id, day)
+    changes = repository.load_changes_since(0)
+
+    assert repository.compact_journal(keep_actions=2) > 0
+    assert repository.load_changes_since(0) == changes
+    assert repository.undo()[0] == "Move task"
+    assert repository.undo()[0] == "Move task"
+    assert repository.undo() is None
+    assert repository.load_task(task_id)[3] == "Wednesday"
+
+################################################## MAINTENANCE ##################################################
+def test_archive_moves_old_completed_tasks(repository, tmp_path, task_titles):
+    old_day = today_epoch_day() - 365
+    archived_ids = repository.insert_tasks([(f"Old {number}", "Notes", weekday_name(old_day), "completed", old_day) for number in range(3)])
+    repository.compact_journal(keep_actions=0)  # Nothing left to undo
+    kept_id = repository.save_task("Recent", "", "Monday", old_day)
+    repository.complete_task(kept_id)  # Still undoable, so it stays
+    seen = repository.latest_change()
+
+    archive_path = str(tmp_path / "archive.db")
+    assert repository.archive_completed_tasks(today_epoch_day() - 90, archive_path=archive_path) == 3
+
+    assert task_titles(repository) == ["Recent"]
+    assert {change["id"] for change in repository.load_changes_since(seen) if change["deleted"]} == set(archived_ids)
+    assert repository.undo() == ("Complete task", [kept_id])
+    repository.flush()
+    with sqlite3.connect(archive_path) as archive:
+        assert archive.execute("SELECT COUNT(*), MIN(note) FROM archived_tasks").fetchone() == (3, "Notes")
+
+def test_archiving_a_reused_task_id_keeps_both_rows(repository, tmp_path):
+    old_day = today_epoch_day() - 365
+    archive_path = str(tmp_path / "archive.db")
+    for title in ("Old A", "Old B"):
+        repository.insert_tasks([(title, f"note {title[-1]}", weekday_name(old_day), "completed", old_day)])
+        repository.compact_journal(keep_actions=0)
+        assert repository.archive_completed_tasks(today_epoch_day() - 90, archive_path=archive_path) == 1
+
+    repository.flush()
+    with sqlite3.connect(archive_path) as archive:
+        rows = archive.execute("SELECT task_id, title, note FROM archived_tasks ORDER BY archive_id").fetchall()
+    assert rows == [(1, "Old A", "note A"), (1, "Old B", "note B")]  # Task ID 1 was given out twice
+
+def test_archives_keyed_by_task_id_are_converted(repository, tmp_path):
+    archive_path = str(tmp_path / "archive.db")
+    with sqlite3.connect(archive_path) as archive:
+        archive.execute(
+            "CREATE TABLE archived_tasks (id INTEGER PRIMARY KEY, title TEXT NOT NULL, day TEXT NOT NULL, "
+            "status TEXT NOT NULL, due_day INTEGER, color TEXT, note, archived_at INTEGER NOT NULL)"
+        )
+        archive.execute("INSERT INTO archived_tasks VALUES (7, 'Kept', 'Monday', 'completed', 0, NULL, 'note', 1)")
+    archive.close()
+
+    old_day = today_epoch_day() - 365
+    repository.insert_tasks([("Old", "", weekday_name(old_day), "completed", old_day)])
+    repository.compact_journal(keep_actions=0)
+    repository.archive_completed_tasks(today_epoch_day() - 90, archive_path=archive_path)
+    repository.flush()
+
+    with sqlite3.connect(archive_path) as archive:
+        assert archive.execute("SELECT task_id, title FROM archived_tasks ORDER BY archive_id").fetchall() == [(7, "Kept"), (1, "Old")]
+
+def test_new_databases_release_free_pages(repository):
+    repository.insert_tasks([("Task", LONG_NOTE + str(number), "Monday", "not-completed", 0) for number in range(200)])
+    assert repository.storage_stats()["incremental_vacuum"]
+
+    repository.clear()
+    assert repository.storage_stats()["free_pages"] == 0
+    assert repository.check_integrity() == []
+
+################################################## SEARCH ##################################################
+def test_search_matches_titles_and_notes(repository):
+    essay = repository.save_task("History essay", "", "Monday")
+    lab = repository.save_task("Chemistry lab", "Write up the titration results", "Monday")
+
+    assert [row[0] for row in repository.search_tasks("hist")] == [essay]
+    (row,) = repository.search_tasks("titr")
+    assert row[0] == lab and f"{HIGHLIGHT_START}titration{HIGHLIGHT_END}" in row[2]
+
+    repository.update_content(lab, "Nothing left to do")
+    assert repository.search_tasks("titr") == []
+    repository.delete_task(essay)
+    assert repository.search_tasks("hist") == []
@@ -0,0 +1,66 @@
+"""
+TaskStore: deferred commits, batches and savepoints, seen from a second connection.
+"""
+
+import sqlite3
+
+import pytest
+
+from tasktrack.db import TaskStore
+
+@pytest.fixture
+def connections(database_path):
+    writer = sqlite3.connect(database_path)
+    writer.execute("CREATE TABLE items (name TEXT NOT NULL)")
+    writer.commit()
+    reader = sqlite3.connect(database_path)
+    yield writer, reader
+    writer.close()
+    reader.close()
+
+def committed(reader):
+    return [row[0] for row in reader.execute("SELECT name FROM items ORDER BY rowid")]
+
+def test_writes_are_committed_once_enough_are_pending(connections):
+    writer, reader = connections
+    store = TaskStore(writer, max_pending=3, flush_interval_ms=60000)
+
+    store.execute("INSERT INTO items VALUES ('a')")
+    store.executemany("INSERT INTO items VALUES (?)", [("b",)])
+    assert committed(reader) == [] and store.pending == 2
+    store.execute("INSERT INTO items VALUES ('c')")
+    assert committed(reader) == ["a", "b", "c"] and store.pending == 0
+
+def test_a_batch_commits_when_it_ends_and_rolls_back_as_a_whole(connections):
+    writer, reader = connections
+    store = TaskStore(writer, max_pending=1, flush_interval_ms=60000)
+
+    with store.batch():
+        store.execute("INSERT INTO items VALUES ('a')")
+        with store.batch():
+            store.execute("INSERT INTO items VALUES ('b')")
+        assert committed(reader) == []
+    assert committed(reader) == ["a", "b"]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with store.batch():
+            store.execute("INSERT INTO items VALUES ('c')")
+            with store.batch():
+                store.execute("INSERT INTO items VALUES (NULL)")
+    assert committed(reader) == ["a", "b"] and store.pending == 0
+
+def test_a_savepoint_rolls_back_only_its_own_writes(connections):
+    writer, reader = connections
+    store = TaskStore(writer, max_pending=100, flush_interval_ms=60000)
+
+    store.execute("INSERT INTO items VALUES ('kept')")
+    with pytest.raises(sqlite3.IntegrityError):
+        with store.savepoint("step"):
+            store.execute("INSERT INTO items VALUES ('dropped')")
+            store.execute("INSERT INTO items VALUES (NULL)")
+    with store.savepoint("step"):
+        store.execute("INSERT INTO items VALUES ('also kept')")
+    assert committed(reader) == []  # Savepoints don't commit
+
+    store.flush()
+    assert committed(reader) == ["kept", "also kept"]
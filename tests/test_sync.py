@@ -0,0 +1,89 @@
+"""
+A local SyncServer with SyncClient replicas, including a writer that bypasses the server.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from tasktrack import sync
+from tasktrack.repository import TaskRepository
+from tasktrack.sync import SyncClient, SyncServer
+
+async def eventually(condition, timeout=5.0):
+    """
+    Wait until condition() is true, failing the test after 'timeout' seconds.
+    """
+
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            pytest.fail("the replicas did not converge")
+        await asyncio.sleep(0.02)
+
+@pytest.fixture
+def no_external_polling(monkeypatch):
+    # Only pushes may carry external writes to the replicas, so the test shows they do
+    monkeypatch.setattr(sync, "EXTERNAL_CHANGES_POLL_SECONDS", 3600)
+
+def test_round_trip_with_an_external_writer(tmp_path, no_external_polling, task_titles):
+    shared_path = str(tmp_path / "shared.db")
+
+    async def scenario():
+        server = SyncServer(shared_path, port=0)
+        await server.start()
+        url = f"ws://127.0.0.1:{server.port}"
+        first = SyncClient(url, str(tmp_path / "first.db"))
+        second = SyncClient(url, str(tmp_path / "second.db"))
+        try:
+            for client in (first, second):
+                await client.connect()
+                await client.ready.wait()
+
+            essay_id = await first.create_task("Essay", "Outline", "Monday")
+            await eventually(lambda: task_titles(second.repository) == ["Essay"])
+
+            # A board opened on the shared file writes behind the server's back
+            board = TaskRepository(shared_path)
+            board.save_task("From the board", "", "Tuesday")
+            board.close()
+
+            await second.move_task(essay_id, "Friday")
+            for client in (first, second):
+                await eventually(lambda client=client: task_titles(client.repository) == ["Essay", "From the board"])
+            assert first.repository.load_task(essay_id) == (essay_id, "Essay", "Outline", "Friday", "not-completed")
+
+            # A replica that was offline catches up from the sequence number it stored
+            await second.close()
+            await first.complete_task(essay_id)
+            second = SyncClient(url, str(tmp_path / "second.db"))
+            await second.connect()
+            await second.ready.wait()
+            assert second.repository.load_task(essay_id)[4] == "completed"
+        finally:
+            await first.close()
+            await second.close()
+            await server.close()
+
+    asyncio.run(scenario())
+
+def test_invalid_push_changes_nothing(tmp_path, no_external_polling, task_titles):
+    async def scenario():
+        server = SyncServer(str(tmp_path / "shared.db"), port=0)
+        await server.start()
+        client = SyncClient(f"ws://127.0.0.1:{server.port}", str(tmp_path / "replica.db"))
+        try:
+            await client.connect()
+            await client.ready.wait()
+            with pytest.raises(ValueError, match="unknown sync operation"):
+                await client.push([{"op": "create", "title": "Kept?", "day": "Monday"}, {"op": "explode"}])
+            assert task_titles(client.repository) == []
+        finally:
+            await client.close()
+            await server.close()
+        repository = TaskRepository(os.path.join(tmp_path, "shared.db"))
+        assert task_titles(repository) == []
+        repository.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,58 @@
+"""
+Bulk import and export: round trips through each file format, and imports that fail partway.
+"""
+
+import pytest
+
+from tasktrack.dates import today_epoch_day, weekday_name
+from tasktrack.repository import TaskRepository
+from tasktrack.transfer import export_tasks, import_tasks
+
+DUE_DAY = today_epoch_day() + 3
+
+def all_tasks(repository):
+    return repository.connection.execute(
+        "SELECT title, note_text(body), day, status, due_day FROM tasks LEFT JOIN task_notes ON task_id = id ORDER BY id"
+    ).fetchall()
+
+@pytest.mark.parametrize("file_format", ["csv", "jsonl", "ics"])
+def test_export_and_import_round_trip(repository, tmp_path, file_format):
+    tasks = [
+        ("Essay, draft 2", "Line one\nLine two; with \\ and , marks " + "x" * 100, weekday_name(DUE_DAY), "not-completed", DUE_DAY),
+        ("Lab", "", weekday_name(DUE_DAY - 10), "completed", DUE_DAY - 10),
+    ]
+    repository.insert_tasks(tasks)
+    path = str(tmp_path / f"tasks.{file_format}")
+    assert export_tasks(repository, path)["rows"] == 2
+
+    copy = TaskRepository(str(tmp_path / "copy.db"))
+    try:
+        assert import_tasks(copy, path, chunk_size=1)["rows"] == 2
+        assert [(title, note or "", day, status, due_day) for title, note, day, status, due_day in all_tasks(copy)] == tasks
+    finally:
+        copy.close()
+
+def test_a_failed_import_adds_nothing_and_can_be_rerun(repository, tmp_path, task_titles):
+    path = tmp_path / "tasks.csv"
+    rows = [f"Task {number},,Monday,," for number in range(5)]
+    rows[3] = "Broken,,Funday,,"
+    path.write_text("title,content,day,status,due\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    repository.save_task("Existing", "", "Monday")
+
+    with pytest.raises(ValueError, match=r"tasks\.csv:5: 'Funday' is not a day.*after 3 valid rows; nothing was imported"):
+        import_tasks(repository, str(path), chunk_size=2)
+    repository.flush()
+    assert task_titles(repository) == ["Existing"]
+    assert repository.undo() == ("Create task", [1])
+
+    path.write_text(path.read_text(encoding="utf-8").replace("Funday", "Friday"), encoding="utf-8")
+    assert import_tasks(repository, str(path), chunk_size=2)["rows"] == 5
+    assert task_titles(repository) == ["Broken", "Task 0", "Task 1", "Task 2", "Task 4"]
+
+def test_invalid_json_names_its_line(repository, tmp_path, task_titles):
+    path = tmp_path / "tasks.jsonl"
+    path.write_text('{"title": "Essay", "day": "Monday"}\n{"title": \n', encoding="utf-8")
+
+    with pytest.raises(ValueError, match=r"tasks\.jsonl:2: not a JSON object"):
+        import_tasks(repository, str(path))
+    assert task_titles(repository) == []